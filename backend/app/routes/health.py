@@ -1,9 +1,15 @@
 from flask import Blueprint, jsonify
+from app.utils.scraping import browser_pool_stats, circuit_breakers_stats, host_scheduler_stats
 
 health_bp = Blueprint('health', __name__)
 
 @health_bp.route('/health', methods=['GET'])
 def health():
     """Endpoint de health check para Docker/EasyPanel"""
-    return jsonify({'status': 'healthy'}), 200
+    return jsonify({
+        'status': 'healthy',
+        'browser_pool': browser_pool_stats(),
+        'host_scheduler': host_scheduler_stats(),
+        'circuit_breakers': circuit_breakers_stats(),
+    }), 200
 
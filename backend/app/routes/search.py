@@ -1,15 +1,18 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-import asyncio
 import logging
 from app import db
 from app.models import User, SearchQuery, Lead
 from app.middleware.auth import require_permission
+from app.utils.scraping import iter_engine_entries, prewarm_browsers
 
 search_bp = Blueprint('search', __name__)
 logger = logging.getLogger(__name__)
 
+# Cantidad de leads guardados por commit mientras la búsqueda sigue en ejecución
+LEADS_COMMIT_BATCH_SIZE = 20
+
 @search_bp.route('/start', methods=['POST'])
 @jwt_required()
 @require_permission('create_search')
@@ -50,6 +53,12 @@ def start_search():
     db.session.add(search_query)
     db.session.commit()
     
+    # Preparar navegadores para las búsquedas pendientes
+    try:
+        prewarm_browsers(SearchQuery.query.filter_by(status='pending').count())
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo precalentar el pool de navegadores: {e}")
+    
     # Ejecutar búsqueda en background (aquí se integraría con py_lead_generation)
     # Por ahora retornamos el ID de la búsqueda
     # TODO: Implementar ejecución asíncrona real
@@ -103,23 +112,24 @@ def execute_search(search_id):
         else:
             raise ValueError(f"Source no soportado: {search_query.source}")
         
-        # Ejecutar búsqueda
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(engine.run())
-        
-        # Guardar resultados en la base de datos
-        entries = engine.entries
-        for entry in entries:
+        # Ejecutar búsqueda en el pool de navegadores compartido guardando los leads a medida que se obtienen
+        leads_count = 0
+        for entry in iter_engine_entries(engine):
+            # SourceURL es la URL canónica y corta del lugar, una URL truncada no serviría para abrirlo
+            source_url = entry.get('SourceURL') or None
             lead = Lead(
                 search_query_id=search_query.id,
                 title=entry.get('Title', ''),
                 address=entry.get('Address', ''),
                 phone_number=entry.get('PhoneNumber', ''),
                 website_url=entry.get('WebsiteURL', ''),
-                tags=entry.get('Tags', '')
+                tags=entry.get('Tags', ''),
+                source_url=source_url if source_url and len(source_url) <= 500 else None
             )
             db.session.add(lead)
+            leads_count += 1
+            if leads_count % LEADS_COMMIT_BATCH_SIZE == 0:
+                db.session.commit()
         
         search_query.status = 'completed'
         search_query.completed_at = datetime.utcnow()
@@ -128,7 +138,9 @@ def execute_search(search_id):
         return jsonify({
             'message': 'Búsqueda completada',
             'search_query': search_query.to_dict(),
-            'leads_count': len(entries)
+            'leads_count': leads_count,
+            # URLs que fallaron en todos los reintentos, no abortan el resto de la búsqueda
+            'failed_urls_count': len(engine.failed_urls)
         }), 200
         
     except Exception as e:
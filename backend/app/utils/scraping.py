@@ -0,0 +1,120 @@
+"""Ejecución de los engines de py_lead_generation sobre un pool de navegadores compartido
+
+El pool vive en un event loop propio dentro de un hilo de fondo, así cada búsqueda
+reutiliza navegadores ya lanzados en lugar de arrancar Chromium desde cero.
+"""
+import os
+import sys
+import queue
+import asyncio
+import threading
+
+# Cantidad de navegadores lanzados por el pool compartido
+BROWSER_POOL_SIZE = int(os.environ.get('BROWSER_POOL_SIZE', 1))
+# Días durante los que un lugar ya visitado se reutiliza sin abrir su página, 0 lo desactiva
+SEEN_PLACES_TTL_DAYS = float(os.environ.get('SEEN_PLACES_TTL_DAYS', 7))
+
+_lock = threading.Lock()
+_loop = None
+_pool = None
+# Serializa la creación del pool dentro del loop de fondo
+_pool_lock = asyncio.Lock()
+_seen_index = None
+_DONE = object()
+
+
+def _ensure_py_lead_generation_path():
+    """Agrega el directorio raíz al path para importar py_lead_generation"""
+    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+    if root_dir not in sys.path:
+        sys.path.insert(0, root_dir)
+
+
+def _get_loop():
+    """Devuelve el event loop de fondo, lo crea en el primer uso"""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='browser-pool', daemon=True).start()
+        return _loop
+
+
+async def _get_pool():
+    """Devuelve el BrowserPool compartido, debe llamarse dentro del loop de fondo
+
+    El pool se publica solo cuando ya arrancó, las llamadas concurrentes esperan al mismo arranque
+    """
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            _ensure_py_lead_generation_path()
+            from py_lead_generation import BrowserPool
+            pool = BrowserPool(size=BROWSER_POOL_SIZE)
+            await pool.start()
+            _pool = pool
+    return _pool
+
+
+def _get_seen_index():
+    """Devuelve el índice de lugares ya visitados compartido entre búsquedas o None si está desactivado"""
+    global _seen_index
+    if _seen_index is None and SEEN_PLACES_TTL_DAYS > 0:
+        _ensure_py_lead_generation_path()
+        from py_lead_generation.src.engines.seen_index import SeenIndex
+        _seen_index = SeenIndex(ttl_s=SEEN_PLACES_TTL_DAYS * 24 * 3600)
+    return _seen_index
+
+
+def prewarm_browsers(searches):
+    """Prepara contextos de navegador para las búsquedas encoladas sin bloquear la petición"""
+    _ensure_py_lead_generation_path()
+    from py_lead_generation.src.engines.playwright_config import PlaywrightEngineConfig
+
+    async def prewarm():
+        pool = await _get_pool()
+        await pool.prewarm(searches, **PlaywrightEngineConfig.PAGE_PARAMS)
+
+    asyncio.run_coroutine_threadsafe(prewarm(), _get_loop())
+
+
+def browser_pool_stats():
+    """Devuelve la ocupación del pool o None si todavía no se creó"""
+    return _pool.stats if _pool is not None else None
+
+
+def host_scheduler_stats():
+    """Devuelve las esperas y solicitudes en curso por host del planificador compartido por todos los engines"""
+    _ensure_py_lead_generation_path()
+    from py_lead_generation.src.engines.scheduler import default_scheduler
+    return default_scheduler.stats
+
+
+def circuit_breakers_stats():
+    """Devuelve el estado del circuit breaker de cada fuente, abierto mientras la fuente falla o bloquea"""
+    _ensure_py_lead_generation_path()
+    from py_lead_generation.src.engines.resilience import circuit_breakers_stats as stats
+    return stats()
+
+
+def iter_engine_entries(engine):
+    """Ejecuta engine.stream() en el pool compartido y devuelve sus entradas a medida que llegan"""
+    entries = queue.Queue()
+
+    async def produce():
+        try:
+            engine.browser_pool = await _get_pool()
+            engine.seen_index = _get_seen_index()
+            async for entry in engine.stream():
+                entries.put(entry)
+        finally:
+            entries.put(_DONE)
+
+    future = asyncio.run_coroutine_threadsafe(produce(), _get_loop())
+    try:
+        while (entry := entries.get()) is not _DONE:
+            yield entry
+    finally:
+        # Si el consumidor se detiene antes de tiempo, se cancela la búsqueda
+        future.cancel()
+    future.result()
@@ -1,2 +1,5 @@
 from py_lead_generation.src.yelp.engine import YelpEngine
 from py_lead_generation.src.google_maps.engine import GoogleMapsEngine
+from py_lead_generation.src.engines.browser_pool import BrowserPool
+from py_lead_generation.src.google_maps.tiling import GoogleMapsTiledSearch
+from py_lead_generation.src.engines.batch import BatchRunner, SearchJob
@@ -12,11 +12,40 @@ class AbstractEngine(ABC):
     [CONSTANT] `FIELD_NAMES` - field names of scraped data, extracts data entries to csv file based on these field names
 
     [EDITABLE] `FILENAME` - file name for exporting collected leads, must have .csv extension 
+
+    [CONSTANT] `EXTRACTION_SPEC` - `ExtractionSpec` of the fields scraped from every search result entry page, names should match `FIELD_NAMES`
+
+    [CONSTANT] `PAYLOAD_URL_PATTERNS` - regular expressions of the data payload urls requested by the search results page, decoded by `_decode_payload`
+
+    [CONSTANT] `SEARCH_READY_SELECTOR` - selector, which is present once search results are rendered, `None` waits for network idle state
+
+    [CONSTANT] `DETAIL_READY_SELECTOR` - selector, which is present once a search result entry page is rendered, `None` waits for network idle state
+
+    [CONSTANT] `HOST_LIMITS` - `HostLimit` by host name, the rate each website tolerates, used by the scheduler unless the user set their own limit
+
+    [CONSTANT] `BLOCK_PAGE_PATTERNS` - regular expressions of the consent, captcha and "unusual traffic" page urls the website redirects to instead of the requested page
+
+    [CONSTANT] `SUPPORTS_HTTP_FAST_PATH` - whether search result entry pages serve `EXTRACTION_SPEC` fields in the initial html, so they can be fetched without rendering
     '''
 
     BASE_URL = ''
     FIELD_NAMES = []
     FILENAME = 'leads.csv'
+    EXTRACTION_SPEC = None
+    PAYLOAD_URL_PATTERNS = []
+    SEARCH_READY_SELECTOR = None
+    DETAIL_READY_SELECTOR = None
+    HOST_LIMITS = {}
+    BLOCK_PAGE_PATTERNS = []
+    SUPPORTS_HTTP_FAST_PATH = False
+
+    async def _prepare(self) -> None:
+        '''
+        Resolves everything the search url depends on, e.g., coordinates, awaited by `run()` while the browser is starting
+
+        Should be overridden in child class if its constructor cannot build the url right away
+        '''
+        ...
 
     async def _get_search_results_urls(self, *args, **kwargs) -> list[str]:
         '''
@@ -24,12 +53,46 @@ class AbstractEngine(ABC):
         '''
         ...
 
-    def _parse_data_with_soup(self, html: str) -> list[dict]:
+    @classmethod
+    def _parse_data_with_soup(cls, html: str, backend: str = None) -> list[dict]:
         '''
         `html: str` - html representation of the page to parse
+        `backend: str = None` - parser backend name, by default `PARSER_BACKEND`
+
+        Should be defined in child class, as a classmethod it can be run in a separate process
 
-        Should be defined in child class
+        `BaseEngine` defines it by running `EXTRACTION_SPEC`
 
         Returns `list[dict]` typed parsed data - `[title, addr, phone, website]`
         '''
         ...
+
+    @classmethod
+    def _decode_payload(cls, url: str, body: str) -> dict[str, dict]:
+        '''
+        `url: str` - url of the captured data payload response
+        `body: str` - body of the response
+
+        Should be defined in child class, if `PAYLOAD_URL_PATTERNS` are set
+
+        Returns `dict[str, dict]` typed entries decoded from the payload by their `_place_key`
+        '''
+        ...
+
+    @classmethod
+    def _place_key(cls, url: str) -> str:
+        '''
+        `url: str` - url of the search result entry
+
+        Returns `str` typed key identifying the place regardless of url tracking parameters, by default the url itself
+        '''
+        return url
+
+    @classmethod
+    def _canonical_url(cls, url: str) -> str:
+        '''
+        `url: str` - url of the search result entry
+
+        Returns `str` typed short url of the place built from its `_place_key`, which `_place_key` maps back to the same key, by default the key itself
+        '''
+        return cls._place_key(url)
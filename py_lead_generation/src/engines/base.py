@@ -1,8 +1,29 @@
+import re
+import time
 import asyncio
-from playwright.async_api import Playwright, async_playwright
+import logging
+from collections import Counter, deque
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable
+from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from py_lead_generation.src.misc.writer import CsvWriter
-from py_lead_generation.src.engines.playwright_config import PlaywrightEngineConfig
+from py_lead_generation.src.misc.parsers import get_parser_backend
+from py_lead_generation.src.engines.playwright_config import BlockedPageError, BrowserSessionLost, PlaywrightEngineConfig
+from py_lead_generation.src.engines.concurrency import AdaptiveConcurrency
+from py_lead_generation.src.engines.resilience import CircuitBreaker, EmptyPageError, RetryPolicy, get_circuit_breaker
+from py_lead_generation.src.engines.checkpoint import CheckpointStore
+from py_lead_generation.src.engines.seen_index import SeenIndex
+from py_lead_generation.src.engines.scheduler import HostScheduler, default_scheduler
+from py_lead_generation.src.engines.interception import ResponseInterceptor
+from py_lead_generation.src.engines.routing import RequestBlocker
+from py_lead_generation.src.engines.http_fetcher import HttpFetcher
+from py_lead_generation.src.engines.parsing import ParseError, get_parse_executor, discard_parse_executor
+
+
+logger = logging.getLogger(__name__)
 
 
 class BaseEngine(PlaywrightEngineConfig):
@@ -10,27 +31,219 @@ class BaseEngine(PlaywrightEngineConfig):
     `BaseEngine`
 
     Base engine class expressing methods, which are shared between all engines, does not provide implementation of `AbstractEngine` methods
+
+    [EDITABLE] `PARSE_EXECUTOR` - `'process'` or `'thread'` executor to parse pages outside of the event loop, `None` parses them right in the loop, process workers get the parser backend name with every page, so they work with any multiprocessing start method
+
+    [EDITABLE] `PARSE_WORKERS` - amount of parse executor workers, by default equals to the amount of cpu cores
+
+    [EDITABLE] `PARSER_BACKEND` - html parser backend name, `'selectolax'`, `'lxml'` or `'soup'`, by default uses `misc.parsers.set_default_parser_backend` one
+
+    [EDITABLE] `EXTRACTION_MODE` - `'html'` copies every page html to python and parses it, `'browser'` evaluates `EXTRACTION_SPEC` in the page and returns only the field values
+
+    [EDITABLE] `HARVEST_MODE` - `'detail'` opens every search result entry page, `'list'` takes entries harvested from the search results list as they are, `'hybrid'` opens pages only for harvested entries missing `REQUIRED_FIELDS`
+
+    [EDITABLE] `REQUIRED_FIELDS` - fields, which should not be empty in a harvested entry in `'hybrid'` mode, by default all `FIELD_NAMES`
+
+    [EDITABLE] `INTERCEPT_PAYLOADS` - whether data payloads matching `PAYLOAD_URL_PATTERNS` are captured while listing and decoded into harvested entries, rendered search results are used only for what could not be decoded
+
+    [EDITABLE] `BLOCKING_PROFILE` - `BlockingProfile` of the requests aborted on every page, e.g., images, fonts, map tiles and analytics, `None` allows everything
+
+    [EDITABLE] `HTTP_FAST_PATH` - whether engines with `SUPPORTS_HTTP_FAST_PATH` fetch entry pages over plain http first, a page is opened in the browser only if `REQUIRED_FIELDS` are missing, requires `httpx`
+
+    [EDITABLE] `HTTP_CONCURRENCY` - maximum amount of http fast path requests in flight
+
+    [EDITABLE] `HTTP_FAST_PATH_MAX_FAILURES` - amount of consecutive failed or blocked http fast path requests, after which the fast path is turned off for the rest of the run
+
+    [EDITABLE] `ADAPTIVE_CONCURRENCY` - whether the amount of entry pages opened at the same time is adapted between `MIN_CONCURRENCY` and `PAGE_POOL_SIZE` by latency, timeouts, empty pages and block pages, see `AdaptiveConcurrency`, otherwise all `PAGE_POOL_SIZE` pages are used
+
+    [EDITABLE] `MIN_CONCURRENCY`, `INITIAL_CONCURRENCY` - lower bound and starting point of the adaptive concurrency window
+
+    [EDITABLE] `MAX_SESSION_RESTARTS` - amount of times a crashed browser is restarted during a single run
+
+    [EDITABLE] `RETRY_POLICY` - `RetryPolicy` of the search page and entry page navigations, which time out, fail, hit a block page or render nothing, `None` disables retries
+
+    [EDITABLE] `CIRCUIT_BREAKER` - whether navigations go through the `CircuitBreaker` of the engine class, shared by all its instances, so a failure spike pauses every engine of the source instead of burning through the urls
+
+    [EDITABLE] `checkpoint` - optional `CheckpointStore`, which keeps listed urls and completed entries, so an interrupted run resumes instead of starting over
+
+    [EDITABLE] `seen_index` - optional `SeenIndex` shared between runs, places scraped by earlier runs are reused from it while they are fresh
+
+    [EDITABLE] `scheduler` - `HostScheduler` every navigation and http fast path request goes through, shared by all engines of the process by default, `None` disables pacing
+
+    [EDITABLE] `url_filter` - optional callable, which gets every listed search result url and returns `False` to skip it, e.g., to deduplicate places between several runs
     '''
 
+    PARSE_EXECUTOR = 'process'
+    PARSE_WORKERS = None
+    PARSER_BACKEND = None
+    EXTRACTION_MODE = 'html'
+    HARVEST_MODE = 'detail'
+    REQUIRED_FIELDS = []
+    INTERCEPT_PAYLOADS = True
+    BLOCKING_PROFILE = None
+    HTTP_FAST_PATH = True
+    HTTP_CONCURRENCY = 16
+    HTTP_FAST_PATH_MAX_FAILURES = 5
+    ADAPTIVE_CONCURRENCY = True
+    MIN_CONCURRENCY = 1
+    INITIAL_CONCURRENCY = 2
+    MAX_SESSION_RESTARTS = 2
+    RETRY_POLICY: RetryPolicy | None = RetryPolicy()
+    CIRCUIT_BREAKER = True
+    url_filter: Callable[[str], bool] | None = None
+    checkpoint: CheckpointStore | None = None
+    seen_index: SeenIndex | None = None
+    scheduler: HostScheduler | None = default_scheduler
+
     async def run(self) -> None:
         '''
         Uses headles webdriver powered by Playwright
 
         Creates a web url based on initialized parameters
 
-        Parses results by given query and url one by one
+        Parses results by given query and url, up to `PAGE_POOL_SIZE` of them at the same time
 
         Assigns collected results to `.entries`
 
         To save the results call `.save_to_csv()` method after       
         '''
-        async with async_playwright() as playwright:
-            self.playwright: Playwright = playwright
-            await self._setup_browser()
-            await self._open_url_and_wait(self.url)
-            urls: list[str] = await self._get_search_results_urls()
-            self._entries: list[dict] = await self._get_search_results_entries(urls)
-            await self.browser.close()
+        self._entries: list[dict] = [entry async for entry in self.stream(include_completed=True)]
+
+    async def stream(self, include_completed: bool = False) -> AsyncIterator[dict]:
+        '''
+        `include_completed: bool = False` - whether entries completed by an interrupted run are yielded first, see `checkpoint`
+
+        Same as `.run()`, but yields every entry as soon as its page is parsed instead of collecting them
+
+        Entries are yielded in the order of search results, nothing is kept in `.entries`
+
+        A crashed browser is restarted up to `MAX_SESSION_RESTARTS` times, urls completed before the crash are not opened again
+
+        Usage:
+
+        `async for entry in engine.stream(): ...`
+        '''
+        self._failed_urls: dict[str, Exception] = {}
+        self._harvested: dict[str, dict] = {}
+        self._wait_outcomes: list[dict] = []
+        self._request_blocker = RequestBlocker(self.BLOCKING_PROFILE) if self.BLOCKING_PROFILE else None
+        self._payload_interceptor: ResponseInterceptor | None = None
+        self._session_restarts = 0
+        self._retry_stats = Counter()
+        if self.scheduler is not None:
+            self.scheduler.set_default_limits(self.HOST_LIMITS)
+        urls: list[str] | None = None
+        completed: set[str] = set()
+
+        def complete(url: str, entry: dict) -> None:
+            completed.add(url)
+            if self.checkpoint is not None:
+                self.checkpoint.add_entry(self._checkpoint_key(), url, entry)
+
+        preparing = asyncio.ensure_future(self._prepare())
+        try:
+            while True:
+                try:
+                    async with self._browser_session():
+                        try:
+                            await preparing
+                            if urls is None and self.checkpoint is not None:
+                                urls, completed = self._resume_from_checkpoint()
+                                if include_completed and completed:
+                                    entries = self.checkpoint.completed(self._checkpoint_key())
+                                    for url in urls:
+                                        if url in entries:
+                                            yield entries[url]
+                                    # Entries of the interrupted run are not held while the rest is scraped
+                                    del entries
+                            if urls is None:
+                                urls = await self._list_search_results()
+                                if self.checkpoint is not None:
+                                    self.checkpoint.save_urls(self._checkpoint_key(), urls, self._harvested)
+
+                            remaining = [url for url in urls if url not in completed]
+                            async for entry in self._iter_search_results_entries(remaining, on_entry=complete):
+                                yield entry
+                        except Exception as e:
+                            if not self._is_session_lost():
+                                raise
+                            raise BrowserSessionLost(self.url, e) from e
+                    break
+                except BrowserSessionLost as e:
+                    if self._session_restarts >= self.MAX_SESSION_RESTARTS:
+                        raise
+                    self._session_restarts += 1
+                    logger.warning(
+                        'Browser session of %s was lost (%r), restarting, %s of %s urls are completed',
+                        self.url, e.error, len(completed), len(urls or []),
+                    )
+        finally:
+            preparing.cancel()
+
+        if self.checkpoint is not None:
+            self.checkpoint.finish(self._checkpoint_key())
+
+    async def _list_search_results(self) -> list[str]:
+        '''
+        Opens the search results page, lists its urls and harvests entries from it according to `HARVEST_MODE`
+
+        Returns `list[str]` typed search result urls accepted by `url_filter`
+        '''
+        interceptor = self._payload_interceptor = self._attach_payload_interceptor()
+
+        async def open_search_page() -> tuple[bool, bool]:
+            ready = await self._open_url_and_wait(
+                self.url, self.SEARCH_READY_TIMEOUT_S, ready_selector=self.SEARCH_READY_SELECTOR
+            )
+            self._raise_if_blocked(self.url, self.page)
+            return True, ready
+
+        await self._with_retries(self.url, open_search_page)
+        urls: list[str] = await self._get_search_results_urls()
+        self._listed_urls_count = len(urls)
+        if self.url_filter is not None:
+            urls = [url for url in urls if self.url_filter(url)]
+        await self._harvest_search_results(interceptor)
+        return urls
+
+    def _checkpoint_key(self) -> str:
+        '''
+        Returns `str` typed key identifying the run in `checkpoint`, engine class name along with the search url
+        '''
+        return f'{type(self).__name__} {self.url}'
+
+    def _resume_from_checkpoint(self) -> tuple[list[str] | None, set[str]]:
+        '''
+        Returns `(urls, completed_urls)` of an unfinished run saved in `checkpoint`, urls are `None` if there is nothing to resume
+        '''
+        saved = self.checkpoint.load_urls(self._checkpoint_key())
+        if saved is None:
+            return None, set()
+        urls, harvested = saved
+        self._harvested.update(harvested)
+        completed = self.checkpoint.completed_urls(self._checkpoint_key())
+        logger.info('Resuming %s, %s of %s urls are already completed', self.url, len(completed), len(urls))
+        return urls, completed
+
+    async def stream_to_csv(self, filename: str = None) -> int:
+        '''
+        `filename: str = None` - optional parameter, by default uses `self.FILENAME`
+
+        Streams the search and appends every entry to the csv file right after it is parsed, see `.save_to_csv()`
+
+        Returns `int` typed amount of written entries
+        '''
+        if filename:
+            self.FILENAME = filename
+
+        if not self.FILENAME.endswith('.csv'):
+            raise ValueError('Use .csv file extension')
+        csv_writer = CsvWriter(self.FILENAME, self.FIELD_NAMES)
+        written = 0
+        async for entry in self.stream():
+            csv_writer.append([entry])
+            written += 1
+        return written
 
     def save_to_csv(self, filename: str = None) -> None:
         '''
@@ -72,32 +285,526 @@ class BaseEngine(PlaywrightEngineConfig):
         '''
         raise ValueError('Cannot set value to data. This is not allowed')
 
-    async def _open_url_and_wait(self, url: str, sleep_duration_s: int = 3) -> None:
+    @property
+    def failed_urls(self) -> dict[str, Exception]:
+        '''
+        Returns `dict[str, Exception]` typed urls, which could not be scraped during the last `.run()`, along with the raised error, `EmptyPageError` for pages, which stayed empty
+        '''
+        return getattr(self, '_failed_urls', {})
+
+    @property
+    def blocking_stats(self) -> dict:
+        '''
+        Returns `dict` typed counters of the requests blocked by `BLOCKING_PROFILE` during the last `.run()`, see `RequestBlocker.stats`
+        '''
+        blocker = getattr(self, '_request_blocker', None)
+        return blocker.stats if blocker else {}
+
+    @property
+    def wait_outcomes(self) -> list[dict]:
+        '''
+        Returns `list[dict]` typed outcomes of every page readiness wait during the last `.run()` - `{url, condition, ready, elapsed_s}`
+
+        Useful for tuning `*_READY_TIMEOUT_S` ceilings and ready selectors
+        '''
+        return getattr(self, '_wait_outcomes', [])
+
+    @property
+    def concurrency_stats(self) -> dict:
+        '''
+        Returns `dict` typed adaptive concurrency window, outcomes and decisions during the last `.run()`, see `AdaptiveConcurrency.stats`
+        '''
+        controller = getattr(self, '_concurrency', None)
+        return controller.stats if controller else {}
+
+    @property
+    def session_restarts(self) -> int:
+        '''
+        Returns `int` typed amount of times the browser session was restarted after a crash during the last `.run()`
+        '''
+        return getattr(self, '_session_restarts', 0)
+
+    @property
+    def retry_stats(self) -> dict:
+        '''
+        Returns `dict` typed counters of the last `.run()` - `retries` made, `exhausted` urls, which failed every attempt, and `breaker_wait_s` spent waiting for an open circuit
+        '''
+        stats = getattr(self, '_retry_stats', Counter())
+        return {
+            'retries': stats['retries'],
+            'exhausted': stats['exhausted'],
+            'breaker_wait_s': round(stats['breaker_wait_s'], 3),
+        }
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        '''
+        Returns `CircuitBreaker` shared by all engines of this class or `None` if `CIRCUIT_BREAKER` is disabled
+        '''
+        return get_circuit_breaker(type(self).__name__) if self.CIRCUIT_BREAKER else None
+
+    @property
+    def listed_urls_count(self) -> int:
+        '''
+        Returns `int` typed amount of search results listed during the last `.run()`, including the ones skipped by `url_filter`
+        '''
+        return getattr(self, '_listed_urls_count', 0)
+
+    @property
+    def http_fast_path_stats(self) -> dict:
+        '''
+        Returns `dict` typed counters of the http fast path during the last `.run()` - `fetched` entries, `fallbacks` to the browser, `disabled` flag whether it was turned off by `HTTP_FAST_PATH_MAX_FAILURES` and `HttpFetcher.stats`
+        '''
+        return dict(getattr(self, '_http_fast_path_stats', {}))
+
+    async def _open_url_and_wait(
+        self, url: str, timeout_s: float = 3, page: Page = None, ready_selector: str = None
+    ) -> bool:
         '''
         `url: str` - url to open
-        `sleep_duration_s: int = 3` - amount of seconds to wait for the page to load before any operations on that page
+        `timeout_s: float = 3` - maximum amount of seconds to wait for the page data to be ready before any operations on that page
+        `page: Page = None` - page to navigate, by default uses `self.page`
+        `ready_selector: str = None` - selector, which appears once the data is rendered, network idle state is awaited if not given
+
+        Navigates to `url` without waiting for the full `load` event and returns as soon as the page is ready or `timeout_s` is exceeded
+
+        Waits for `scheduler` first, the host slot is held until the page is ready
 
-        Navigates to initialized `self.url` and waits for `sleep_duration_s` seconds
+        Returns `bool` typed flag whether the page got ready in time
         '''
-        await self.page.goto(url)
-        await asyncio.sleep(sleep_duration_s)
+        page = page or self.page
+        self._page_navigations[page] = self._page_navigations.get(page, 0) + 1
+        async with self._host_slot(url):
+            await page.goto(url, wait_until='domcontentloaded')
+            return await self._wait_until_ready(page, timeout_s, ready_selector)
 
-    async def _get_search_results_entries(self, urls: list[str]) -> list[dict]:
+    async def _with_retries(self, url: str, attempt: Callable[[], Awaitable[tuple[bool, Any]]]) -> Any:
+        '''
+        `url: str` - url the attempt navigates to, used for logging
+        `attempt: Callable[[], Awaitable[tuple[bool, Any]]]` - navigation returning `(healthy, result)`, e.g., `(False, entry)` for an empty page
+
+        Repeats failed and unhealthy attempts according to `RETRY_POLICY` with a jittered backoff in between, every attempt waits for `circuit_breaker` to close and reports its outcome to it
+
+        Errors of a lost browser session are raised right away, they are not a fault of the source
+
+        Returns the result of the first healthy attempt or of the last one, raises the error of the last attempt if it failed
+        '''
+        policy = self.RETRY_POLICY or RetryPolicy(max_attempts=1)
+        breaker = self.circuit_breaker
+        for attempt_number in range(policy.max_attempts):
+            if attempt_number:
+                self._retry_stats['retries'] += 1
+                await asyncio.sleep(policy.delay(attempt_number - 1))
+            probe = False
+            if breaker is not None:
+                started = time.monotonic()
+                probe = await breaker.acquire()
+                self._retry_stats['breaker_wait_s'] += time.monotonic() - started
+
+            healthy = None
+            try:
+                healthy, result = await attempt()
+                error = None
+            except Exception as e:
+                if self._is_session_lost():
+                    raise
+                healthy, result, error = False, None, e
+                logger.debug('Attempt %s of %s failed for %s: %r', attempt_number + 1, policy.max_attempts, url, e)
+            finally:
+                if breaker is not None and healthy is None:
+                    breaker.release(probe)
+                elif breaker is not None:
+                    breaker.record(healthy, probe)
+            if healthy:
+                return result
+
+        self._retry_stats['exhausted'] += 1
+        if error is not None:
+            raise error
+        return result
+
+    def _host_slot(self, url: str) -> AsyncContextManager:
+        '''
+        `url: str` - url about to be requested
+
+        Returns `scheduler` slot of the url host or a no-op context if `scheduler` is `None`
+        '''
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(url)
+
+    async def _wait_until_ready(self, page: Page, timeout_s: float, ready_selector: str = None) -> bool:
+        '''
+        `page: Page` - page to wait for
+        `timeout_s: float` - ceiling of the wait in seconds
+        `ready_selector: str = None` - selector to wait for, network idle state is awaited if not given
+
+        Records the outcome to `.wait_outcomes` and returns `bool` typed flag whether the page got ready in time
+        '''
+        condition = ready_selector or 'networkidle'
+        start_time = time.perf_counter()
+        try:
+            if ready_selector:
+                await page.wait_for_selector(ready_selector, state='attached', timeout=timeout_s * 1000)
+            else:
+                await page.wait_for_load_state('networkidle', timeout=timeout_s * 1000)
+            ready = True
+        except PlaywrightTimeoutError:
+            ready = False
+
+        self._wait_outcomes.append({
+            'url': page.url,
+            'condition': condition,
+            'ready': ready,
+            'elapsed_s': round(time.perf_counter() - start_time, 3),
+        })
+        return ready
+
+    async def _get_search_result_entry(self, url: str, page: Page) -> dict:
+        '''
+        `url: str` - url of the entity to scrape
+        `page: Page` - page from the pool to open the url on
+
+        Raises `BlockedPageError` if a consent or captcha page was opened instead
+
+        Returns `dict` typed search result entry for the given url
+        '''
+        await self._open_url_and_wait(
+            url, self.DETAIL_READY_TIMEOUT_S, page, self.DETAIL_READY_SELECTOR
+        )
+        self._raise_if_blocked(url, page)
+        if self.EXTRACTION_MODE == 'browser':
+            data = await self._extract_in_browser(url, page)
+        else:
+            html = await page.content()
+            data = await self._parse_html(url, html)
+        return dict(zip(self.EXTRACTION_SPEC.names, data))
+
+    def _raise_if_blocked(self, url: str, page: Page) -> None:
+        '''
+        Raises `BlockedPageError` if the page was redirected to an url matching `BLOCK_PAGE_PATTERNS`
+        '''
+        if any(re.search(pattern, page.url) for pattern in self.BLOCK_PAGE_PATTERNS):
+            raise BlockedPageError(url, page.url)
+
+    def _is_empty_value(self, name: str, value: Any) -> bool:
+        '''
+        Returns `bool` typed flag whether the field value is missing, `EXTRACTION_SPEC` defaults, e.g., `'-'`, count as missing
+        '''
+        if value in ('', None):
+            return True
+        defaults = self.EXTRACTION_SPEC.defaults if self.EXTRACTION_SPEC else {}
+        return name in defaults and value == defaults[name]
+
+    def _is_empty_entry(self, entry: dict) -> bool:
+        '''
+        Returns `bool` typed flag whether none of `EXTRACTION_SPEC` fields got a value, which usually means the page was not rendered
+        '''
+        return all(self._is_empty_value(field.name, entry.get(field.name)) for field in self.EXTRACTION_SPEC.fields)
+
+    async def _new_page(self) -> Page:
+        '''
+        Opens a new `Page` and injects `EXTRACTION_SPEC` into it once, if `'browser'` extraction mode is used
+
+        Blocks page requests matching `BLOCKING_PROFILE` if it is set
+        '''
+        page = await super()._new_page()
+        if self._request_blocker:
+            await self._request_blocker.attach(page)
+        if self.EXTRACTION_MODE == 'browser':
+            await page.add_init_script(self.EXTRACTION_SPEC.to_init_script('detail'))
+        return page
+
+    async def _extract_in_browser(self, url: str, page: Page) -> list[str]:
+        '''
+        `url: str` - url of the opened page, used for error reporting
+        `page: Page` - page to evaluate injected `EXTRACTION_SPEC` on
+
+        Returns `list[str]` typed cleaned values, raises `ParseError` if extraction failed
+        '''
+        try:
+            values = await page.evaluate(self.EXTRACTION_SPEC.evaluate_expression('detail'))
+            return self.EXTRACTION_SPEC.clean(values)
+        except Exception as e:
+            raise ParseError(url, e) from e
+
+    @classmethod
+    def _parse_data_with_soup(cls, html: str, backend: str = None) -> list[str]:
+        '''
+        `html: str` - html representation of the page to parse
+        `backend: str = None` - parser backend name, by default `PARSER_BACKEND`
+
+        Runs the engine `EXTRACTION_SPEC` with the parser backend in a single traversal of the document
+
+        Returns `list[str]` typed parsed data in the order of `EXTRACTION_SPEC` fields
+        '''
+        return cls.EXTRACTION_SPEC.extract(html, get_parser_backend(backend or cls.PARSER_BACKEND))
+
+    async def _parse_html(self, url: str, html: str) -> list[str]:
+        '''
+        `url: str` - url of the parsed page, used for error reporting
+        `html: str` - html representation of the page to parse
+
+        Runs `_parse_data_with_soup` in the `PARSE_EXECUTOR`, so that parsing overlaps with other pages navigation
+
+        The parser backend is resolved here and passed to the worker, a process worker started by `spawn` does not see `set_default_parser_backend` of the parent
+
+        Raises `ParseError` if parsing failed
+        '''
+        try:
+            if not self.PARSE_EXECUTOR:
+                return self._parse_data_with_soup(html)
+
+            executor = get_parse_executor(self.PARSE_EXECUTOR, self.PARSE_WORKERS)
+            loop = asyncio.get_running_loop()
+            try:
+                backend = get_parser_backend(self.PARSER_BACKEND).NAME
+                return await loop.run_in_executor(executor, type(self)._parse_data_with_soup, html, backend)
+            except BrokenProcessPool:
+                discard_parse_executor(executor)
+                raise
+        except Exception as e:
+            raise ParseError(url, e) from e
+
+    def _attach_payload_interceptor(self) -> ResponseInterceptor | None:
+        '''
+        Starts capturing `PAYLOAD_URL_PATTERNS` responses of `self.page`, if they are going to be used by `HARVEST_MODE`
+
+        Returns `ResponseInterceptor` or `None` if payloads are not intercepted
+        '''
+        if not (self.INTERCEPT_PAYLOADS and self.PAYLOAD_URL_PATTERNS) or self.HARVEST_MODE == 'detail':
+            return None
+        interceptor = ResponseInterceptor(self.PAYLOAD_URL_PATTERNS)
+        interceptor.attach(self.page)
+        return interceptor
+
+    async def _harvest_search_results(self, interceptor: ResponseInterceptor | None) -> None:
+        '''
+        `interceptor: ResponseInterceptor | None` - interceptor of the search results page data payloads
+
+        Fills harvested entries from decoded payloads first and from the rendered search results list after, unless `HARVEST_MODE` is `'detail'`
+        '''
+        if self.HARVEST_MODE == 'detail':
+            return
+
+        if interceptor is not None:
+            interceptor.detach()
+            for url, body in await interceptor.collect():
+                try:
+                    self._add_harvested(self._decode_payload(url, body) or {})
+                except Exception as e:
+                    logger.debug('Failed to decode payload of %s: %r', url, e)
+
+        self._add_harvested(await self._harvest_search_results_list())
+
+    async def _harvest_search_results_list(self) -> dict[str, dict]:
+        '''
+        Can be defined in child class to extract entries right from the rendered search results list
+
+        Returns `dict[str, dict]` typed entries by their `_place_key`
+        '''
+        return {}
+
+    def _add_harvested(self, entries: dict[str, dict]) -> None:
+        '''
+        `entries: dict[str, dict]` - harvested entries by their `_place_key`
+
+        Adds new entries, already harvested ones only get their empty fields filled
+        '''
+        for key, entry in entries.items():
+            harvested = self._harvested.setdefault(key, {})
+            for field, value in entry.items():
+                if not harvested.get(field):
+                    harvested[field] = value
+
+    def _merge_harvested(self, harvested: dict | None, entry: dict) -> dict:
+        '''
+        Returns `dict` typed scraped entry with its empty fields taken from the harvested one
+        '''
+        if harvested is None:
+            return entry
+        return {**harvested, **{
+            key: harvested[key] if self._is_empty_value(key, value) and not self._is_empty_value(key, harvested.get(key))
+            else value
+            for key, value in entry.items()
+        }}
+
+    async def _start_http_fetcher(self) -> HttpFetcher | None:
+        '''
+        Returns started `HttpFetcher` sharing cookies of the browser context or `None` if the http fast path is not used
+        '''
+        self._http_fast_path_stats = {'fetched': 0, 'fallbacks': 0, 'disabled': False}
+        self._http_fast_path_failures = 0
+        if not (self.SUPPORTS_HTTP_FAST_PATH and self.HTTP_FAST_PATH and self.EXTRACTION_SPEC):
+            return None
+        if not HttpFetcher.is_available():
+            logger.info('httpx is not installed, %s entries are scraped in the browser', type(self).__name__)
+            return None
+        fetcher = HttpFetcher(self.HTTP_CONCURRENCY)
+        await fetcher.start(self.context, self.page)
+        return fetcher
+
+    async def _fetch_search_result_entry(self, url: str, fetcher: HttpFetcher) -> dict | None:
+        '''
+        `url: str` - url of the entity to scrape
+        `fetcher: HttpFetcher` - started http fetcher
+
+        Fast path outcomes are not reported to `circuit_breaker`, a source answering plain http with `403` may still serve the browser, the fast path is skipped while the circuit is not closed, so only browser navigations probe it
+
+        After `HTTP_FAST_PATH_MAX_FAILURES` consecutive failed requests, error statuses, e.g., `403`, or redirects to `BLOCK_PAGE_PATTERNS` the fast path is turned off for the rest of the run
+
+        Returns `dict` typed search result entry parsed from the plain http response or `None` if the page should be opened in the browser instead
+        '''
+        breaker = self.circuit_breaker
+        if self._http_fast_path_stats['disabled'] or (breaker is not None and breaker.state != 'closed'):
+            self._http_fast_path_stats['fallbacks'] += 1
+            return None
+
+        try:
+            async with self._host_slot(url):
+                html = await fetcher.fetch(url, self.BLOCK_PAGE_PATTERNS)
+        except Exception as e:
+            logger.debug('HTTP fast path failed for %s: %r', url, e)
+            self._http_fast_path_failures += 1
+            if self._http_fast_path_failures >= self.HTTP_FAST_PATH_MAX_FAILURES and not self._http_fast_path_stats['disabled']:
+                logger.info(
+                    'HTTP fast path of %s is off after %s failed requests in a row: %r',
+                    type(self).__name__, self._http_fast_path_failures, e,
+                )
+                self._http_fast_path_stats['disabled'] = True
+            html = None
+        else:
+            self._http_fast_path_failures = 0
+
+        try:
+            entry = dict(zip(self.EXTRACTION_SPEC.names, await self._parse_html(url, html))) if html is not None else None
+        except ParseError as e:
+            logger.debug('HTTP fast path failed for %s: %r', url, e)
+            entry = None
+
+        if entry is None or not self._is_complete(entry):
+            self._http_fast_path_stats['fallbacks'] += 1
+            return None
+        self._http_fast_path_stats['fetched'] += 1
+        return entry
+
+    def _is_complete(self, entry: dict) -> bool:
+        '''
+        `entry: dict` - entry harvested from the search results list
+
+        Returns `bool` typed flag whether none of `REQUIRED_FIELDS` is empty in the entry, see `_is_empty_value`
+        '''
+        return not any(self._is_empty_value(field, entry.get(field)) for field in self.REQUIRED_FIELDS or self.FIELD_NAMES)
+
+    async def _iter_search_results_entries(
+        self, urls: list[str], on_entry: Callable[[str, dict], None] = None
+    ) -> AsyncIterator[dict]:
         '''
         `urls: list[str]` - list of urls for google maps entities to scrape for
+        `on_entry: Callable[[str, dict], None] = None` - optional callback getting every url along with its non-empty entry right before it is yielded
+
+        Opens up to `PAGE_POOL_SIZE` urls at the same time, each one on its own page taken from the pool, the amount is adapted by `ADAPTIVE_CONCURRENCY`
+
+        A failing url is retried according to `RETRY_POLICY`, if every attempt fails it does not abort the others, it is skipped and stored in `.failed_urls`, unless the browser itself is lost
+
+        Entries harvested from the search results list are reused according to `HARVEST_MODE`
+
+        Worn out pages are replaced with fresh ones between urls, see `MAX_NAVIGATIONS_PER_PAGE` and `MAX_BROWSER_RSS_MB`
 
-        Goes over each url in the list and retreives data from opening page one by one
+        Places stored in `seen_index` within its ttl are taken from it without opening their urls, empty entries are never stored, every entry gets the `_canonical_url` of the place as `SourceURL`
 
-        Searches for data using exact image source values selectors, no other unique way to extract data using selectors is not found yet
+        Engines with `SUPPORTS_HTTP_FAST_PATH` fetch urls over plain http first and fall back to a page only if `REQUIRED_FIELDS` are missing
 
-        Returns `list[dict]` typed search result entries for each seperate given url from `urls`
+        Yields `dict` typed search result entries in the same order as given `urls`, only a small window of them is scheduled ahead
         '''
-        entries = []
-        for url in urls:
-            await self._open_url_and_wait(url, 1.5)
-            html = await self.page.content()
-            data = self._parse_data_with_soup(html)
-            entry = dict(zip(self.FIELD_NAMES, data))
-            entries.append(entry)
+        pool = await self._setup_page_pool()
+        fetcher = await self._start_http_fetcher()
+        pool_size = max(self.PAGE_POOL_SIZE, 1)
+        self._concurrency = AdaptiveConcurrency(
+            initial=self.INITIAL_CONCURRENCY if self.ADAPTIVE_CONCURRENCY else pool_size,
+            minimum=min(self.MIN_CONCURRENCY, pool_size) if self.ADAPTIVE_CONCURRENCY else pool_size,
+            maximum=pool_size,
+        )
+        lookahead = 2 * max(self.PAGE_POOL_SIZE, 1)
+        if fetcher is not None:
+            lookahead = max(lookahead, 2 * self.HTTP_CONCURRENCY)
+
+        async def scrape(url: str) -> dict | None:
+            key = self._place_key(url)
+            source_url = self._canonical_url(url)
+            if self.seen_index is not None:
+                seen = self.seen_index.get(key)
+                if seen is not None:
+                    return {**seen, 'SourceURL': source_url}
+
+            entry = await scrape_fresh(url, key)
+            if entry is None:
+                return None
+            entry = {**entry, 'SourceURL': source_url}
+            # A page, which stayed empty, is not remembered, the next run opens it again
+            if self.seen_index is not None and not self._is_empty_entry(entry):
+                self.seen_index.add(key, entry)
+            return entry
+
+        async def scrape_fresh(url: str, key: str) -> dict | None:
+            harvested = self._harvested.get(key) if self.HARVEST_MODE != 'detail' else None
+            if harvested is not None and (self.HARVEST_MODE == 'list' or self._is_complete(harvested)):
+                return harvested
+
+            if fetcher is not None:
+                entry = await self._fetch_search_result_entry(url, fetcher)
+                if entry is not None:
+                    return self._merge_harvested(harvested, entry)
+
+            async def open_entry_page() -> tuple[bool, dict]:
+                async with self._concurrency.slot() as report:
+                    page = await pool.get()
+                    try:
+                        page = await self._recycle_page_if_needed(page)
+                        entry = await self._get_search_result_entry(url, page)
+                        empty = self._is_empty_entry(entry)
+                        report('empty' if empty else 'ok')
+                        return not empty, entry
+                    except Exception as e:
+                        report(
+                            'blocked' if isinstance(e, BlockedPageError)
+                            else 'timeout' if isinstance(e, PlaywrightTimeoutError) else 'error'
+                        )
+                        raise
+                    finally:
+                        pool.put_nowait(page)
+
+            try:
+                entry = await self._with_retries(url, open_entry_page)
+                if self._is_empty_entry(entry):
+                    raise EmptyPageError(url)
+            except Exception as e:
+                if self._is_session_lost():
+                    raise
+                logger.warning('Failed to scrape %s: %r', url, e)
+                self._failed_urls[url] = e
+                return None
+            return self._merge_harvested(harvested, entry)
 
-        return entries
+        pending: deque[tuple[str, asyncio.Task]] = deque()
+        urls_iter = iter(urls)
+        try:
+            while True:
+                for url in urls_iter:
+                    pending.append((url, asyncio.create_task(scrape(url))))
+                    if len(pending) >= lookahead:
+                        break
+                if not pending:
+                    break
+                url, task = pending.popleft()
+                entry = await task
+                if entry is not None:
+                    if on_entry is not None and not self._is_empty_entry(entry):
+                        on_entry(url, entry)
+                    yield entry
+        finally:
+            for _, task in pending:
+                task.cancel()
+            if fetcher is not None:
+                self._http_fast_path_stats.update(fetcher.stats)
+                await fetcher.close()
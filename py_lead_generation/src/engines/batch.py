@@ -0,0 +1,226 @@
+import math
+import time
+import asyncio
+import logging
+from typing import AsyncIterator
+
+from py_lead_generation.src.engines.base import BaseEngine
+from py_lead_generation.src.engines.browser_pool import BrowserPool
+from py_lead_generation.src.engines.seen_index import SeenIndex
+from py_lead_generation.src.google_maps.engine import GoogleMapsEngine
+from py_lead_generation.src.yelp.engine import YelpEngine
+from py_lead_generation.src.misc.writer import CsvWriter
+
+
+logger = logging.getLogger(__name__)
+
+
+ENGINES: dict[str, type[BaseEngine]] = {
+    'google_maps': GoogleMapsEngine,
+    'yelp': YelpEngine,
+}
+
+
+class SearchJob:
+    '''
+    `SearchJob`
+
+    Single (query, location) search of a `BatchRunner`, run by its own engine
+    '''
+
+    def __init__(
+        self,
+        engine: type[BaseEngine] | str,
+        query: str,
+        location: str,
+        engine_kwargs: dict = None,
+        engine_params: dict = None,
+        filename: str = None,
+    ) -> None:
+        '''
+        `engine: type[BaseEngine] | str` - engine class or its name from `ENGINES`, e.g., `'google_maps'` or `YelpEngine`
+        `query: str` - what are you looking for? e.g., `gym`
+        `location: str` - where are you looking for that query? e.g., `Astana`
+        `engine_kwargs: dict = None` - extra engine constructor arguments, e.g., `{'zoom': 14}` for `GoogleMapsEngine`
+        `engine_params: dict = None` - class attributes overridden on the job engine, e.g., `{'HARVEST_MODE': 'hybrid'}`
+        `filename: str = None` - csv file the job entries are saved to by `BatchRunner.save_to_csv()`, by default the engine `FILENAME`
+        '''
+        if isinstance(engine, str):
+            if engine not in ENGINES:
+                raise ValueError(f'Engine should be one of {list(ENGINES)}, got {engine!r}')
+            engine = ENGINES[engine]
+        self.engine_class = engine
+        self.query = query
+        self.location = location
+        self.engine_kwargs = engine_kwargs or {}
+        self.engine_params = engine_params or {}
+        self.filename = filename or engine.FILENAME
+
+    def __repr__(self) -> str:
+        return f'SearchJob({self.engine_class.__name__}, {self.query!r}, {self.location!r})'
+
+    def create_engine(self, browser_pool: BrowserPool) -> BaseEngine:
+        '''
+        `browser_pool: BrowserPool` - pool the engine leases its browser context from
+
+        Returns `BaseEngine` typed engine of the job with `engine_params` applied
+        '''
+        engine = self.engine_class(self.query, self.location, browser_pool=browser_pool, **self.engine_kwargs)
+        for name, value in self.engine_params.items():
+            setattr(engine, name, value)
+        return engine
+
+
+class BatchRunner:
+    '''
+    `BatchRunner`
+
+    Runs many `SearchJob`s across engines over a single shared `BrowserPool`, instead of launching a browser per search
+
+    At most `concurrency` jobs run at the same time, requests to every host are paced across all of them by the shared engine `scheduler`
+
+    Places scraped by an earlier job of the batch are reused by the later ones through a shared `SeenIndex`, unless `seen_index` is given
+
+    A failing job does not abort the others, its error is kept in `.job_outcomes`
+
+    Usage:
+
+    `jobs = [SearchJob('google_maps', query, city) for query in queries for city in cities]`
+
+    `runner = BatchRunner(jobs, concurrency=8, browsers=2)`
+
+    `async for job, entry in runner.stream(): ...`
+
+    `print(runner.job_outcomes)`
+    '''
+
+    def __init__(
+        self,
+        jobs: list[SearchJob],
+        browser_pool: BrowserPool = None,
+        concurrency: int = 4,
+        browsers: int = None,
+        seen_index: SeenIndex = None,
+    ) -> None:
+        '''
+        `jobs: list[SearchJob]` - searches to run, started in the given order
+        `browser_pool: BrowserPool = None` - optional warm browser pool, a browser pool is started for the batch if omitted
+        `concurrency: int = 4` - amount of jobs running at the same time
+        `browsers: int = None` - amount of browsers of the pool started for the batch, by default enough to hold `concurrency` contexts
+        `seen_index: SeenIndex = None` - index places are reused from, by default an in-memory one living for the batch
+        '''
+        if concurrency < 1:
+            raise ValueError('Concurrency should be positive')
+        self.jobs = list(jobs)
+        self.browser_pool = browser_pool
+        self.concurrency = concurrency
+        self.browsers = browsers
+        self.seen_index = seen_index
+        self._results: dict[SearchJob, list[dict]] = {}
+        self._job_outcomes: list[dict] = []
+
+    async def run(self) -> None:
+        '''
+        Runs every job and assigns their entries to `.results`
+        '''
+        self._results = {job: [] for job in self.jobs}
+        async for job, entry in self.stream():
+            self._results[job].append(entry)
+
+    async def stream(self) -> AsyncIterator[tuple[SearchJob, dict]]:
+        '''
+        Same as `.run()`, but yields `(job, entry)` as soon as any job scrapes an entry, entries of different jobs interleave
+
+        Entries of a single job keep their engine order
+        '''
+        self._job_outcomes = []
+        seen_index = self.seen_index or SeenIndex(path=':memory:', ttl_s=math.inf)
+        owned_pool = self.browser_pool is None
+        pool = self.browser_pool
+        if owned_pool:
+            pool = BrowserPool(size=self.browsers or max(math.ceil(self.concurrency / 8), 1))
+
+        jobs: asyncio.Queue = asyncio.Queue()
+        for job in self.jobs:
+            jobs.put_nowait(job)
+        results: asyncio.Queue = asyncio.Queue()
+        started = time.perf_counter()
+
+        async def run_job(job: SearchJob) -> None:
+            outcome = {
+                'job': job, 'entries': 0, 'failed_urls': 0, 'error': None,
+                'queued_s': round(time.perf_counter() - started, 3), 'first_entry_s': None,
+            }
+            job_started = time.perf_counter()
+            engine = None
+            try:
+                engine = job.create_engine(pool)
+                engine.seen_index = seen_index
+                async for entry in engine.stream():
+                    if outcome['first_entry_s'] is None:
+                        outcome['first_entry_s'] = round(time.perf_counter() - job_started, 3)
+                    outcome['entries'] += 1
+                    results.put_nowait((job, entry))
+            except Exception as e:
+                logger.warning('Failed to run %r: %r', job, e)
+                outcome['error'] = e
+            if engine is not None:
+                outcome['failed_urls'] = len(engine.failed_urls)
+            outcome['elapsed_s'] = round(time.perf_counter() - job_started, 3)
+            self._job_outcomes.append(outcome)
+
+        async def worker() -> None:
+            try:
+                while not jobs.empty():
+                    await run_job(jobs.get_nowait())
+            finally:
+                results.put_nowait(None)
+
+        workers: list[asyncio.Task] = []
+        try:
+            if owned_pool:
+                await pool.start()
+            if self.jobs:
+                await pool.prewarm(min(self.concurrency, len(self.jobs)), **self.jobs[0].engine_class.PAGE_PARAMS)
+            workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(self.jobs)))]
+            running = len(workers)
+            while running:
+                item = await results.get()
+                if item is None:
+                    running -= 1
+                else:
+                    yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if owned_pool:
+                await pool.close()
+
+    def save_to_csv(self) -> None:
+        '''
+        Appends entries of every job to its `SearchJob.filename`, jobs sharing a file are written into it one after another
+        '''
+        if not any(self._results.values()):
+            raise NotImplementedError(
+                'Entries are empty, call .run() method first to save them'
+            )
+        for job, entries in self._results.items():
+            if not job.filename.endswith('.csv'):
+                raise ValueError('Use .csv file extension')
+            if entries:
+                CsvWriter(job.filename, job.engine_class.FIELD_NAMES).append(entries)
+
+    @property
+    def results(self) -> dict[SearchJob, list[dict]]:
+        '''
+        Returns `dict[SearchJob, list[dict]]` typed entries of every job once `.run()` method was called
+        '''
+        return self._results
+
+    @property
+    def job_outcomes(self) -> list[dict]:
+        '''
+        Returns `list[dict]` typed outcome of every finished job during the last `.run()` - `{job, entries, failed_urls, error, queued_s, first_entry_s, elapsed_s}`
+        '''
+        return list(self._job_outcomes)
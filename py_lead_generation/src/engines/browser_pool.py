@@ -0,0 +1,262 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from py_lead_generation.src.engines.playwright_config import PlaywrightEngineConfig
+
+
+class BrowserPool:
+    '''
+    `BrowserPool`
+
+    Long-lived pool of pre-launched browsers handing out recyclable browser contexts to engine runs
+
+    All engines using the pool should run in the same event loop the pool was started in
+
+    Usage:
+
+    `async with BrowserPool(size=2) as pool:`
+
+    `    engine = GoogleMapsEngine('gym', 'Astana', browser_pool=pool)`
+
+    `    await engine.run()`
+    '''
+
+    def __init__(
+        self,
+        size: int = 1,
+        browser_params: dict = None,
+        max_contexts_per_browser: int = 8,
+        max_context_uses: int = 20,
+    ) -> None:
+        '''
+        `size: int = 1` - amount of browsers launched by the pool
+        `browser_params: dict = None` - chromium launch parameters, by default `PlaywrightEngineConfig.BROWSER_PARAMS`
+        `max_contexts_per_browser: int = 8` - maximum amount of contexts leased and idle per browser, acquiring more waits for a release
+        `max_context_uses: int = 20` - amount of leases after which a context is closed instead of being recycled
+        '''
+        self.size = size
+        self.browser_params = browser_params or dict(PlaywrightEngineConfig.BROWSER_PARAMS)
+        self.max_contexts_per_browser = max_contexts_per_browser
+        self.max_context_uses = max_context_uses
+
+        self._playwright: Playwright = None
+        self._browsers: list[Browser] = []
+        self._idle: dict[str, list[BrowserContext]] = {}
+        self._leased: set[BrowserContext] = set()
+        self._uses: dict[BrowserContext, int] = {}
+        self._owners: dict[BrowserContext, Browser] = {}
+        self._params_keys: dict[BrowserContext, str] = {}
+        self._condition = asyncio.Condition()
+        self._start_lock = asyncio.Lock()
+        self._waiting = 0
+        self._created = 0
+        self._reused = 0
+
+    async def __aenter__(self) -> 'BrowserPool':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        '''
+        Starts playwright and launches `size` browsers, relaunches crashed ones if called again
+
+        Concurrent calls are serialized, so they never start a second playwright driver or launch more than `size` browsers
+        '''
+        async with self._start_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            while len(self._browsers) < self.size:
+                self._browsers.append(await self._playwright.chromium.launch(**self.browser_params))
+
+    async def close(self) -> None:
+        '''
+        Closes every browser of the pool along with their contexts and stops playwright
+        '''
+        async with self._start_lock:
+            for browser in self._browsers:
+                await browser.close()
+            self._browsers.clear()
+            self._idle.clear()
+            self._leased.clear()
+            self._uses.clear()
+            self._owners.clear()
+            self._params_keys.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def prewarm(self, contexts: int, **context_params) -> None:
+        '''
+        `contexts: int` - amount of idle contexts to have ready, e.g., the amount of queued searches
+        `context_params` - context parameters the contexts are created with, e.g., engine `PAGE_PARAMS`
+
+        Launches missing browsers and creates idle contexts up to the pool capacity
+        '''
+        self._drop_disconnected()
+        await self.start()
+        key = self._params_key(context_params)
+        async with self._condition:
+            while len(self._idle.get(key, [])) < contexts:
+                browser = self._least_loaded_browser()
+                if browser is None:
+                    break
+                context = await self._new_context(browser, context_params)
+                self._idle.setdefault(key, []).append(context)
+
+    async def acquire(self, **context_params) -> BrowserContext:
+        '''
+        `context_params` - context parameters, e.g., engine `PAGE_PARAMS`, idle contexts are reused only for the same parameters
+
+        Returns idle `BrowserContext` or a new one, waits if every browser is at `max_contexts_per_browser`
+        '''
+        key = self._params_key(context_params)
+        async with self._condition:
+            while True:
+                self._drop_disconnected()
+                await self.start()
+                idle = self._idle.get(key)
+                if idle:
+                    context = idle.pop()
+                    self._reused += 1
+                    break
+
+                browser = self._least_loaded_browser()
+                if browser is None and self._evict_idle():
+                    browser = self._least_loaded_browser()
+                if browser is not None:
+                    context = await self._new_context(browser, context_params)
+                    break
+
+                self._waiting += 1
+                try:
+                    await self._condition.wait()
+                finally:
+                    self._waiting -= 1
+
+            self._leased.add(context)
+            self._uses[context] += 1
+            return context
+
+    async def release(self, context: BrowserContext, broken: bool = False) -> None:
+        '''
+        `context: BrowserContext` - context returned by `acquire`
+        `broken: bool = False` - whether the context should be closed instead of being recycled, e.g., after a crash
+
+        Closes pages of the context and puts it back to idle ones, unless it was used `max_context_uses` times
+        '''
+        async with self._condition:
+            self._leased.discard(context)
+            browser = self._owners.get(context)
+            reusable = (
+                not broken and browser is not None and browser.is_connected()
+                and self._uses.get(context, 0) < self.max_context_uses
+            )
+            try:
+                if reusable:
+                    for page in context.pages:
+                        await page.close()
+                    self._idle.setdefault(self._params_keys[context], []).append(context)
+                else:
+                    await self._forget(context)
+            except Exception:
+                await self._forget(context)
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def lease(self, **context_params) -> AsyncIterator[BrowserContext]:
+        '''
+        `context_params` - context parameters, see `acquire`
+
+        Yields acquired `BrowserContext` and releases it afterwards, contexts of a crashed browser are not recycled
+        '''
+        context = await self.acquire(**context_params)
+        try:
+            yield context
+        except BaseException:
+            browser = self._owners.get(context)
+            await self.release(context, broken=browser is None or not browser.is_connected())
+            raise
+        else:
+            await self.release(context)
+
+    @property
+    def stats(self) -> dict:
+        '''
+        Returns `dict` typed pool occupancy - `{browsers, capacity, leased, idle, waiting, created, reused}`
+        '''
+        return {
+            'browsers': len(self._browsers),
+            'capacity': self.size * self.max_contexts_per_browser,
+            'leased': len(self._leased),
+            'idle': sum(len(contexts) for contexts in self._idle.values()),
+            'waiting': self._waiting,
+            'created': self._created,
+            'reused': self._reused,
+        }
+
+    @staticmethod
+    def _params_key(context_params: dict) -> str:
+        return repr(sorted(context_params.items()))
+
+    def _contexts_of(self, browser: Browser) -> int:
+        return sum(owner is browser for owner in self._owners.values())
+
+    def _least_loaded_browser(self) -> Browser | None:
+        '''
+        Returns the browser with the least amount of contexts, which is below `max_contexts_per_browser`, or `None`
+        '''
+        candidates = [
+            browser for browser in self._browsers
+            if self._contexts_of(browser) < self.max_contexts_per_browser
+        ]
+        return min(candidates, key=self._contexts_of, default=None)
+
+    def _evict_idle(self) -> bool:
+        '''
+        Closes one idle context created with other parameters to make room, returns `bool` typed flag whether anything was evicted
+        '''
+        for contexts in self._idle.values():
+            if contexts:
+                context = contexts.pop()
+                asyncio.ensure_future(context.close())
+                self._forget_sync(context)
+                return True
+        return False
+
+    def _drop_disconnected(self) -> None:
+        '''
+        Forgets crashed browsers along with their contexts, missing browsers are relaunched by `start`
+        '''
+        for browser in [browser for browser in self._browsers if not browser.is_connected()]:
+            self._browsers.remove(browser)
+            for context, owner in list(self._owners.items()):
+                if owner is browser:
+                    for contexts in self._idle.values():
+                        if context in contexts:
+                            contexts.remove(context)
+                    self._forget_sync(context)
+
+    async def _new_context(self, browser: Browser, context_params: dict) -> BrowserContext:
+        context = await browser.new_context(**context_params)
+        self._owners[context] = browser
+        self._uses[context] = 0
+        self._params_keys[context] = self._params_key(context_params)
+        self._created += 1
+        return context
+
+    async def _forget(self, context: BrowserContext) -> None:
+        self._forget_sync(context)
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    def _forget_sync(self, context: BrowserContext) -> None:
+        self._owners.pop(context, None)
+        self._uses.pop(context, None)
+        self._params_keys.pop(context, None)
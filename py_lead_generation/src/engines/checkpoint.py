@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    '''
+    `CheckpointStore`
+
+    Persistent sqlite store of the crawl progress - listed search result urls, harvested entries and every completed entry
+
+    An interrupted run with the same checkpoint key resumes from it, already completed urls are not opened again
+
+    Usage:
+
+    `engine.checkpoint = CheckpointStore('leads.checkpoint.sqlite3')`
+
+    `await engine.run()` - run it again after a crash, it continues where it stopped
+    '''
+
+    def __init__(self, path: str) -> None:
+        '''
+        `path: str` - sqlite file path, created if missing
+        '''
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(
+                'CREATE TABLE IF NOT EXISTS runs ('
+                'key TEXT PRIMARY KEY, urls TEXT NOT NULL, harvested TEXT NOT NULL, '
+                'created_at REAL NOT NULL, finished_at REAL);'
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT NOT NULL, url TEXT NOT NULL, entry TEXT NOT NULL, completed_at REAL NOT NULL, '
+                'PRIMARY KEY (key, url));'
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _execute(self, query: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            connection = self._connect()
+            try:
+                rows = connection.execute(query, params).fetchall()
+                connection.commit()
+                return rows
+            except sqlite3.Error as e:
+                logger.warning('Checkpoint %s query failed: %r', self.path, e)
+                return []
+
+    def load_urls(self, key: str) -> tuple[list[str], dict[str, dict]] | None:
+        '''
+        `key: str` - checkpoint key of the run, e.g., the search url
+
+        Returns `(urls, harvested)` saved by an unfinished run or `None` if the search results should be listed again
+        '''
+        rows = self._execute('SELECT urls, harvested FROM runs WHERE key = ? AND finished_at IS NULL', (key,))
+        if not rows:
+            return None
+        urls, harvested = rows[0]
+        return json.loads(urls), json.loads(harvested)
+
+    def save_urls(self, key: str, urls: list[str], harvested: dict[str, dict] = None) -> None:
+        '''
+        `key: str` - checkpoint key of the run
+        `urls: list[str]` - listed search result urls
+        `harvested: dict[str, dict] = None` - entries harvested from the search results list
+
+        Starts a new run for the key, entries completed by the previous run with the same key are forgotten
+        '''
+        self._execute('DELETE FROM entries WHERE key = ?', (key,))
+        self._execute(
+            'INSERT OR REPLACE INTO runs (key, urls, harvested, created_at, finished_at) VALUES (?, ?, ?, ?, NULL)',
+            (key, json.dumps(urls), json.dumps(harvested or {}), time.time()),
+        )
+
+    def completed(self, key: str) -> dict[str, dict]:
+        '''
+        `key: str` - checkpoint key of the run
+
+        Returns `dict[str, dict]` typed completed entries by their urls
+        '''
+        rows = self._execute('SELECT url, entry FROM entries WHERE key = ?', (key,))
+        return {url: json.loads(entry) for url, entry in rows}
+
+    def completed_urls(self, key: str) -> set[str]:
+        '''
+        `key: str` - checkpoint key of the run
+
+        Returns `set[str]` typed urls of the completed entries, without loading the entries themselves
+        '''
+        return {url for url, in self._execute('SELECT url FROM entries WHERE key = ?', (key,))}
+
+    def add_entry(self, key: str, url: str, entry: dict) -> None:
+        '''
+        `key: str` - checkpoint key of the run
+        `url: str` - search result url the entry was scraped from
+        `entry: dict` - completed entry
+        '''
+        self._execute(
+            'INSERT OR REPLACE INTO entries (key, url, entry, completed_at) VALUES (?, ?, ?, ?)',
+            (key, url, json.dumps(entry, default=str), time.time()),
+        )
+
+    def finish(self, key: str) -> None:
+        '''
+        `key: str` - checkpoint key of the run
+
+        Marks the run finished, so the next run with the same key lists search results again
+        '''
+        self._execute('UPDATE runs SET finished_at = ? WHERE key = ?', (time.time(), key))
+        self._execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def close(self) -> None:
+        '''
+        Closes the sqlite connection, the store can still be used afterwards
+        '''
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,156 @@
+import time
+import asyncio
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+OUTCOMES = ('ok', 'slow', 'timeout', 'empty', 'blocked', 'error')
+
+
+class AdaptiveConcurrency:
+    '''
+    `AdaptiveConcurrency`
+
+    AIMD controller of the amount of requests in flight, like tcp congestion window
+
+    Every `window` healthy outcomes in a row grow the window by one, a timeout, empty, blocked or failed request shrinks it by `decrease_factor`
+
+    A request is `'slow'` if its latency exceeds `slow_factor` times the latency baseline, the lowest recent latencies moving average, slow requests stop the growth
+
+    Only one decrease happens per window of requests, so a burst of failures of the requests sent together is counted once
+
+    Usage:
+
+    `controller = AdaptiveConcurrency(initial=2, maximum=8)`
+
+    `async with controller.slot() as report: report(outcome='ok')` - latency is measured by the slot
+
+    `print(controller.window, controller.decisions)`
+    '''
+
+    def __init__(
+        self,
+        initial: int = 2,
+        minimum: int = 1,
+        maximum: int = 8,
+        decrease_factor: float = 0.5,
+        slow_factor: float = 3.0,
+        max_decisions: int = 100,
+    ) -> None:
+        '''
+        `initial: int = 2` - window to start with
+        `minimum: int = 1`, `maximum: int = 8` - bounds of the window
+        `decrease_factor: float = 0.5` - window multiplier on a backoff outcome
+        `slow_factor: float = 3.0` - latency to baseline ratio, from which a request is considered `'slow'`
+        `max_decisions: int = 100` - amount of the latest decisions kept in `.decisions`
+        '''
+        if not 1 <= minimum <= maximum or not 0 < decrease_factor < 1:
+            raise ValueError('Window bounds should be 1 <= minimum <= maximum and decrease factor should be between 0 and 1')
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = min(max(initial, minimum), maximum)
+        self.decrease_factor = decrease_factor
+        self.slow_factor = slow_factor
+        self.outcomes = Counter()
+        self.decisions: deque[dict] = deque(maxlen=max_decisions)
+
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+        self._healthy_streak = 0
+        self._started = 0
+        self._decrease_blocked_until = 0
+        self._baseline_s: float | None = None
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator:
+        '''
+        Waits until the amount of requests in flight is below the window
+
+        Yields `report(outcome)` callable, which should be called once the request is done, an unreported slot counts as `'error'`
+        '''
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.window)
+            self.in_flight += 1
+            self._started += 1
+            sequence = self._started
+
+        started = time.perf_counter()
+        reported = []
+
+        def report(outcome: str) -> None:
+            if not reported:
+                reported.append(outcome)
+                self.record(outcome, time.perf_counter() - started, sequence)
+
+        try:
+            yield report
+        except asyncio.CancelledError:
+            reported.append('cancelled')
+            raise
+        finally:
+            report('error')
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record(self, outcome: str, latency_s: float, sequence: int = None) -> None:
+        '''
+        `outcome: str` - one of `OUTCOMES`
+        `latency_s: float` - duration of the request
+        `sequence: int = None` - ordinal number of the request start, used to count a burst of failures only once
+
+        Updates the window according to the outcome
+        '''
+        if outcome not in OUTCOMES:
+            raise ValueError(f'Outcome should be one of {OUTCOMES}, got {outcome!r}')
+        if outcome == 'ok' and self._baseline_s is not None and latency_s > self._baseline_s * self.slow_factor:
+            outcome = 'slow'
+        self.outcomes[outcome] += 1
+        sequence = self._started if sequence is None else sequence
+
+        if outcome == 'ok':
+            self._baseline_s = latency_s if self._baseline_s is None else min(
+                latency_s, 0.9 * self._baseline_s + 0.1 * latency_s
+            )
+            self._healthy_streak += 1
+            if self._healthy_streak >= self.window and self.window < self.maximum:
+                self._decide('increase', self.window + 1, outcome, latency_s)
+                self._healthy_streak = 0
+            return
+
+        self._healthy_streak = 0
+        if outcome == 'slow' or sequence <= self._decrease_blocked_until:
+            return
+        self._decide('decrease', max(int(self.window * self.decrease_factor), self.minimum), outcome, latency_s)
+        self._decrease_blocked_until = self._started
+
+    def _decide(self, action: str, window: int, outcome: str, latency_s: float) -> None:
+        self.decisions.append({
+            'time': time.time(),
+            'action': action,
+            'window': window,
+            'previous_window': self.window,
+            'outcome': outcome,
+            'latency_s': round(latency_s, 3),
+        })
+        self.window = window
+        if action == 'increase':
+            asyncio.ensure_future(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._condition:
+            self._condition.notify_all()
+
+    @property
+    def stats(self) -> dict:
+        '''
+        Returns `dict` typed controller state - `{window, in_flight, baseline_s, outcomes, decisions}`
+        '''
+        return {
+            'window': self.window,
+            'in_flight': self.in_flight,
+            'baseline_s': round(self._baseline_s, 3) if self._baseline_s is not None else None,
+            'outcomes': dict(self.outcomes),
+            'decisions': list(self.decisions),
+        }
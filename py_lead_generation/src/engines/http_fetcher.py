@@ -0,0 +1,126 @@
+import re
+import asyncio
+import importlib.util
+from playwright.async_api import BrowserContext, Page
+
+from py_lead_generation.src.engines.playwright_config import BlockedPageError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class HttpFetcher:
+    '''
+    `HttpFetcher`
+
+    Pooled async http client fetching pages without rendering them, reuses keep-alive connections and http/2 if `h2` is installed
+
+    Cookies and user agent are copied from the browser context, so requests look like they come from the same visitor
+
+    Requires optional `httpx` package, see `HttpFetcher.is_available()`
+
+    Usage:
+
+    `fetcher = HttpFetcher(max_concurrency=16)`
+
+    `await fetcher.start(context, page)`
+
+    `html = await fetcher.fetch(url)`
+
+    `await fetcher.close()`
+    '''
+
+    def __init__(self, max_concurrency: int = 16, timeout_s: float = 10, headers: dict = None) -> None:
+        '''
+        `max_concurrency: int = 16` - maximum amount of requests in flight, also the connection pool limit
+        `timeout_s: float = 10` - timeout of a single request
+        `headers: dict = None` - extra request headers
+        '''
+        if not self.is_available():
+            raise ValueError('HttpFetcher requires httpx, install it with `pip install httpx[http2]`')
+        self.max_concurrency = max_concurrency
+        self.timeout_s = timeout_s
+        self.headers = headers or {}
+        self._client: 'httpx.AsyncClient | None' = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._stats = {'requests': 0, 'failed_requests': 0, 'bytes_received': 0}
+
+    @staticmethod
+    def is_available() -> bool:
+        '''
+        Returns `bool` typed flag whether `httpx` is installed
+        '''
+        return httpx is not None
+
+    async def start(self, context: BrowserContext = None, page: Page = None) -> None:
+        '''
+        `context: BrowserContext = None` - browser context to copy cookies from
+        `page: Page = None` - page to copy user agent and language from
+
+        Opens the client, can be called again to refresh the copied cookies
+        '''
+        headers = {'Accept': 'text/html,application/xhtml+xml', **self.headers}
+        if page is not None:
+            user_agent, language = await page.evaluate('[navigator.userAgent, navigator.language]')
+            headers.setdefault('User-Agent', user_agent)
+            headers.setdefault('Accept-Language', language)
+
+        cookies = httpx.Cookies()
+        if context is not None:
+            for cookie in await context.cookies():
+                cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
+
+        await self.close()
+        self._client = httpx.AsyncClient(
+            http2=importlib.util.find_spec('h2') is not None,
+            headers=headers,
+            cookies=cookies,
+            follow_redirects=True,
+            timeout=self.timeout_s,
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+        )
+
+    async def fetch(self, url: str, block_patterns: list[str] = ()) -> str:
+        '''
+        `url: str` - url of the page to fetch
+        `block_patterns: list[str] = ()` - regular expressions of block page urls, e.g., engine `BLOCK_PAGE_PATTERNS`
+
+        Raises `httpx.HTTPError` if the request failed or the response status is not successful
+
+        Raises `BlockedPageError` if the request was redirected to an url matching `block_patterns`
+
+        Returns `str` typed html of the page
+        '''
+        if self._client is None:
+            raise RuntimeError('HttpFetcher is not started, call .start() first')
+        async with self._semaphore:
+            self._stats['requests'] += 1
+            try:
+                response = await self._client.get(url)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                self._stats['failed_requests'] += 1
+                raise
+            self._stats['bytes_received'] += len(response.content)
+            final_url = str(response.url)
+            if any(re.search(pattern, final_url) for pattern in block_patterns):
+                self._stats['failed_requests'] += 1
+                raise BlockedPageError(url, final_url)
+            return response.text
+
+    async def close(self) -> None:
+        '''
+        Closes pooled connections, the fetcher can be started again
+        '''
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        '''
+        Returns `dict[str, int]` typed counters - `requests`, `failed_requests` and `bytes_received`
+        '''
+        return dict(self._stats)
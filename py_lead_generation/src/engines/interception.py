@@ -0,0 +1,73 @@
+import re
+import asyncio
+import logging
+from playwright.async_api import Page, Response
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseInterceptor:
+    '''
+    `ResponseInterceptor`
+
+    Captures bodies of the page responses, which urls match any of given patterns, e.g., search data payloads
+
+    Usage:
+
+    `interceptor = ResponseInterceptor([r'/search\\?tbm=map'])`
+
+    `interceptor.attach(page)`
+
+    `payloads = await interceptor.collect()`
+    '''
+
+    def __init__(self, url_patterns: list[str]) -> None:
+        '''
+        `url_patterns: list[str]` - regular expressions searched for in the response urls
+        '''
+        self.url_patterns = [re.compile(pattern) for pattern in url_patterns]
+        self._payloads: list[tuple[str, str]] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._pages: list[Page] = []
+
+    def attach(self, page: Page) -> None:
+        '''
+        `page: Page` - page to listen to responses of, attaching the same page again does nothing
+        '''
+        if page in self._pages:
+            return
+        page.on('response', self._on_response)
+        self._pages.append(page)
+
+    def detach(self) -> None:
+        '''
+        Stops listening to responses of every attached page
+        '''
+        for page in self._pages:
+            page.remove_listener('response', self._on_response)
+        self._pages.clear()
+
+    async def collect(self) -> list[tuple[str, str]]:
+        '''
+        Waits for the bodies of already captured responses to be read
+
+        Returns `list[tuple[str, str]]` typed `(url, body)` payloads captured so far and forgets them
+        '''
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+        payloads, self._payloads = self._payloads, []
+        return payloads
+
+    def _on_response(self, response: Response) -> None:
+        if not any(pattern.search(response.url) for pattern in self.url_patterns):
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _read(self, response: Response) -> None:
+        try:
+            self._payloads.append((response.url, await response.text()))
+        except Exception as e:
+            logger.debug('Failed to read payload of %s: %r', response.url, e)
@@ -0,0 +1,64 @@
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+EXECUTOR_TYPES = {'process': ProcessPoolExecutor, 'thread': ThreadPoolExecutor}
+
+_executors: dict[tuple[str, int], Executor] = {}
+_lock = threading.Lock()
+
+
+class ParseError(Exception):
+    '''
+    Raised when the html of a search result entry page could not be parsed, keeps the failed `url`
+    '''
+
+    def __init__(self, url: str, error: Exception) -> None:
+        super().__init__(f'Failed to parse {url}: {error!r}')
+        self.url = url
+        self.error = error
+
+
+def get_parse_executor(kind: str, max_workers: int = None) -> Executor:
+    '''
+    `kind: str` - executor type, `'process'` or `'thread'`
+    `max_workers: int = None` - amount of workers, by default equals to the amount of cpu cores
+
+    Returns `Executor` shared between all engines of the process, created on the first call
+    '''
+    if kind not in EXECUTOR_TYPES:
+        raise ValueError(f'Unknown parse executor {kind!r}, use one of {list(EXECUTOR_TYPES)}')
+
+    max_workers = max_workers or os.cpu_count() or 1
+    key = (kind, max_workers)
+    with _lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = EXECUTOR_TYPES[kind](max_workers=max_workers)
+            _executors[key] = executor
+        return executor
+
+
+def discard_parse_executor(executor: Executor) -> None:
+    '''
+    `executor: Executor` - executor to forget, e.g., a process pool broken by a killed worker
+
+    Next `get_parse_executor` call creates a fresh one instead
+    '''
+    with _lock:
+        for key, value in list(_executors.items()):
+            if value is executor:
+                del _executors[key]
+    executor.shutdown(wait=False)
+
+
+def shutdown_parse_executors() -> None:
+    '''
+    Shuts down every shared parse executor
+    '''
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown()
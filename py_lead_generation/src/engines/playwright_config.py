@@ -1,4 +1,31 @@
-from playwright.async_api import Browser, Page, BrowserType
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from playwright.async_api import Browser, BrowserContext, Page, BrowserType, Playwright, async_playwright
+
+from py_lead_generation.src.engines.watchdog import MemoryWatchdog
+
+
+class BrowserSessionLost(Exception):
+    '''
+    Raised when the browser of the run crashed or disconnected, keeps the search `url` and the original `error`
+    '''
+
+    def __init__(self, url: str, error: Exception) -> None:
+        super().__init__(f'Browser session of {url} was lost: {error!r}')
+        self.url = url
+        self.error = error
+
+
+class BlockedPageError(Exception):
+    '''
+    Raised when a website answered with a consent, captcha or "unusual traffic" page instead of the requested one
+    '''
+
+    def __init__(self, url: str, block_url: str) -> None:
+        super().__init__(f'Opening {url} was blocked by {block_url}')
+        self.url = url
+        self.block_url = block_url
 
 
 class PlaywrightEngineConfig:
@@ -9,16 +36,123 @@ class PlaywrightEngineConfig:
 
     [EDITABLE] `BROWSER_PARAMS` - chromiun browser parameters configuration from playwright, additional parameters can be set if needed
 
-    [EDITABLE] `PAGE_PARAMS` - browser page parameters configuration from playwright, additional parameters can be set if needed
+    [EDITABLE] `PAGE_PARAMS` - browser context parameters configuration from playwright shared by all engine pages, additional parameters can be set if needed
+
+    [EDITABLE] `PAGE_POOL_SIZE` - amount of pages opened to scrape search results entries concurrently, `1` keeps the old one by one behaviour
+
+    [EDITABLE] `SEARCH_READY_TIMEOUT_S` - ceiling in seconds to wait for the search results page to render its data
+
+    [EDITABLE] `DETAIL_READY_TIMEOUT_S` - ceiling in seconds to wait for every search result entry page to render its data
+
+    [EDITABLE] `MAX_NAVIGATIONS_PER_PAGE` - amount of navigations after which a page is closed and replaced with a fresh one, `None` never recycles pages
+
+    [EDITABLE] `MAX_BROWSER_RSS_MB` - resident memory of the chromium processes in megabytes, above which pages are recycled as soon as they are free, `None` disables the watchdog, browsers of a shared `BrowserPool` are counted together
+
+    `browser_pool` - optional `BrowserPool` to lease a warm browser context from instead of launching a new browser for every run
     '''
 
-    BROWSER_PARAMS = {'headless': False, 'proxy': None, 'slow_mo': 150}
+    BROWSER_PARAMS = {'headless': False, 'proxy': None}
     PAGE_PARAMS = {'java_script_enabled': True, 'bypass_csp': True}
+    PAGE_POOL_SIZE = 4
+    SEARCH_READY_TIMEOUT_S = 10
+    DETAIL_READY_TIMEOUT_S = 5
+    MAX_NAVIGATIONS_PER_PAGE = 50
+    MAX_BROWSER_RSS_MB = None
+
+    browser_pool = None
+
+    @asynccontextmanager
+    async def _browser_session(self) -> AsyncIterator[None]:
+        '''
+        Sets up `self.context` and `self.page` for the run and tears them down afterwards
+
+        Leases the context from `self.browser_pool` if it is set, otherwise launches its own browser
+        '''
+        self._page_navigations: dict[Page, int] = {}
+        self._recycled_pages = 0
+        self._page_pool: asyncio.Queue | None = None
+        self._memory_watchdog = MemoryWatchdog(self.MAX_BROWSER_RSS_MB) if self.MAX_BROWSER_RSS_MB else None
+        if self.browser_pool is not None:
+            async with self.browser_pool.lease(**self.PAGE_PARAMS) as context:
+                self.context: BrowserContext = context
+                self.page: Page = await self._new_page()
+                yield
+            return
+
+        async with async_playwright() as playwright:
+            self.playwright: Playwright = playwright
+            await self._setup_browser()
+            try:
+                yield
+            finally:
+                await self.browser.close()
 
     async def _setup_browser(self) -> None:
         '''
-        Sets up the browser by initializing `playwright.chromiun` and `Browser` along with `Page` after
+        Sets up the browser by initializing `playwright.chromiun` and `Browser` along with `BrowserContext` and `Page` after
         '''
         chromium: BrowserType = self.playwright.chromium
         self.browser: Browser = await chromium.launch(**self.BROWSER_PARAMS)
-        self.page: Page = await self.browser.new_page(**self.PAGE_PARAMS)
+        self.context: BrowserContext = await self.browser.new_context(**self.PAGE_PARAMS)
+        self.page: Page = await self._new_page()
+
+    async def _new_page(self) -> Page:
+        '''
+        Opens a new `Page` in `self.context`, all pages of the run share cookies
+        '''
+        return await self.context.new_page()
+
+    async def _setup_page_pool(self) -> asyncio.Queue:
+        '''
+        Fills the pool with `PAGE_POOL_SIZE` pages, reusing already opened `self.page` as the first one
+
+        The pool is created once per browser session, later calls return the same pool
+
+        Returns `asyncio.Queue` of idle pages
+        '''
+        if self._page_pool is not None:
+            return self._page_pool
+        pool = asyncio.Queue()
+        pool.put_nowait(self.page)
+        for _ in range(max(self.PAGE_POOL_SIZE, 1) - 1):
+            pool.put_nowait(await self._new_page())
+        self._page_pool = pool
+        return pool
+
+    async def _recycle_page_if_needed(self, page: Page) -> Page:
+        '''
+        `page: Page` - idle page taken from the pool
+
+        Closes the page and opens a fresh one instead, if it was closed, navigated `MAX_NAVIGATIONS_PER_PAGE` times or browser memory is above `MAX_BROWSER_RSS_MB`
+
+        Returns `Page` typed page to continue with
+        '''
+        navigations = self._page_navigations.get(page, 0)
+        exhausted = self.MAX_NAVIGATIONS_PER_PAGE and navigations >= self.MAX_NAVIGATIONS_PER_PAGE
+        over_memory = navigations and self._memory_watchdog and self._memory_watchdog.over_limit()
+        if not (page.is_closed() or exhausted or over_memory):
+            return page
+
+        self._page_navigations.pop(page, None)
+        if not page.is_closed():
+            await page.close()
+        new_page = await self._new_page()
+        if page is self.page:
+            self.page = new_page
+        self._recycled_pages += 1
+        return new_page
+
+    def _is_session_lost(self) -> bool:
+        '''
+        Returns `bool` typed flag whether the browser of the current session crashed or disconnected
+        '''
+        context = getattr(self, 'context', None)
+        browser = context.browser if context is not None else None
+        return browser is not None and not browser.is_connected()
+
+    @property
+    def recycled_pages(self) -> int:
+        '''
+        Returns `int` typed amount of pages replaced with fresh ones during the last run
+        '''
+        return getattr(self, '_recycled_pages', 0)
@@ -0,0 +1,204 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+
+
+logger = logging.getLogger(__name__)
+
+
+class EmptyPageError(Exception):
+    '''
+    Raised when a page stayed empty after every attempt, keeps the failed `url`
+    '''
+
+    def __init__(self, url: str) -> None:
+        super().__init__(f'Page {url} stayed empty after every attempt')
+        self.url = url
+
+
+class RetryPolicy:
+    '''
+    `RetryPolicy`
+
+    Amount of attempts per url and exponential backoff between them with full jitter, so retries of many pages do not arrive together
+    '''
+
+    def __init__(self, max_attempts: int = 3, base_delay_s: float = 1, max_delay_s: float = 30) -> None:
+        '''
+        `max_attempts: int = 3` - amount of attempts including the first one, `1` disables retries
+        `base_delay_s: float = 1` - upper bound of the delay before the first retry, doubled for every next one
+        `max_delay_s: float = 30` - upper bound of any delay
+        '''
+        if max_attempts < 1 or base_delay_s < 0 or max_delay_s < 0:
+            raise ValueError('Attempts should be positive and delays should not be negative')
+        self.max_attempts = max_attempts
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+
+    def delay(self, attempt: int) -> float:
+        '''
+        `attempt: int` - zero based number of the failed attempt
+
+        Returns `float` typed random delay in seconds before the next attempt
+        '''
+        return random.uniform(0, min(self.base_delay_s * 2 ** attempt, self.max_delay_s))
+
+
+class CircuitBreaker:
+    '''
+    `CircuitBreaker`
+
+    Pauses every engine of a source once the failure rate of its latest requests spikes, e.g., the website started blocking
+
+    `closed` - requests go through, `open` - requests wait for `cooldown_s`, `half_open` - a single probe request decides whether to close or open again
+
+    Every consecutive opening doubles the cooldown up to `max_cooldown_s`
+
+    Usage:
+
+    `probe = await breaker.acquire()`
+
+    `breaker.record(success=True, probe=probe)`
+
+    Shared by engines running in different threads and event loops, see `get_circuit_breaker`
+    '''
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window_size: int = 20,
+        min_requests: int = 10,
+        cooldown_s: float = 30,
+        max_cooldown_s: float = 600,
+    ) -> None:
+        '''
+        `failure_rate: float = 0.5` - share of failed requests among the latest `window_size` ones, which opens the circuit
+        `window_size: int = 20` - amount of the latest request outcomes considered
+        `min_requests: int = 10` - the circuit is never opened with less outcomes in the window
+        `cooldown_s: float = 30` - pause after the first opening
+        `max_cooldown_s: float = 600` - upper bound of the pause
+        '''
+        if not 0 < failure_rate <= 1 or min_requests > window_size:
+            raise ValueError('Failure rate should be between 0 and 1 and min requests should not exceed window size')
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.cooldown_s = cooldown_s
+        self.max_cooldown_s = max_cooldown_s
+        self.state = 'closed'
+        self.openings = 0
+
+        self._lock = threading.Lock()
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._open_until = 0.0
+        self._current_cooldown_s = cooldown_s
+        self._probe_in_flight = False
+
+    async def acquire(self, poll_s: float = 1) -> bool:
+        '''
+        `poll_s: float = 1` - how often a waiting request checks whether the probe request has finished
+
+        Waits while the circuit is open, the first caller after the cooldown becomes the probe request
+
+        Returns `bool` typed flag whether the caller is the probe request, which should be passed to `.record()` or `.release()`
+        '''
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.state == 'closed':
+                    return False
+                if self.state == 'open' and now >= self._open_until:
+                    self.state = 'half_open'
+                if self.state == 'half_open' and not self._probe_in_flight:
+                    self._probe_in_flight = True
+                    return True
+                delay = self._open_until - now if self.state == 'open' else poll_s
+            await asyncio.sleep(max(delay, 0.01))
+
+    def record(self, success: bool, probe: bool = False) -> None:
+        '''
+        `success: bool` - whether the request got a usable page
+        `probe: bool = False` - whether the request was the probe one, see `.acquire()`
+        '''
+        with self._lock:
+            if probe:
+                self._probe_in_flight = False
+                if success:
+                    self.state = 'closed'
+                    self._outcomes.clear()
+                    self._current_cooldown_s = self.cooldown_s
+                    logger.info('Circuit closed, probe request succeeded')
+                else:
+                    self._open(self._current_cooldown_s * 2)
+                return
+            if self.state != 'closed':
+                # Outcome of a request sent before the circuit opened
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                len(self._outcomes) >= self.min_requests
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open(self.cooldown_s)
+
+    def release(self, probe: bool = False) -> None:
+        '''
+        `probe: bool = False` - whether the request was the probe one, see `.acquire()`
+
+        Gives up the request without an outcome, e.g., it was cancelled, so the next waiting request probes instead
+        '''
+        if probe:
+            with self._lock:
+                self._probe_in_flight = False
+
+    def _open(self, cooldown_s: float) -> None:
+        self._current_cooldown_s = min(cooldown_s, self.max_cooldown_s)
+        self._open_until = time.monotonic() + self._current_cooldown_s
+        self.state = 'open'
+        self.openings += 1
+        self._outcomes.clear()
+        logger.warning('Circuit opened for %.0f seconds after a failure spike', self._current_cooldown_s)
+
+    @property
+    def stats(self) -> dict:
+        '''
+        Returns `dict` typed breaker state - `{state, openings, failures, requests, open_for_s}`
+        '''
+        with self._lock:
+            return {
+                'state': self.state,
+                'openings': self.openings,
+                'failures': self._outcomes.count(False),
+                'requests': len(self._outcomes),
+                'open_for_s': round(max(self._open_until - time.monotonic(), 0), 3) if self.state == 'open' else 0,
+            }
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(source: str) -> CircuitBreaker:
+    '''
+    `source: str` - name of the scraped source, e.g., engine class name
+
+    Returns `CircuitBreaker` shared between all engines of the process scraping the source, created on the first call
+    '''
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(source)
+        if breaker is None:
+            breaker = _circuit_breakers[source] = CircuitBreaker()
+        return breaker
+
+
+def circuit_breakers_stats() -> dict[str, dict]:
+    '''
+    Returns `dict[str, dict]` typed `CircuitBreaker.stats` by source
+    '''
+    with _circuit_breakers_lock:
+        breakers = dict(_circuit_breakers)
+    return {source: breaker.stats for source, breaker in breakers.items()}
@@ -0,0 +1,167 @@
+import re
+from collections import Counter
+from urllib.parse import urlsplit
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import CDPSession, Page, Route
+
+
+ANALYTICS_HOSTS = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'connect.facebook.net',
+    'bat.bing.com',
+    'scorecardresearch.com',
+]
+
+# Playwright resource types by their CDP names
+CDP_RESOURCE_TYPES = {
+    'Document': 'document', 'Stylesheet': 'stylesheet', 'Image': 'image', 'Media': 'media', 'Font': 'font',
+    'Script': 'script', 'TextTrack': 'texttrack', 'XHR': 'xhr', 'Fetch': 'fetch', 'Prefetch': 'prefetch',
+    'EventSource': 'eventsource', 'WebSocket': 'websocket', 'Manifest': 'manifest', 'Ping': 'ping', 'Other': 'other',
+}
+
+
+def glob_to_regex(pattern: str) -> str:
+    '''
+    `pattern: str` - url wildcard pattern, `*` matches any characters and `?` matches a single one, e.g., `'*/maps/vt*'`
+
+    Returns `str` typed regular expression matching the whole url the same way CDP request patterns do
+    '''
+    return ''.join('.*' if char == '*' else '.' if char == '?' else re.escape(char) for char in pattern)
+
+
+class BlockingProfile:
+    '''
+    `BlockingProfile`
+
+    Set of rules describing requests, which are not needed to scrape the data and can be aborted
+    '''
+
+    def __init__(
+        self, resource_types: list[str] = (), url_patterns: list[str] = (), hosts: list[str] = ()
+    ) -> None:
+        '''
+        `resource_types: list[str] = ()` - playwright resource types to block, e.g., `image`, `media`, `font`
+        `url_patterns: list[str] = ()` - wildcard patterns matching the whole request url, e.g., `'*/maps/vt*'` for map tiles
+        `hosts: list[str] = ()` - hosts to block along with their subdomains, e.g., analytics
+        '''
+        self.resource_types = frozenset(resource_types)
+        self.url_patterns = tuple(url_patterns)
+        self.url_regex = re.compile('|'.join(map(glob_to_regex, url_patterns))) if url_patterns else None
+        self.hosts = tuple(hosts)
+
+    def reason(self, resource_type: str, url: str) -> str | None:
+        '''
+        Returns `str` typed reason to block the request - `resource_type`, `'url'` or `'host'`, `None` if the request is allowed
+        '''
+        if resource_type in self.resource_types:
+            return resource_type
+        if self.url_regex and self.url_regex.fullmatch(url):
+            return 'url'
+        host = urlsplit(url).hostname or ''
+        if any(host == blocked or host.endswith('.' + blocked) for blocked in self.hosts):
+            return 'host'
+        return None
+
+    def request_patterns(self) -> list[dict]:
+        '''
+        Returns `list[dict]` typed CDP `Fetch.RequestPattern`s intercepting every request the profile may block
+        '''
+        cdp_types = {playwright_type: cdp_type for cdp_type, playwright_type in CDP_RESOURCE_TYPES.items()}
+        url_patterns = [
+            *self.url_patterns,
+            *(pattern for host in self.hosts for pattern in (f'*://{host}/*', f'*://*.{host}/*')),
+        ]
+        return [
+            *({'resourceType': cdp_types[resource_type], 'requestStage': 'Request'}
+              for resource_type in sorted(self.resource_types) if resource_type in cdp_types),
+            *({'urlPattern': pattern, 'requestStage': 'Request'} for pattern in url_patterns),
+        ]
+
+
+class RequestBlocker:
+    '''
+    `RequestBlocker`
+
+    Aborts page requests matching the `BlockingProfile`, counts them and measures the traffic of the allowed ones
+
+    Chromium pages are handled through a CDP session, only the requests matching the profile are intercepted, so every other request keeps using the browser http cache, which `page.route` would disable for the whole page
+
+    Other browsers fall back to `page.route`, without the cache and the traffic measurement
+    '''
+
+    def __init__(self, profile: BlockingProfile) -> None:
+        '''
+        `profile: BlockingProfile` - rules of the requests to block
+        '''
+        self.profile = profile
+        self.blocked = Counter()
+        self.allowed = 0
+        self.cached = 0
+        self.transferred_bytes = 0
+
+    async def attach(self, page: Page) -> None:
+        '''
+        `page: Page` - page to block requests of
+        '''
+        try:
+            session = await page.context.new_cdp_session(page)
+        except PlaywrightError:
+            await page.route('**/*', self._handle)
+            return
+
+        session.on('Fetch.requestPaused', lambda event: self._on_request_paused(session, event))
+        session.on('Network.loadingFinished', self._on_loading_finished)
+        session.on('Network.requestServedFromCache', self._on_served_from_cache)
+        await session.send('Network.enable')
+        await session.send('Network.setCacheDisabled', {'cacheDisabled': False})
+        patterns = self.profile.request_patterns()
+        if patterns:
+            await session.send('Fetch.enable', {'patterns': patterns})
+
+    @property
+    def stats(self) -> dict:
+        '''
+        Returns `dict` typed counters - `{blocked_requests, allowed_requests, cached_responses, transferred_bytes, blocked_by_reason}`
+
+        `transferred_bytes` are the bytes actually received over the network by the allowed requests, responses served from the http cache transfer nothing
+        '''
+        return {
+            'blocked_requests': sum(self.blocked.values()),
+            'allowed_requests': self.allowed,
+            'cached_responses': self.cached,
+            'transferred_bytes': self.transferred_bytes,
+            'blocked_by_reason': dict(self.blocked),
+        }
+
+    async def _on_request_paused(self, session: CDPSession, event: dict) -> None:
+        resource_type = CDP_RESOURCE_TYPES.get(event.get('resourceType'), 'other')
+        reason = self.profile.reason(resource_type, event['request']['url'])
+        try:
+            if reason is None:
+                await session.send('Fetch.continueRequest', {'requestId': event['requestId']})
+            else:
+                self.blocked[reason] += 1
+                await session.send('Fetch.failRequest', {'requestId': event['requestId'], 'errorReason': 'BlockedByClient'})
+        except PlaywrightError:
+            # The page was closed while the request was paused
+            pass
+
+    def _on_loading_finished(self, event: dict) -> None:
+        self.allowed += 1
+        self.transferred_bytes += int(event.get('encodedDataLength', 0))
+
+    def _on_served_from_cache(self, _: dict) -> None:
+        self.cached += 1
+
+    async def _handle(self, route: Route) -> None:
+        request = route.request
+        reason = self.profile.reason(request.resource_type, request.url)
+        if reason is None:
+            self.allowed += 1
+            await route.continue_()
+        else:
+            self.blocked[reason] += 1
+            await route.abort('blockedbyclient')
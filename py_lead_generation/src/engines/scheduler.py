@@ -0,0 +1,202 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+
+class HostLimit:
+    '''
+    `HostLimit`
+
+    Politeness limits of a single host - token bucket refilled at `rate_per_s` with `burst` capacity and a cap of requests in flight
+    '''
+
+    def __init__(self, rate_per_s: float, burst: int = 1, max_concurrency: int = 4) -> None:
+        '''
+        `rate_per_s: float` - sustained amount of requests started per second
+        `burst: int = 1` - amount of requests, which can be started at once after an idle period
+        `max_concurrency: int = 4` - maximum amount of requests in flight
+        '''
+        if rate_per_s <= 0 or burst < 1 or max_concurrency < 1:
+            raise ValueError('Rate, burst and concurrency should be positive')
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+
+    def __repr__(self) -> str:
+        return f'HostLimit({self.rate_per_s}, burst={self.burst}, max_concurrency={self.max_concurrency})'
+
+
+class _HostState:
+    def __init__(self, limit: HostLimit) -> None:
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated_at = time.monotonic()
+        self.in_flight = 0
+        self.waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self.requests = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+
+class HostScheduler:
+    '''
+    `HostScheduler`
+
+    Process wide scheduler of requests by host, every engine routes its navigations through the same instance
+
+    Enforces `HostLimit` of each host across all running engines, including the ones running in other threads and event loops
+
+    Usage:
+
+    `scheduler.set_limit('www.google.com', HostLimit(2, burst=4, max_concurrency=8))`
+
+    `async with scheduler.slot(url): await page.goto(url)`
+
+    `print(scheduler.stats)`
+    '''
+
+    def __init__(self, default_limit: HostLimit = None) -> None:
+        '''
+        `default_limit: HostLimit = None` - limit of the hosts without their own one, by default 2 requests per second with burst of 4 and 8 in flight
+        '''
+        self.default_limit = default_limit or HostLimit(2, burst=4, max_concurrency=8)
+        self._lock = threading.Lock()
+        self._limits: dict[str, HostLimit] = {}
+        self._hosts: dict[str, _HostState] = {}
+
+    def set_limit(self, host: str, limit: HostLimit) -> None:
+        '''
+        `host: str` - host name, e.g., `www.yelp.com`
+        `limit: HostLimit` - limit applied from the next request on
+        '''
+        with self._lock:
+            self._limits[host] = limit
+            if host in self._hosts:
+                self._hosts[host].limit = limit
+
+    def set_default_limits(self, limits: dict[str, HostLimit]) -> None:
+        '''
+        `limits: dict[str, HostLimit]` - limits by host, e.g., engine `HOST_LIMITS`
+
+        Sets limits only for the hosts, which do not have one yet, so limits set by the user are kept
+        '''
+        with self._lock:
+            for host, limit in limits.items():
+                if host not in self._limits:
+                    self._limits[host] = limit
+                    if host in self._hosts:
+                        self._hosts[host].limit = limit
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[float]:
+        '''
+        `url: str` - url about to be requested
+
+        Waits for a free concurrency slot and a token of the url host, holds the slot until the block exits
+
+        Yields `float` typed amount of seconds spent waiting
+        '''
+        host = urlsplit(url).hostname or ''
+        started = time.monotonic()
+        await self._acquire_slot(host)
+        try:
+            delay = self._reserve_token(host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            waited = time.monotonic() - started
+            self._record_wait(host, waited)
+            yield waited
+        finally:
+            self._release_slot(host)
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self._limits.get(host, self.default_limit))
+        return state
+
+    async def _acquire_slot(self, host: str) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._state(host)
+            if state.in_flight < state.limit.max_concurrency and not state.waiters:
+                state.in_flight += 1
+                return
+            future = loop.create_future()
+            state.waiters.append((loop, future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if (loop, future) in state.waiters:
+                    state.waiters.remove((loop, future))
+                    raise
+            # The slot was handed over right before the cancellation, pass it on
+            self._release_slot(host)
+            raise
+
+    def _release_slot(self, host: str) -> None:
+        with self._lock:
+            state = self._state(host)
+            while state.waiters:
+                loop, future = state.waiters.popleft()
+                if future.done() or loop.is_closed():
+                    continue
+                # The slot goes straight to the waiter, `in_flight` stays the same
+                loop.call_soon_threadsafe(self._wake, future)
+                return
+            state.in_flight -= 1
+
+    @staticmethod
+    def _wake(future: asyncio.Future) -> None:
+        # A waiter cancelled after the slot was handed over releases the slot itself
+        if not future.done():
+            future.set_result(None)
+
+    def _reserve_token(self, host: str) -> float:
+        '''
+        Takes a token of the host bucket, tokens may go negative for reservations made ahead of time
+
+        Returns `float` typed amount of seconds to wait until the reserved token is available
+        '''
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            state.tokens = min(state.tokens + (now - state.updated_at) * state.limit.rate_per_s, state.limit.burst)
+            state.updated_at = now
+            state.tokens -= 1
+            return max(-state.tokens / state.limit.rate_per_s, 0)
+
+    def _record_wait(self, host: str, waited: float) -> None:
+        with self._lock:
+            state = self._state(host)
+            state.requests += 1
+            state.total_wait_s += waited
+            state.max_wait_s = max(state.max_wait_s, waited)
+
+    @property
+    def stats(self) -> dict[str, dict]:
+        '''
+        Returns `dict[str, dict]` typed metrics by host - `{requests, in_flight, waiting, total_wait_s, avg_wait_s, max_wait_s, limit}`
+        '''
+        with self._lock:
+            return {
+                host: {
+                    'requests': state.requests,
+                    'in_flight': state.in_flight,
+                    'waiting': len(state.waiters),
+                    'total_wait_s': round(state.total_wait_s, 3),
+                    'avg_wait_s': round(state.total_wait_s / state.requests, 3) if state.requests else 0.0,
+                    'max_wait_s': round(state.max_wait_s, 3),
+                    'limit': repr(state.limit),
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+default_scheduler = HostScheduler()
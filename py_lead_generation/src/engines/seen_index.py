@@ -0,0 +1,174 @@
+import os
+import json
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import Counter
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    '''
+    `BloomFilter`
+
+    Fixed size probabilistic set, answers "definitely not added" without false negatives
+
+    Usage:
+
+    `bloom = BloomFilter(capacity=1_000_000, error_rate=0.01)`
+
+    `bloom.add('key')`
+
+    `'key' in bloom` - `True`
+    '''
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        '''
+        `capacity: int` - expected amount of keys
+        `error_rate: float = 0.01` - false positive probability once `capacity` keys are added
+        '''
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError('Capacity should be positive and error rate should be between 0 and 1')
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class SeenIndex:
+    '''
+    `SeenIndex`
+
+    Persistent index of the places scraped by previous runs, keyed by engine `_place_key`, along with their entries
+
+    Exact sqlite index is consulted only if the in-process `BloomFilter` says the place may have been seen, so new places cost no disk lookup
+
+    Entries older than `ttl_s` are not reused, their places are scraped again and refreshed
+
+    [EDITABLE] `DEFAULT_PATH` - index file path used if none is given, can be overridden with `LEAD_SEEN_INDEX` environment variable
+
+    Usage:
+
+    `engine.seen_index = SeenIndex(ttl_s=7 * 24 * 3600)`
+
+    `await engine.run()` - places scraped within the last week are taken from the index
+    '''
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'py_lead_generation', 'seen.sqlite3')
+
+    def __init__(
+        self,
+        path: str = None,
+        ttl_s: float = 30 * 24 * 3600,
+        bloom_capacity: int = 1_000_000,
+        bloom_error_rate: float = 0.01,
+    ) -> None:
+        '''
+        `path: str = None` - sqlite file path, `':memory:'` keeps the index in memory only
+        `ttl_s: float = 30 days` - age in seconds after which a stored entry is considered stale
+        `bloom_capacity: int = 1_000_000` - expected amount of indexed places, the filter gets less selective above it
+        `bloom_error_rate: float = 0.01` - bloom filter false positive probability at `bloom_capacity`
+        '''
+        self.path = path or os.environ.get('LEAD_SEEN_INDEX') or self.DEFAULT_PATH
+        self.ttl_s = ttl_s
+        self.bloom = BloomFilter(bloom_capacity, bloom_error_rate)
+        self.counters = Counter()
+
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._disk_enabled = True
+
+    def _connect(self) -> sqlite3.Connection | None:
+        '''
+        Opens the sqlite file on the first use and loads its keys into the bloom filter, disables the index if it cannot be opened
+        '''
+        if self._connection is None and self._disk_enabled:
+            try:
+                if self.path != ':memory:':
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._connection = sqlite3.connect(self.path, check_same_thread=False)
+                self._connection.execute(
+                    'CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, entry TEXT NOT NULL, seen_at REAL NOT NULL)'
+                )
+                self._connection.commit()
+                for key, in self._connection.execute('SELECT key FROM seen'):
+                    self.bloom.add(key)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning('Seen index %s is disabled: %r', self.path, e)
+                self._disk_enabled = False
+                self._connection = None
+        return self._connection
+
+    def get(self, key: str) -> dict | None:
+        '''
+        `key: str` - `_place_key` of the place
+
+        Returns `dict` typed entry stored within `ttl_s` or `None` if the place is new or stale
+        '''
+        with self._lock:
+            connection = self._connect()
+            if connection is None or key not in self.bloom:
+                self.counters['misses'] += 1
+                return None
+            try:
+                row = connection.execute('SELECT entry, seen_at FROM seen WHERE key = ?', (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning('Failed to read seen index: %r', e)
+                row = None
+
+            if row is None:
+                self.counters['bloom_false_positives'] += 1
+                self.counters['misses'] += 1
+                return None
+            entry, seen_at = row
+            if time.time() - seen_at >= self.ttl_s:
+                self.counters['stale'] += 1
+                return None
+            self.counters['hits'] += 1
+            return json.loads(entry)
+
+    def add(self, key: str, entry: dict) -> None:
+        '''
+        `key: str` - `_place_key` of the place
+        `entry: dict` - freshly scraped entry of the place
+        '''
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+            try:
+                connection.execute(
+                    'INSERT OR REPLACE INTO seen (key, entry, seen_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(entry, default=str), time.time()),
+                )
+                connection.commit()
+            except sqlite3.Error as e:
+                logger.warning('Failed to write seen index: %r', e)
+                return
+            self.bloom.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    @property
+    def stats(self) -> dict:
+        '''
+        Returns `dict` typed counters - `{hits, stale, misses, bloom_false_positives}`
+        '''
+        return {name: self.counters[name] for name in ('hits', 'stale', 'misses', 'bloom_false_positives')}
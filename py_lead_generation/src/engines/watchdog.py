@@ -0,0 +1,111 @@
+import os
+import math
+import re
+import time
+
+
+# Process names of chromium browsers, their renderers and helpers, e.g., `chrome`, `chrome-headless-shell`, `Chromium Helper (Renderer)`
+BROWSER_PROCESS_NAME_REGEX = re.compile(r'chrom|headless_shell|msedge', re.IGNORECASE)
+
+
+def _descendant_pids_from_proc(pid: int) -> list[int]:
+    '''
+    `pid: int` - root process id
+
+    Returns `list[int]` typed ids of all descendant processes read from linux `/proc`
+    '''
+    children: dict[int, list[int]] = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                # process name may contain spaces, parent id goes right after its closing bracket
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    pids, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            pids.append(child)
+            stack.append(child)
+    return pids
+
+
+def _name_from_proc(pid: int) -> str:
+    try:
+        with open(f'/proc/{pid}/comm') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def _rss_bytes_from_proc(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def browser_rss_mb() -> float | None:
+    '''
+    Sums resident memory of the chromium processes descending from the current one, i.e., browsers launched by playwright along with their renderers
+
+    Playwright driver and parse executor workers are not counted, closing pages cannot bring their memory down
+
+    Uses `psutil` if it is installed, falls back to linux `/proc`
+
+    Returns `float` typed megabytes or `None` if memory cannot be measured on this platform
+    '''
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                if BROWSER_PROCESS_NAME_REGEX.search(child.name()):
+                    total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / 2 ** 20
+
+    if os.path.isdir('/proc'):
+        return sum(
+            _rss_bytes_from_proc(pid) for pid in _descendant_pids_from_proc(os.getpid())
+            if BROWSER_PROCESS_NAME_REGEX.search(_name_from_proc(pid))
+        ) / 2 ** 20
+    return None
+
+
+class MemoryWatchdog:
+    '''
+    `MemoryWatchdog`
+
+    Tells whether browser processes memory exceeds the limit, measuring it at most once per `check_interval_s`
+    '''
+
+    def __init__(self, max_rss_mb: float, check_interval_s: float = 5) -> None:
+        '''
+        `max_rss_mb: float` - resident memory limit in megabytes
+        `check_interval_s: float = 5` - minimal amount of seconds between two measurements
+        '''
+        self.max_rss_mb = max_rss_mb
+        self.check_interval_s = check_interval_s
+        self.last_rss_mb: float | None = None
+        self._last_check = -math.inf
+
+    def over_limit(self) -> bool:
+        '''
+        Returns `bool` typed flag whether the last measured memory is above `max_rss_mb`
+        '''
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval_s:
+            self._last_check = now
+            self.last_rss_mb = browser_rss_mb()
+        return self.last_rss_mb is not None and self.last_rss_mb > self.max_rss_mb
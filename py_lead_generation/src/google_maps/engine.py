@@ -1,25 +1,116 @@
 import time
-import asyncio
+import json
+import logging
 import re
-from bs4 import BeautifulSoup
 
 from py_lead_generation.src.engines.base import BaseEngine
 from py_lead_generation.src.engines.abstract import AbstractEngine
-from py_lead_generation.src.misc.utils import get_coords_by_location
+from py_lead_generation.src.engines.browser_pool import BrowserPool
+from py_lead_generation.src.engines.routing import ANALYTICS_HOSTS, BlockingProfile
+from py_lead_generation.src.engines.scheduler import HostLimit
+from py_lead_generation.src.misc.utils import resolve_coords_by_location
+from py_lead_generation.src.misc.extraction import ExtractionSpec, FieldSpec
+
+
+logger = logging.getLogger(__name__)
+
+PLACE_FEATURE_ID_REGEX = re.compile(r'!1s(0x[0-9a-f]+:0x[0-9a-f]+)')
+PLACE_URL = 'https://www.google.com/maps/place/data=!4m2!3m1!1s{key}'
+
+FEED_SCROLL_JS = '''
+async ([feedSelector, linkSelector, endSelector, known, timeoutMs]) => {
+    const feed = document.querySelector(feedSelector);
+    const links = () => (feed || document).querySelectorAll(linkSelector);
+    const finished = () => !feed || Boolean(document.querySelector(endSelector));
+    if (feed && !finished() && links().length <= known) {
+        await new Promise(resolve => {
+            const done = () => { observer.disconnect(); clearTimeout(timer); resolve(); };
+            const observer = new MutationObserver(() => {
+                if (links().length > known || finished()) done();
+            });
+            const timer = setTimeout(done, timeoutMs);
+            observer.observe(feed, {childList: true, subtree: true});
+            feed.scrollTop = feed.scrollHeight;
+        });
+    }
+    return {
+        urls: Array.from(links()).slice(known).map(link => link.href),
+        end: finished(),
+    };
+}
+'''
+
+
+def nested_item(data: list, *indexes: int) -> object:
+    '''
+    `data: list` - nested lists of the google maps data payload
+    `indexes: int` - indexes of the item at every level
+
+    Returns the item or `None` if any level is missing, google maps payloads are positional and sparse
+    '''
+    for index in indexes:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def load_payload_json(body: str) -> list:
+    '''
+    `body: str` - body of the google maps search data response
+
+    Strips anti json hijacking prefix `)]}'`, unwraps `{"d": ...}` envelope if present
+
+    Returns `list` typed decoded payload
+    '''
+    body = body.strip().removesuffix('/*""*/')
+    if body.startswith('{'):
+        body = json.loads(body).get('d', '')
+    return json.loads(body.strip().removeprefix(")]}'"))
+
+
+def clean_phone_number(text: str) -> str:
+    return re.sub(r'\D', '', text)
+
+
+def clean_address(text: str) -> str:
+    return text.replace('', '').strip()
+
+
+def clean_card_address(text: str) -> str:
+    return text.replace('·', '').strip()
+
+
+def clean_website_url(text: str) -> str:
+    return text.replace('', '').strip()
 
 
 class GoogleMapsEngine(BaseEngine, AbstractEngine):
     '''
     `GoogleMapsEngine`
 
-    [EDITABLE] `SCROLL_TIME_DURATION_S` - scroll time duration to view the search results, preferably should be not less than 150, for testing purposes can be decreased
+    [EDITABLE] `SCROLL_TIME_DURATION_S` - upper limit of the time spent scrolling the search results, scrolling usually stops much earlier by `MAX_STALLED_SCROLLS`
+
+    [CONSTANT] `CARD_SELECTOR` - selector of a single search result card in the results feed
 
-    [EDITABLE] `SLEEP_PER_SCROLL_S` - amount of seconds to wait before each scroll of search results so that google maps does not output endless loading ~ aka simulate human-like activity, preferable should be not less than 5
+    [CONSTANT] `CARD_EXTRACTION_SPEC` - `ExtractionSpec` of the fields available right in the search result card, used by `'list'` and `'hybrid'` harvest modes
+
+    [EDITABLE] `SLEEP_PER_SCROLL_S` - upper limit of seconds to wait for new search results after each scroll, the wait ends as soon as new result cards are rendered
+
+    [EDITABLE] `MAX_STALLED_SCROLLS` - amount of scrolls in a row without new search results, after which the results are considered exhausted
+
+    [CONSTANT] `FEED_SELECTOR` - selector of the scrollable search results container
+
+    [CONSTANT] `FEED_END_SELECTOR` - selector of the end of the search results marker
 
     Usage:
 
     `engine = GoogleMapsEngine(*args, **kwargs)`
 
+    `await asyncio.gather(*(engine.run() for engine in engines))` - optional, locations of all engines are geocoded concurrently
+
+    `engine.HARVEST_MODE = 'hybrid'` - optional, opens only the places, which cards miss `REQUIRED_FIELDS`
+
     `await engine.run()`
 
     `await engine.save_to_csv()`
@@ -30,132 +121,176 @@ class GoogleMapsEngine(BaseEngine, AbstractEngine):
     BASE_URL = 'https://www.google.com/maps/search/{query}/@{coords},{zoom}z/data=!3m1!4b1?entry=ttu'
     FIELD_NAMES = ['Title', 'Address', 'PhoneNumber', 'WebsiteURL']
     FILENAME = 'google_maps_leads.csv'
+    SEARCH_READY_SELECTOR = 'a.hfpxzc'
+    DETAIL_READY_SELECTOR = '.DUwDvf.lfPIob'
+    HOST_LIMITS = {'www.google.com': HostLimit(2, burst=4, max_concurrency=8)}
+    BLOCK_PAGE_PATTERNS = [r'consent\.google\.', r'google\.[a-z.]+/sorry/', r'recaptcha']
+    EXTRACTION_SPEC = ExtractionSpec([
+        FieldSpec('Title', '.DUwDvf.lfPIob'),
+        FieldSpec('Address', '[data-item-id="address"]', cleaner=clean_address),
+        FieldSpec('PhoneNumber', '[data-item-id^="phone:"]', cleaner=clean_phone_number),
+        FieldSpec('WebsiteURL', '[data-item-id="authority"]', cleaner=clean_website_url),
+    ])
+
+    CARD_SELECTOR = 'div.Nv2PK'
+    CARD_EXTRACTION_SPEC = ExtractionSpec([
+        FieldSpec('URL', 'a.hfpxzc', attr='href'),
+        FieldSpec('Title', 'a.hfpxzc', attr='aria-label'),
+        FieldSpec('Address', '.W4Efsd .W4Efsd:first-of-type > span:last-of-type > span:last-of-type', cleaner=clean_card_address),
+        FieldSpec('PhoneNumber', '.UsdlK', cleaner=clean_phone_number),
+        FieldSpec('WebsiteURL', 'a.lcr4fd', attr='href'),
+    ])
+    REQUIRED_FIELDS = ['Title', 'Address', 'PhoneNumber']
+    PAYLOAD_URL_PATTERNS = [r'/search\?tbm=map']
+    BLOCKING_PROFILE = BlockingProfile(
+        resource_types=['image', 'media', 'font'],
+        url_patterns=['*/maps/vt*', '*/maps/rpc/vt*', '*://khms*.google.*', '*streetviewpixels*', '*/gen_204*', '*/log?format=*'],
+        hosts=ANALYTICS_HOSTS,
+    )
 
     SLEEP_PER_SCROLL_S = 5
     SCROLL_TIME_DURATION_S = 200
-
-    def __init__(self, query: str, location: str, zoom: int | float = 12) -> None:
+    MAX_STALLED_SCROLLS = 3
+    FEED_SELECTOR = '[role="feed"]'
+    FEED_END_SELECTOR = '.m6QErb.tLjsW.eKbjU'
+
+    def __init__(
+        self, query: str, location: str | None, zoom: int | float = 12, browser_pool: BrowserPool = None,
+        coords: tuple[float, float] = None,
+    ) -> None:
         '''
         `query: str` - what are you looking for? e.g., `gym`
-        `location: str` - where are you looking for that query? e.g., `Astana`
+        `location: str | None` - where are you looking for that query? e.g., `Astana`, `None` searches only around given `coords`
         `zoom: int | float` - google maps zoom e.g., `8.75`
+        `browser_pool: BrowserPool = None` - optional warm browser pool shared between runs
+        `coords: tuple[float, float] = None` - optional (latitude, longitude) of the location, geocoded in `run()` if omitted
 
-        Creates `GoogleMapsEngine` instance
+        Creates `GoogleMapsEngine` instance, nothing is geocoded here, so it is cheap to construct many engines at once
         '''
+        if not location and coords is None:
+            raise ValueError('Either location or coords should be given')
         self._entries = []
+        self.browser_pool = browser_pool
         self.zoom = zoom
         self.query = query
         self.location = location
-        self.coords = get_coords_by_location(self.location)
-        self.search_query = f'{self.query}%20{self.location}'
+        self.search_query = f'{self.query}%20{self.location}' if self.location else self.query
+        self.coords = None
+        self.url = None
+        if coords is not None:
+            self._set_coords(coords)
+
+    def _set_coords(self, coords: tuple) -> None:
+        '''
+        `coords: tuple` - (latitude, longitude) as floats or strings, builds `self.url` from them
+        '''
+        self.coords = list(map(str, coords))
         self.url = self.BASE_URL.format(
             query=self.search_query, coords=','.join(self.coords), zoom=self.zoom
         )
 
+    async def _prepare(self) -> None:
+        '''
+        Geocodes `self.location` without blocking the event loop, unless coordinates were given to the constructor
+        '''
+        if self.coords is None:
+            self._set_coords(await resolve_coords_by_location(self.location))
+
     async def _get_search_results_urls(self) -> list[str]:
         '''
-        Goes through the search results for `GoogleMapsEngine.SCROLL_TIME_DURATION_S` seconds
+        Scrolls the search results feed and collects the results urls while new cards are rendered
 
-        Waits for `GoogleMapsEngine.SLEEP_PER_SCROLL_S` seconds so that GoogleMaps will not output endless load, aka simulate human-like activity
+        Every scroll waits for a `MutationObserver` on the feed, at most `GoogleMapsEngine.SLEEP_PER_SCROLL_S` seconds, instead of a fixed sleep
 
-        Or scrapes the results urls, once the are no more results
+        Stops once the end of results marker is present, after `GoogleMapsEngine.MAX_STALLED_SCROLLS` scrolls in a row without new results or when `GoogleMapsEngine.SCROLL_TIME_DURATION_S` is exceeded
         '''
-        async def hover_search_results() -> None:
-            '''
-            Hovers on leftbar, where search results are located
-
-            Needed so that scroll function is used properly - not on the map but on the search results div
-            '''
-            leftbar = await self.page.query_selector('[role="main"]')
-            await leftbar.hover()
-            await asyncio.sleep(0.5)
+        urls: dict[str, None] = {}
+        known = stalled = 0
+        start_scroll_time = time.monotonic()
 
-        async def scroll_and_sleep(delta_y: int = 1000) -> None:
-            '''
-            `delta_y: int = 1000` pixel units to scroll down along y-axis
+        while True:
+            batch = await self.page.evaluate(
+                FEED_SCROLL_JS,
+                [self.FEED_SELECTOR, self.SEARCH_READY_SELECTOR, self.FEED_END_SELECTOR, known, self.SLEEP_PER_SCROLL_S * 1000],
+            )
+            known += len(batch['urls'])
+            urls.update(dict.fromkeys(batch['urls']))
+            stalled = 0 if batch['urls'] else stalled + 1
+
+            if batch['end'] or stalled >= self.MAX_STALLED_SCROLLS:
+                break
+            if time.monotonic() - start_scroll_time > self.SCROLL_TIME_DURATION_S:
+                logger.warning('Scrolling %s stopped after %s seconds', self.url, self.SCROLL_TIME_DURATION_S)
+                break
 
-            Scrolls down by `delta_y` and waits for `GoogleMapsEngine.SCROLL_TIME_DURATION_S` seconds
-            '''
-            await self.page.mouse.wheel(0, delta_y)
-            await asyncio.sleep(self.SLEEP_PER_SCROLL_S)
+        return list(urls)
 
-        async def end_locator_is_present() -> bool:
-            '''
-            Retunrs `end_locator` as boolean value, which correlates with the possible end of the search results
+    async def _harvest_search_results_list(self) -> dict[str, dict]:
+        '''
+        Extracts `CARD_EXTRACTION_SPEC` fields of every loaded search result card in bulk with a single `page.evaluate`
 
-            Once `end_locator` is Truthy, aka ElemenetHandle, it means that there is nothing more to scroll
-            '''
-            end_locator = await self.page.query_selector('.m6QErb.tLjsW.eKbjU')
-            return bool(end_locator)
+        Returns `dict[str, dict]` typed entries by their `_place_key`
+        '''
+        spec = self.CARD_EXTRACTION_SPEC
+        await self.page.evaluate(spec.to_init_script('card'))
+        cards = await self.page.evaluate(spec.evaluate_all_expression('card', self.CARD_SELECTOR))
+
+        harvested = {}
+        for values in cards:
+            entry = dict(zip(spec.names, spec.clean(values)))
+            url = entry.pop('URL')
+            if url:
+                harvested[self._place_key(url)] = entry
+        return harvested
+
+    @classmethod
+    def _decode_payload(cls, url: str, body: str) -> dict[str, dict]:
+        '''
+        `url: str` - url of the captured `/search?tbm=map` response
+        `body: str` - body of the response
 
-        async def scrape_urls() -> list[str]:
-            '''
-            Should be called once page is being scrolled all the way down (`end_locator` found) or `GoogleMapsEngine.SCROLL_TIME_DURATION_S` duration limit is exceeded
+        Decodes positional search results data, every result place lives at index `14` of its list
 
-            Returns `list[str]` typed scraped urls list using query_selector
-            '''
-            urls = []
-            link_elements = await self.page.query_selector_all('a.hfpxzc')
-            for link_element in link_elements:
-                url = await link_element.get_attribute('href')
-                urls.append(url)
-            return urls
+        Returns `dict[str, dict]` typed entries by their place feature id, with coordinates and rating on top of `FIELD_NAMES`
+        '''
+        places = nested_item(load_payload_json(body), 0, 1) or []
+
+        entries = {}
+        for result in places:
+            place = nested_item(result, 14)
+            feature_id = nested_item(place, 10)
+            title = nested_item(place, 11)
+            if not isinstance(feature_id, str) or not isinstance(title, str):
+                continue
+
+            address = nested_item(place, 39) or nested_item(place, 18) or ''
+            entries[feature_id] = {
+                'Title': title,
+                'Address': clean_address(address.removeprefix(f'{title}, ')),
+                'PhoneNumber': clean_phone_number(nested_item(place, 178, 0, 0) or ''),
+                'WebsiteURL': nested_item(place, 7, 0) or '',
+                'Latitude': nested_item(place, 9, 2),
+                'Longitude': nested_item(place, 9, 3),
+                'Rating': nested_item(place, 4, 7),
+            }
+        return entries
+
+    @classmethod
+    def _place_key(cls, url: str) -> str:
+        '''
+        `url: str` - google maps place url
 
-        await hover_search_results()
-        start_scroll_time = time.time()
+        Returns `str` typed place feature id, e.g., `0x47e66e2964e34e2d:0x8ddca9ee380ef7e0`, or the url itself if it has none
+        '''
+        match = PLACE_FEATURE_ID_REGEX.search(url)
+        return match.group(1) if match else url
 
-        while True:
-            await scroll_and_sleep()
-            finish_scroll_time = time.time()
-            if (await end_locator_is_present()) or (finish_scroll_time - start_scroll_time > self.SCROLL_TIME_DURATION_S):
-                break
+    @classmethod
+    def _canonical_url(cls, url: str) -> str:
+        '''
+        `url: str` - google maps place url
 
-        urls = await scrape_urls()
-        return urls
-
-    def _parse_data_with_soup(self, html: str) -> list[str]:
-        '''
-        Parse HTML content to extract business details.
-
-        Parameters:
-        html (str): HTML representation of the page to parse.
-
-        Returns:
-            list[str]: A list containing parsed data in the order [title, address, phone, website]
-        '''
-        soup = BeautifulSoup(html, 'html.parser')
-
-        selectors = {
-            'title': '.DUwDvf.lfPIob',
-            'address': '[data-item-id="address"]',
-            'phone_number': '[data-item-id^="phone:"]',
-            'website_url': '[data-item-id="authority"]'
-        }
-
-        def extract_text(selector: str, default: str = '', cleaner: callable = None) -> str:
-            element = soup.select_one(selector)
-            text = element.get_text() if element else default
-            return cleaner(text) if cleaner else text
-
-        # Cleaners
-        def clean_phone_number(text: str) -> str:
-            return re.sub(r'\D', '', text)
-        
-        def clean_address(text: str) -> str:
-            return text.replace('', '').strip()
-        
-        def clean_website_url(text: str) -> str:
-            return text.replace('', '').strip()
-        
-        cleaners = {
-            'phone_number': clean_phone_number,
-            'address': clean_address,
-            'website_url': clean_website_url
-        }
-
-        # Parsing and cleaning
-        parsed_data = [
-            extract_text(selectors[key], cleaner=cleaners.get(key)) for key in selectors
-        ]
-
-        return parsed_data
\ No newline at end of file
+        Returns `str` typed place url holding only its feature id, e.g., `https://www.google.com/maps/place/data=!4m2!3m1!1s0x47e66e2964e34e2d:0x8ddca9ee380ef7e0`, or the url itself if it has none
+        '''
+        key = cls._place_key(url)
+        return PLACE_URL.format(key=key) if key != url else url
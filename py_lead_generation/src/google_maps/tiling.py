@@ -0,0 +1,287 @@
+import math
+import time
+import asyncio
+import logging
+from typing import AsyncIterator
+
+from py_lead_generation.src.engines.browser_pool import BrowserPool
+from py_lead_generation.src.google_maps.engine import GoogleMapsEngine
+from py_lead_generation.src.misc.utils import resolve_bounding_box_by_location
+from py_lead_generation.src.misc.writer import CsvWriter
+
+
+logger = logging.getLogger(__name__)
+
+
+class Tile:
+    '''
+    `Tile`
+
+    Rectangular part of the searched area, searched by a single `GoogleMapsEngine` run at its center
+    '''
+
+    def __init__(self, south: float, west: float, north: float, east: float, zoom: int) -> None:
+        '''
+        `south: float`, `west: float`, `north: float`, `east: float` - tile bounds in degrees
+        `zoom: int` - google maps zoom the tile is searched at
+        '''
+        self.south = south
+        self.west = west
+        self.north = north
+        self.east = east
+        self.zoom = zoom
+
+    def __repr__(self) -> str:
+        return f'Tile({self.south:.5f}, {self.west:.5f}, {self.north:.5f}, {self.east:.5f}, zoom={self.zoom})'
+
+    @property
+    def center(self) -> tuple[float, float]:
+        '''
+        Returns `(latitude, longitude)` of the tile center rounded to 6 digits
+        '''
+        return round((self.south + self.north) / 2, 6), round((self.west + self.east) / 2, 6)
+
+    def split(self) -> list['Tile']:
+        '''
+        Returns `list[Tile]` typed four quarters of the tile searched one zoom level closer
+        '''
+        latitude, longitude = (self.south + self.north) / 2, (self.west + self.east) / 2
+        return [
+            Tile(south, west, north, east, self.zoom + 1)
+            for south, north in ((self.south, latitude), (latitude, self.north))
+            for west, east in ((self.west, longitude), (longitude, self.east))
+        ]
+
+
+def tile_span(zoom: int, latitude: float, viewport_px: int = 512) -> tuple[float, float]:
+    '''
+    `zoom: int` - google maps zoom
+    `latitude: float` - latitude the tile is located at
+    `viewport_px: int = 512` - side of the map area, which search results are taken from, in pixels
+
+    Returns `(latitude_span, longitude_span)` in degrees of the area visible at the zoom
+    '''
+    longitude_span = viewport_px / 256 * 360 / 2 ** zoom
+    return longitude_span * max(math.cos(math.radians(latitude)), 0.01), longitude_span
+
+
+def plan_tiles(
+    bounding_box: tuple[float, float, float, float], zoom: int, max_tiles: int = 256, viewport_px: int = 512
+) -> list[Tile]:
+    '''
+    `bounding_box: tuple[float, float, float, float]` - (south, west, north, east) of the searched area
+    `zoom: int` - preferred google maps zoom of the tiles
+    `max_tiles: int = 256` - zoom is decreased until the grid fits into this amount of tiles
+    `viewport_px: int = 512` - see `tile_span`
+
+    Returns `list[Tile]` typed grid covering the bounding box, ordered from the center outwards
+    '''
+    south, west, north, east = bounding_box
+    if south >= north or west >= east:
+        raise ValueError(f'Bounding box {bounding_box!r} is empty')
+
+    while True:
+        latitude_span, longitude_span = tile_span(zoom, (south + north) / 2, viewport_px)
+        rows = max(math.ceil((north - south) / latitude_span), 1)
+        columns = max(math.ceil((east - west) / longitude_span), 1)
+        if rows * columns <= max_tiles or zoom <= 1:
+            break
+        zoom -= 1
+
+    height, width = (north - south) / rows, (east - west) / columns
+    tiles = [
+        Tile(south + row * height, west + column * width, south + (row + 1) * height, west + (column + 1) * width, zoom)
+        for row in range(rows) for column in range(columns)
+    ]
+    center = ((south + north) / 2, (west + east) / 2)
+    tiles.sort(key=lambda tile: (tile.center[0] - center[0]) ** 2 + (tile.center[1] - center[1]) ** 2)
+    return tiles
+
+
+class GoogleMapsTiledSearch:
+    '''
+    `GoogleMapsTiledSearch`
+
+    Covers the whole location by splitting its bounding box into a grid of tiles and searching every tile with its own `GoogleMapsEngine`
+
+    Google maps lists around 120 results per search, tiles hitting `RESULTS_CAP` are split into four closer tiles, down to `MAX_ZOOM`
+
+    Tiles run concurrently over a shared `BrowserPool`, places listed by several tiles are scraped only once, places a tile failed to scrape are left to the other tiles listing them
+
+    [EDITABLE] `RESULTS_CAP` - amount of listed results, from which a tile is considered truncated by google maps
+
+    [EDITABLE] `MAX_ZOOM` - tiles at this zoom are never split
+
+    [EDITABLE] `VIEWPORT_PX` - side of the map area search results are taken from, smaller values make tiles overlap more
+
+    Usage:
+
+    `search = GoogleMapsTiledSearch('gym', 'Astana', concurrency=4)`
+
+    `await search.run()`
+
+    `search.save_to_csv()`
+
+    `print(search.entries, search.tile_outcomes)`
+    '''
+
+    RESULTS_CAP = 110
+    MAX_ZOOM = 18
+    VIEWPORT_PX = 512
+    FIELD_NAMES = GoogleMapsEngine.FIELD_NAMES
+    FILENAME = GoogleMapsEngine.FILENAME
+
+    def __init__(
+        self,
+        query: str,
+        location: str,
+        zoom: int = 14,
+        browser_pool: BrowserPool = None,
+        concurrency: int = 4,
+        bounding_box: tuple[float, float, float, float] = None,
+        max_tiles: int = 256,
+        engine_params: dict = None,
+    ) -> None:
+        '''
+        `query: str` - what are you looking for? e.g., `gym`
+        `location: str` - where are you looking for that query? e.g., `Astana`
+        `zoom: int = 14` - preferred zoom of the initial grid, decreased if the grid exceeds `max_tiles`
+        `browser_pool: BrowserPool = None` - optional warm browser pool, a single browser pool is started for the run if omitted
+        `concurrency: int = 4` - amount of tiles searched at the same time
+        `bounding_box: tuple[float, float, float, float] = None` - optional (south, west, north, east) of the area, geocoded in `run()` if omitted
+        `max_tiles: int = 256` - maximum amount of tiles searched, including split ones
+        `engine_params: dict = None` - class attributes overridden on every tile engine, e.g., `{'HARVEST_MODE': 'hybrid'}`
+        '''
+        if concurrency < 1:
+            raise ValueError('Concurrency should be positive')
+        self.query = query
+        self.location = location
+        self.zoom = zoom
+        self.browser_pool = browser_pool
+        self.concurrency = concurrency
+        self.bounding_box = bounding_box
+        self.max_tiles = max_tiles
+        self.engine_params = engine_params or {}
+        self._entries: list[dict] = []
+        self._tile_outcomes: list[dict] = []
+
+    async def run(self) -> None:
+        '''
+        Searches every tile and assigns deduplicated results to `.entries`
+        '''
+        self._entries = [entry async for entry in self.stream()]
+
+    async def stream(self) -> AsyncIterator[dict]:
+        '''
+        Same as `.run()`, but yields every entry as soon as any tile scrapes it, entries of different tiles interleave
+        '''
+        self._tile_outcomes = []
+        seen_places: set[str] = set()
+        if self.bounding_box is None:
+            self.bounding_box = await resolve_bounding_box_by_location(self.location)
+        tiles = plan_tiles(self.bounding_box, self.zoom, self.max_tiles, self.VIEWPORT_PX)
+        planned = len(tiles)
+
+        owned_pool = self.browser_pool is None
+        pool = BrowserPool() if owned_pool else self.browser_pool
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results: asyncio.Queue = asyncio.Queue()
+        pending: set[asyncio.Task] = set()
+
+        async def search_tile(tile: Tile) -> None:
+            nonlocal planned
+            async with semaphore:
+                started = time.perf_counter()
+                engine = GoogleMapsEngine(self.query, None, tile.zoom, browser_pool=pool, coords=tile.center)
+                for name, value in self.engine_params.items():
+                    setattr(engine, name, value)
+                # Places listed by this tile, which are not scraped yet
+                claimed: set[str] = set()
+
+                def claim(url: str) -> bool:
+                    key = GoogleMapsEngine._place_key(url)
+                    if key in seen_places:
+                        return False
+                    seen_places.add(key)
+                    claimed.add(key)
+                    return True
+
+                engine.url_filter = claim
+                outcome = {'tile': tile, 'listed': 0, 'entries': 0, 'split': False, 'error': None}
+                try:
+                    async for entry in engine.stream():
+                        claimed.discard(GoogleMapsEngine._place_key(entry['SourceURL']))
+                        outcome['entries'] += 1
+                        results.put_nowait(entry)
+                except Exception as e:
+                    logger.warning('Failed to search %r: %r', tile, e)
+                    outcome['error'] = e
+                finally:
+                    # Failed places are released, so that other tiles listing them scrape them again
+                    seen_places.difference_update(claimed)
+                outcome['listed'] = engine.listed_urls_count
+                outcome['elapsed_s'] = round(time.perf_counter() - started, 3)
+
+            truncated = outcome['listed'] >= self.RESULTS_CAP
+            if truncated and tile.zoom < self.MAX_ZOOM and planned + 4 <= self.max_tiles:
+                outcome['split'] = True
+                planned += 4
+                for child in tile.split():
+                    schedule(child)
+            elif truncated:
+                logger.info('%r is truncated at %s results and cannot be split further', tile, outcome['listed'])
+            self._tile_outcomes.append(outcome)
+
+        def schedule(tile: Tile) -> None:
+            task = asyncio.create_task(search_tile(tile))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            task.add_done_callback(lambda _: results.put_nowait(None))
+
+        try:
+            if owned_pool:
+                await pool.start()
+            for tile in tiles:
+                schedule(tile)
+            while pending or not results.empty():
+                entry = await results.get()
+                if entry is not None:
+                    yield entry
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if owned_pool:
+                await pool.close()
+
+    def save_to_csv(self, filename: str = None) -> None:
+        '''
+        `filename: str = None` - optional parameter, by default uses `self.FILENAME`
+
+        Same as `GoogleMapsEngine.save_to_csv()`
+        '''
+        if filename:
+            self.FILENAME = filename
+
+        if not self.FILENAME.endswith('.csv'):
+            raise ValueError('Use .csv file extension')
+        if not self._entries:
+            raise NotImplementedError(
+                'Entries are empty, call .run() method first to save them'
+            )
+        csv_writer = CsvWriter(self.FILENAME, self.FIELD_NAMES)
+        csv_writer.append(self._entries)
+
+    @property
+    def entries(self) -> list[dict]:
+        '''
+        Returns `list[dict]` typed entries once `.run()` method was called
+        '''
+        return self._entries
+
+    @property
+    def tile_outcomes(self) -> list[dict]:
+        '''
+        Returns `list[dict]` typed outcome of every searched tile during the last `.run()` - `{tile, listed, entries, split, error, elapsed_s}`
+        '''
+        return list(self._tile_outcomes)
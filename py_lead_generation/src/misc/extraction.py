@@ -0,0 +1,217 @@
+import json
+from typing import Any, Callable
+
+from py_lead_generation.src.misc.parsers import ParserBackend
+
+
+# Same single traversal as `ExtractionSpec.extract_from`, but run by the browser itself, cleaners are applied in python
+BROWSER_EXTRACTOR_JS = '''
+(() => {
+    const spec = %(spec)s;
+    const valueOf = (field, element) => {
+        if (field.child) {
+            element = element.querySelector(field.child);
+            if (!element) return field.child_default;
+        }
+        if (field.attr) return element.getAttribute(field.attr) || '';
+        return element.textContent;
+    };
+    window.__leadSpecs = window.__leadSpecs || {};
+    window.__leadSpecs[%(name)s] = (root = document) => {
+        const matched = spec.fields.map(() => []);
+        for (const element of root.querySelectorAll(spec.selector_group)) {
+            spec.fields.forEach((field, i) => {
+                if (matched[i].length && !field.multi) return;
+                if (element.matches(field.selector)) matched[i].push(element);
+            });
+        }
+        return spec.fields.map((field, i) => {
+            const elements = matched[i];
+            if (!elements.length) return field.default;
+            if (!field.multi) return valueOf(field, elements[0]);
+            return elements.map((element) => valueOf(field, element)).join(field.join);
+        });
+    };
+})()
+'''
+
+
+class FieldSpec:
+    '''
+    `FieldSpec`
+
+    Declarative description of a single field to extract from the page
+    '''
+
+    def __init__(
+        self,
+        name: str,
+        selector: str,
+        attr: str = None,
+        cleaner: Callable[[str], str] = None,
+        multi: bool = False,
+        join: str = ',',
+        child: str = None,
+        default: str = '',
+        child_default: str = '',
+    ) -> None:
+        '''
+        `name: str` - field name, should match one of the engine `FIELD_NAMES`
+        `selector: str` - css selector of the element holding the value
+        `attr: str = None` - attribute to take the value from, element text is used if not given
+        `cleaner: Callable[[str], str] = None` - function applied to the extracted value
+        `multi: bool = False` - whether all matching elements are extracted and joined with `join` or only the first one
+        `join: str = ','` - separator of the multi-value field
+        `child: str = None` - css selector of the element inside the matched one, which holds the value
+        `default: str = ''` - value of the field if nothing is matched
+        `child_default: str = ''` - value of the single element if its `child` is not found
+        '''
+        self.name = name
+        self.selector = selector
+        self.attr = attr
+        self.cleaner = cleaner
+        self.multi = multi
+        self.join = join
+        self.child = child
+        self.default = default
+        self.child_default = child_default
+
+    def value_of(self, parser: ParserBackend, node: Any) -> str:
+        '''
+        Returns `str` typed raw value of the matched node
+        '''
+        if self.child:
+            node = parser.select_one(node, self.child)
+            if node is None:
+                return self.child_default
+        if self.attr:
+            return parser.attr(node, self.attr) or ''
+        return parser.text(node)
+
+    def to_dict(self) -> dict:
+        '''
+        Returns `dict` typed json serializable field description without the `cleaner`
+        '''
+        return {
+            'selector': self.selector,
+            'attr': self.attr,
+            'multi': self.multi,
+            'join': self.join,
+            'child': self.child,
+            'default': self.default,
+            'child_default': self.child_default,
+        }
+
+    def clean(self, value: str) -> str:
+        '''
+        Returns `str` typed value passed through the `cleaner`
+        '''
+        return self.cleaner(value) if self.cleaner else value
+
+
+class ExtractionSpec:
+    '''
+    `ExtractionSpec`
+
+    List of `FieldSpec` compiled once into a single css selector group
+
+    The document is traversed once by that group and every matched element is dispatched to the fields it belongs to
+
+    Usage:
+
+    `EXTRACTION_SPEC = ExtractionSpec([FieldSpec('Title', 'h1'), ...])`
+
+    `values = EXTRACTION_SPEC.extract(html, parser)`
+
+    Or right in the browser:
+
+    `await page.add_init_script(EXTRACTION_SPEC.to_init_script('detail'))`
+
+    `values = EXTRACTION_SPEC.clean(await page.evaluate(EXTRACTION_SPEC.evaluate_expression('detail')))`
+    '''
+
+    def __init__(self, fields: list[FieldSpec]) -> None:
+        '''
+        `fields: list[FieldSpec]` - fields to extract, output values follow the same order
+        '''
+        self.fields = list(fields)
+        self.names = [field.name for field in self.fields]
+        self.defaults = {field.name: field.default for field in self.fields}
+        self.selector_group = ', '.join(dict.fromkeys(field.selector for field in self.fields))
+
+    def extract(self, html: str, parser: ParserBackend) -> list[str]:
+        '''
+        `html: str` - html representation of the page to parse
+        `parser: ParserBackend` - parser backend to run the spec with
+
+        Returns `list[str]` typed cleaned values in the order of the spec fields
+        '''
+        return self.extract_from(parser.parse(html), parser)
+
+    def extract_from(self, root: Any, parser: ParserBackend) -> list[str]:
+        '''
+        `root: Any` - parsed document or element of `parser` to extract the fields from
+        `parser: ParserBackend` - parser backend, which parsed the `root`
+
+        Returns `list[str]` typed cleaned values in the order of the spec fields
+        '''
+        matched: list[list] = [[] for _ in self.fields]
+        for node in parser.select(root, self.selector_group):
+            for field, nodes in zip(self.fields, matched):
+                if nodes and not field.multi:
+                    continue
+                if parser.matches(node, field.selector):
+                    nodes.append(node)
+
+        values = []
+        for field, nodes in zip(self.fields, matched):
+            if not nodes:
+                value = field.default
+            elif field.multi:
+                value = field.join.join(field.value_of(parser, node) for node in nodes)
+            else:
+                value = field.value_of(parser, nodes[0])
+            values.append(value)
+        return self.clean(values)
+
+    def clean(self, values: list[str]) -> list[str]:
+        '''
+        `values: list[str]` - raw values in the order of the spec fields
+
+        Returns `list[str]` typed values passed through their field cleaners
+        '''
+        return [field.clean(value) for field, value in zip(self.fields, values)]
+
+    def to_init_script(self, name: str) -> str:
+        '''
+        `name: str` - name to register the spec under in the page
+
+        Returns `str` typed javascript, which defines `window.__leadSpecs[name](root = document)` extractor of raw values
+        '''
+        spec = {
+            'selector_group': self.selector_group,
+            'fields': [field.to_dict() for field in self.fields],
+        }
+        return BROWSER_EXTRACTOR_JS % {'spec': json.dumps(spec), 'name': json.dumps(name)}
+
+    @staticmethod
+    def evaluate_expression(name: str) -> str:
+        '''
+        `name: str` - name the spec was registered under by `to_init_script`
+
+        Returns `str` typed javascript function for `page.evaluate`, which returns raw values of the whole document
+        '''
+        return f'() => window.__leadSpecs[{json.dumps(name)}]()'
+
+    @staticmethod
+    def evaluate_all_expression(name: str, root_selector: str) -> str:
+        '''
+        `name: str` - name the spec was registered under by `to_init_script`
+        `root_selector: str` - css selector of the elements to extract the fields from separately, e.g., result cards
+
+        Returns `str` typed javascript function for `page.evaluate`, which returns raw values of every `root_selector` element
+        '''
+        return (
+            f'() => Array.from(document.querySelectorAll({json.dumps(root_selector)}))'
+            f'.map((root) => window.__leadSpecs[{json.dumps(name)}](root))'
+        )
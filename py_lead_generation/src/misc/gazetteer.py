@@ -0,0 +1,430 @@
+import os
+import sys
+import json
+import math
+import mmap
+import struct
+import zlib
+import unicodedata
+from array import array
+from collections import Counter
+
+
+PLACE_RECORD = struct.Struct('<ddI2s20s')
+
+INDEX_FILES = (
+    'places.bin', 'names.bin', 'names.off', 'keys.bin', 'keys.off', 'keys.place',
+    'trigrams.hash', 'trigrams.off', 'trigrams.keys', 'kdtree.bin',
+)
+
+# GeoNames feature codes of the rows naming a country
+COUNTRY_FEATURE_CODES = {'PCL', 'PCLD', 'PCLF', 'PCLI', 'PCLIX', 'PCLS', 'TERR'}
+
+
+def normalize_name(name: str) -> str:
+    '''
+    `name: str` - place name in any language
+
+    Returns `str` typed casefolded name without accents and with collapsed whitespace, e.g., `'São Paulo'` -> `'sao paulo'`
+    '''
+    name = unicodedata.normalize('NFKD', name.casefold())
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    return ' '.join(name.split())
+
+
+def trigram_hashes(key: str) -> set[int]:
+    '''
+    Returns `set[int]` typed crc32 hashes of the padded key trigrams
+    '''
+    padded = f'  {key} '
+    return {zlib.crc32(padded[i:i + 3].encode()) for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    '''
+    `Gazetteer`
+
+    Offline geocoder built from a GeoNames dump, e.g., `cities15000.txt` from https://download.geonames.org/export/dump/
+
+    Forward lookup uses sorted name keys, region and country qualifiers are matched against admin1 and country names, reverse lookup uses an implicit KD-tree
+
+    Forward lookup answers only when the place is unambiguous, otherwise it returns `None`, so the caller can fall back to an online geocoder
+
+    Every index file is memory-mapped, so worker processes opening the same directory share its pages
+
+    [EDITABLE] `SAME_PLACE_DEGREES` - candidates closer than this to the most populated one are considered the same place, e.g., a city and its municipality
+
+    Usage:
+
+    `Gazetteer.build('cities15000.txt', 'gazetteer/')` - once, or `python -m py_lead_generation.src.misc.gazetteer cities15000.txt gazetteer/`
+
+    `gazetteer = Gazetteer('gazetteer/')`
+
+    `gazetteer.forward('Springfield, Illinois, US')` - `(39.80, -89.64)`
+    '''
+
+    SAME_PLACE_DEGREES = 0.5
+
+    def __init__(self, index_dir: str) -> None:
+        '''
+        `index_dir: str` - directory with index files created by `Gazetteer.build`
+        '''
+        self.index_dir = index_dir
+        self._files = []
+        self._maps = {}
+        for name in INDEX_FILES:
+            f = open(os.path.join(index_dir, name), 'rb')
+            self._files.append(f)
+            self._maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+
+        self._places = self._maps['places.bin']
+        self._names = self._maps['names.bin']
+        self._keys = self._maps['keys.bin']
+        self._names_off = self._uint_view('names.off', 'Q')
+        self._keys_off = self._uint_view('keys.off', 'Q')
+        self._keys_place = self._uint_view('keys.place', 'I')
+        self._trigrams_hash = self._uint_view('trigrams.hash', 'I')
+        self._trigrams_off = self._uint_view('trigrams.off', 'Q')
+        self._trigrams_keys = self._uint_view('trigrams.keys', 'I')
+        self._kdtree = self._uint_view('kdtree.bin', 'I')
+        with open(os.path.join(index_dir, 'regions.json'), encoding='utf-8') as f:
+            regions = json.load(f)
+        self._admin1_names: dict[str, list[str]] = regions['admin1']
+        self._country_names: dict[str, list[str]] = regions['countries']
+        self.size = len(self._places) // PLACE_RECORD.size
+
+    def _uint_view(self, name: str, typecode: str) -> memoryview:
+        return memoryview(self._maps[name]).cast(typecode)
+
+    def close(self) -> None:
+        '''
+        Releases memory maps and index files
+        '''
+        for view in (
+            self._names_off, self._keys_off, self._keys_place, self._trigrams_hash,
+            self._trigrams_off, self._trigrams_keys, self._kdtree,
+        ):
+            view.release()
+        for mapped in self._maps.values():
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for f in self._files:
+            f.close()
+
+    def forward(self, location: str, fuzzy: bool = False) -> tuple[float, float] | None:
+        '''
+        `location: str` - place name, optionally followed by comma separated region and country, e.g., `'Mexico, Pampanga, Philippines'`
+        `fuzzy: bool = False` - whether names starting with the place name or similar to it by trigrams are tried if there is no exact one
+
+        Matches the whole string as a name first, then the first comma separated part, every other part should name the admin1 region or the country of the place
+
+        Returns `(latitude, longitude)` of the matching place or `None` if it is unknown, a part is not a known region or country, or several distant places match
+        '''
+        parts = [normalize_name(part) for part in location.split(',') if part.strip()]
+        if not parts:
+            return None
+
+        places = self._exact_places(normalize_name(location.replace(',', ' ')))
+        if len(parts) > 1 and not places:
+            qualifiers = [self._resolve_qualifier(part) for part in parts[1:]]
+            if not all(qualifiers):
+                return None
+            places = [
+                place for place in self._exact_places(parts[0])
+                if all(self._place_in_region(place, *qualifier) for qualifier in qualifiers)
+            ]
+        elif not places:
+            places = self._exact_places(parts[0])
+        if places:
+            place = self._unambiguous_place(places)
+            return self._coords(place) if place is not None else None
+
+        if not fuzzy:
+            return None
+        places = self._prefix_places(parts[0])
+        if places:
+            return self._coords(max(places, key=self._population))
+        place = self._similar_place(parts[0])
+        return self._coords(place) if place is not None else None
+
+    def reverse(self, latitude: float, longitude: float) -> str | None:
+        '''
+        `latitude: float`, `longitude: float` - coordinates to look up
+
+        Returns `str` typed name of the nearest place or `None` if the gazetteer is empty
+        '''
+        if not self.size:
+            return None
+        scale = math.cos(math.radians(latitude))
+        best = [None, math.inf]
+
+        def search(lo: int, hi: int, depth: int) -> None:
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            place = self._kdtree[mid]
+            lat, lon = PLACE_RECORD.unpack_from(self._places, place * PLACE_RECORD.size)[:2]
+            distance = (lat - latitude) ** 2 + ((lon - longitude) * scale) ** 2
+            if distance < best[1]:
+                best[:] = [place, distance]
+
+            delta = (latitude - lat) if depth % 2 == 0 else (longitude - lon) * scale
+            near, far = ((lo, mid), (mid + 1, hi)) if delta < 0 else ((mid + 1, hi), (lo, mid))
+            search(*near, depth + 1)
+            if delta ** 2 < best[1]:
+                search(*far, depth + 1)
+
+        search(0, self.size, 0)
+        return self._name(best[0])
+
+    def _key(self, index: int) -> str:
+        return self._keys[self._keys_off[index]:self._keys_off[index + 1]].decode()
+
+    def _name(self, place: int) -> str:
+        return self._names[self._names_off[place]:self._names_off[place + 1]].decode()
+
+    def _coords(self, place: int) -> tuple[float, float]:
+        lat, lon = PLACE_RECORD.unpack_from(self._places, place * PLACE_RECORD.size)[:2]
+        return round(lat, 6), round(lon, 6)
+
+    def _bisect(self, key: str) -> int:
+        lo, hi = 0, len(self._keys_place)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _exact_places(self, key: str) -> list[int]:
+        places, index = [], self._bisect(key)
+        while index < len(self._keys_place) and self._key(index) == key:
+            places.append(self._keys_place[index])
+            index += 1
+        return places
+
+    def _prefix_places(self, prefix: str, limit: int = 256) -> list[int]:
+        places, index = [], self._bisect(prefix)
+        while index < len(self._keys_place) and len(places) < limit and self._key(index).startswith(prefix):
+            places.append(self._keys_place[index])
+            index += 1
+        return places
+
+    def _similar_place(self, key: str, min_similarity: float = 0.5) -> int | None:
+        '''
+        Returns `int` typed place with the most similar name by trigrams jaccard similarity or `None`
+        '''
+        hashes = trigram_hashes(key)
+        shared = Counter()
+        for trigram in hashes:
+            lo, hi = 0, len(self._trigrams_hash)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._trigrams_hash[mid] < trigram:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < len(self._trigrams_hash) and self._trigrams_hash[lo] == trigram:
+                shared.update(self._trigrams_keys[self._trigrams_off[lo]:self._trigrams_off[lo + 1]])
+
+        best, best_score = None, min_similarity
+        for key_index, count in shared.items():
+            score = count / (len(hashes) + len(trigram_hashes(self._key(key_index))) - count)
+            place = self._keys_place[key_index]
+            if score > best_score or (score == best_score and best is not None and self._population(place) > self._population(best)):
+                best, best_score = place, score
+        return best
+
+    def _population(self, place: int) -> int:
+        return PLACE_RECORD.unpack_from(self._places, place * PLACE_RECORD.size)[2]
+
+    def _region(self, place: int) -> tuple[str, str]:
+        '''
+        Returns `(country_code, admin1_code)` of the place, e.g., `('US', 'IL')`
+        '''
+        _, _, _, country, admin1 = PLACE_RECORD.unpack_from(self._places, place * PLACE_RECORD.size)
+        return country.decode().strip(), admin1.decode().strip()
+
+    def _resolve_qualifier(self, part: str) -> tuple[set[str], set[str]] | None:
+        '''
+        `part: str` - normalized comma separated part following the place name, e.g., `'illinois'` or `'us'`
+
+        Returns `(country_codes, admin1_keys)` the part may refer to or `None` if it names no known region or country
+        '''
+        countries = set(self._country_names.get(part, []))
+        admin1 = set(self._admin1_names.get(part, []))
+        if not (countries or admin1):
+            return None
+        return countries, admin1
+
+    def _place_in_region(self, place: int, countries: set[str], admin1: set[str]) -> bool:
+        country, admin1_code = self._region(place)
+        return country in countries or f'{country}.{admin1_code}' in admin1
+
+    def _unambiguous_place(self, places: list[int]) -> int | None:
+        '''
+        Returns `int` typed most populated place or `None` if another candidate lies farther than `SAME_PLACE_DEGREES` from it
+        '''
+        best = max(places, key=self._population)
+        latitude, longitude = self._coords(best)
+        for place in places:
+            lat, lon = self._coords(place)
+            if max(abs(lat - latitude), abs(lon - longitude)) > self.SAME_PLACE_DEGREES:
+                return None
+        return best
+
+    @classmethod
+    def build(
+        cls,
+        dump_path: str,
+        index_dir: str,
+        min_population: int = 0,
+        feature_classes: str = 'PA',
+        admin1_codes_path: str = None,
+        country_info_path: str = None,
+    ) -> 'Gazetteer':
+        '''
+        `dump_path: str` - GeoNames tab separated dump, e.g., `cities15000.txt` or `allCountries.txt`
+        `index_dir: str` - directory to write index files to, created if missing
+        `min_population: int = 0` - places with less population are skipped
+        `feature_classes: str = 'PA'` - GeoNames feature classes to keep, populated places and administrative areas by default
+        `admin1_codes_path: str = None` - optional GeoNames `admin1CodesASCII.txt` with region names
+        `country_info_path: str = None` - optional GeoNames `countryInfo.txt` with country names
+
+        Region and country names are also taken from `ADM1` and `PCLI` rows of the dump, dumps of cities only need the two optional files
+
+        Returns `Gazetteer` opened on the built index
+        '''
+        places = array('d')
+        records = bytearray()
+        names = bytearray()
+        names_off = array('Q', [0])
+        keys: list[tuple[str, int]] = []
+        admin1_names: dict[str, set[str]] = {}
+        country_names: dict[str, set[str]] = {}
+        place_countries: set[str] = set()
+
+        def add_names(mapping: dict[str, set[str]], aliases: set[str], code: str) -> None:
+            for key in {normalize_name(alias) for alias in aliases}:
+                if key:
+                    mapping.setdefault(key, set()).add(code)
+
+        if admin1_codes_path:
+            with open(admin1_codes_path, encoding='utf-8') as f:
+                for line in f:
+                    columns = line.rstrip('\n').split('\t')
+                    if len(columns) >= 3:
+                        add_names(admin1_names, {columns[1], columns[2]}, columns[0])
+        if country_info_path:
+            with open(country_info_path, encoding='utf-8') as f:
+                for line in f:
+                    columns = line.rstrip('\n').split('\t')
+                    if not line.startswith('#') and len(columns) >= 5:
+                        add_names(country_names, {columns[0], columns[1], columns[4]}, columns[0])
+
+        with open(dump_path, encoding='utf-8') as f:
+            for line in f:
+                columns = line.rstrip('\n').split('\t')
+                if len(columns) < 15:
+                    continue
+                country, admin1 = columns[8][:2], columns[10][:20]
+                aliases = {columns[1], columns[2], *columns[3].split(',')}
+                if columns[7] == 'ADM1':
+                    add_names(admin1_names, aliases, f'{country}.{admin1}')
+                elif columns[7] in COUNTRY_FEATURE_CODES:
+                    add_names(country_names, aliases | {country}, country)
+                if columns[6] not in feature_classes:
+                    continue
+                population = int(columns[14] or 0)
+                if population < min_population:
+                    continue
+
+                place = len(names_off) - 1
+                lat, lon = float(columns[4]), float(columns[5])
+                places.extend((lat, lon))
+                records += PLACE_RECORD.pack(
+                    lat, lon, min(population, 2 ** 32 - 1), country.encode().ljust(2), admin1.encode()[:20].ljust(20)
+                )
+                names += columns[1].encode()
+                names_off.append(len(names))
+                if country:
+                    place_countries.add(country)
+
+                keys.extend((key, place) for key in {normalize_name(alias) for alias in aliases} if key)
+
+        keys.sort()
+        keys_bin = bytearray()
+        keys_off = array('Q', [0])
+        keys_place = array('I')
+        postings: dict[int, list[int]] = {}
+        for index, (key, place) in enumerate(keys):
+            keys_bin += key.encode()
+            keys_off.append(len(keys_bin))
+            keys_place.append(place)
+            for trigram in trigram_hashes(key):
+                postings.setdefault(trigram, []).append(index)
+
+        trigrams_hash = array('I', sorted(postings))
+        trigrams_off = array('Q', [0])
+        trigrams_keys = array('I')
+        for trigram in trigrams_hash:
+            trigrams_keys.extend(postings[trigram])
+            trigrams_off.append(len(trigrams_keys))
+
+        kdtree = array('I', range(len(names_off) - 1))
+        cls._arrange_kdtree(kdtree, places, 0, len(kdtree), 0)
+
+        # Two letter country codes and letter admin1 codes, e.g., `IL` of Illinois, are names as well
+        for code in {code for codes in country_names.values() for code in codes} | place_countries:
+            country_names.setdefault(code.lower(), set()).add(code)
+        for key in {key for keys in admin1_names.values() for key in keys}:
+            code = key.partition('.')[2]
+            if code.isalpha():
+                admin1_names.setdefault(code.lower(), set()).add(key)
+
+        os.makedirs(index_dir, exist_ok=True)
+        with open(os.path.join(index_dir, 'regions.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'admin1': {key: sorted(codes) for key, codes in admin1_names.items()},
+                'countries': {key: sorted(codes) for key, codes in country_names.items()},
+            }, f)
+        contents = {
+            'places.bin': records, 'names.bin': names, 'names.off': names_off,
+            'keys.bin': keys_bin, 'keys.off': keys_off, 'keys.place': keys_place,
+            'trigrams.hash': trigrams_hash, 'trigrams.off': trigrams_off, 'trigrams.keys': trigrams_keys,
+            'kdtree.bin': kdtree,
+        }
+        for name, content in contents.items():
+            with open(os.path.join(index_dir, name), 'wb') as f:
+                f.write(content if isinstance(content, bytearray) else content.tobytes())
+        return cls(index_dir)
+
+    @staticmethod
+    def _arrange_kdtree(tree: array, places: array, lo: int, hi: int, depth: int) -> None:
+        '''
+        Reorders `tree[lo:hi]` in place so that every median splits its subarray by latitude or longitude in turns
+        '''
+        stack = [(lo, hi, depth)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= 1:
+                continue
+            axis = depth % 2
+            tree[lo:hi] = array('I', sorted(tree[lo:hi], key=lambda place: places[2 * place + axis]))
+            mid = (lo + hi) // 2
+            stack.append((lo, mid, depth + 1))
+            stack.append((mid + 1, hi, depth + 1))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (3, 5):
+        sys.exit(
+            'Usage: python -m py_lead_generation.src.misc.gazetteer <geonames_dump.txt> <index_dir> '
+            '[<admin1CodesASCII.txt> <countryInfo.txt>]'
+        )
+    admin1_codes_path, country_info_path = sys.argv[3:5] or (None, None)
+    gazetteer = Gazetteer.build(
+        sys.argv[1], sys.argv[2], admin1_codes_path=admin1_codes_path, country_info_path=country_info_path
+    )
+    print(f'Indexed {gazetteer.size} places into {sys.argv[2]}')
@@ -0,0 +1,198 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import Counter, OrderedDict
+
+
+logger = logging.getLogger(__name__)
+
+MISS = object()
+
+
+class GeocodeCache:
+    '''
+    `GeocodeCache`
+
+    Persistent sqlite cache of geocoded coordinates and bounding boxes keyed by normalized location, with in-process LRU cache in front of it
+
+    Unknown locations are cached as well (negative caching) with their own, shorter time to live
+
+    [CONSTANT] `TABLES` - sqlite table and value columns of every cached kind, coordinates and bounding boxes
+
+    [EDITABLE] `DEFAULT_PATH` - cache file path used if none is given, can be overridden with `LEAD_GEOCODE_CACHE` environment variable
+    '''
+
+    TABLES = {
+        'coords': ('geocode', ('latitude', 'longitude')),
+        'bbox': ('bounding_box', ('south', 'west', 'north', 'east')),
+    }
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'py_lead_generation', 'geocode.sqlite3')
+
+    def __init__(
+        self,
+        path: str = None,
+        ttl_s: float = 90 * 24 * 3600,
+        negative_ttl_s: float = 24 * 3600,
+        lru_size: int = 1024,
+    ) -> None:
+        '''
+        `path: str = None` - sqlite file path, `':memory:'` keeps the cache in memory only
+        `ttl_s: float = 90 days` - time to live of the found coordinates and bounding boxes in seconds
+        `negative_ttl_s: float = 1 day` - time to live of the unknown locations in seconds
+        `lru_size: int = 1024` - amount of locations kept in process memory
+        '''
+        self.path = path or os.environ.get('LEAD_GEOCODE_CACHE') or self.DEFAULT_PATH
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.lru_size = lru_size
+        self.counters = Counter()
+
+        self._lru: OrderedDict[tuple[str, str], tuple[tuple | None, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._disk_enabled = True
+
+    @staticmethod
+    def normalize(location: str) -> str:
+        '''
+        Returns `str` typed cache key - casefolded location with collapsed whitespace
+        '''
+        return ' '.join(location.casefold().replace(',', ', ').split())
+
+    def get(self, location: str) -> tuple[float, float] | None | object:
+        '''
+        `location: str` - location as given by the user
+
+        Returns `(latitude, longitude)`, `None` for a known unknown location or `MISS` if nothing fresh is cached
+        '''
+        return self._get('coords', location)
+
+    def set(self, location: str, coords: tuple[float, float] | None) -> None:
+        '''
+        `location: str` - location as given by the user
+        `coords: tuple[float, float] | None` - geocoded `(latitude, longitude)` or `None` if the location is unknown
+        '''
+        self._set('coords', location, coords)
+
+    def get_bounding_box(self, location: str) -> tuple[float, float, float, float] | None | object:
+        '''
+        `location: str` - location as given by the user
+
+        Returns `(south, west, north, east)`, `None` for a location without a known bounding box or `MISS` if nothing fresh is cached
+        '''
+        return self._get('bbox', location)
+
+    def set_bounding_box(self, location: str, box: tuple[float, float, float, float] | None) -> None:
+        '''
+        `location: str` - location as given by the user
+        `box: tuple[float, float, float, float] | None` - geocoded `(south, west, north, east)` or `None` if the location has no bounding box
+        '''
+        self._set('bbox', location, box)
+
+    def _get(self, kind: str, location: str) -> tuple | None | object:
+        key = (kind, self.normalize(location))
+        now = time.time()
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached is not None and self._is_fresh(cached, now):
+                self._lru.move_to_end(key)
+                return self._hit(cached[0], 'memory')
+
+            row = self._read(key)
+            if row is not None and self._is_fresh(row, now):
+                self._remember(key, row)
+                return self._hit(row[0], 'disk')
+
+            self.counters['misses'] += 1
+            return MISS
+
+    def _set(self, kind: str, location: str, value: tuple | None) -> None:
+        key = (kind, self.normalize(location))
+        value = (tuple(value) if value is not None else None, time.time())
+        with self._lock:
+            self._remember(key, value)
+            self._write(key, value)
+
+    @property
+    def stats(self) -> dict:
+        '''
+        Returns `dict` typed counters - `{memory_hits, disk_hits, negative_hits, misses}`
+        '''
+        return {name: self.counters[name] for name in ('memory_hits', 'disk_hits', 'negative_hits', 'misses')}
+
+    def _hit(self, value: tuple | None, source: str) -> tuple | None:
+        self.counters[f'{source}_hits'] += 1
+        if value is None:
+            self.counters['negative_hits'] += 1
+        return value
+
+    def _is_fresh(self, value: tuple, now: float) -> bool:
+        cached, created_at = value
+        ttl_s = self.ttl_s if cached is not None else self.negative_ttl_s
+        return now - created_at < ttl_s
+
+    def _remember(self, key: str, value: tuple) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def _connect(self) -> sqlite3.Connection | None:
+        '''
+        Opens the sqlite file on the first use, disables persistence if it cannot be opened, e.g., on a read-only file system
+        '''
+        if self._connection is None and self._disk_enabled:
+            try:
+                if self.path != ':memory:':
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._connection = sqlite3.connect(self.path, check_same_thread=False)
+                for table, columns in self.TABLES.values():
+                    self._connection.execute(
+                        f'CREATE TABLE IF NOT EXISTS {table} ('
+                        f'location TEXT PRIMARY KEY, {", ".join(f"{column} REAL" for column in columns)}, created_at REAL NOT NULL)'
+                    )
+                self._connection.commit()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning('Geocode cache %s is disabled: %r', self.path, e)
+                self._disk_enabled = False
+                self._connection = None
+        return self._connection
+
+    def _read(self, key: tuple[str, str]) -> tuple | None:
+        connection = self._connect()
+        if connection is None:
+            return None
+        kind, location = key
+        table, columns = self.TABLES[kind]
+        try:
+            row = connection.execute(
+                f'SELECT {", ".join(columns)}, created_at FROM {table} WHERE location = ?', (location,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning('Failed to read geocode cache: %r', e)
+            return None
+        if row is None:
+            return None
+        *values, created_at = row
+        return (tuple(values) if values[0] is not None else None), created_at
+
+    def _write(self, key: tuple[str, str], value: tuple) -> None:
+        connection = self._connect()
+        if connection is None:
+            return
+        kind, location = key
+        table, columns = self.TABLES[kind]
+        cached, created_at = value
+        values = cached if cached is not None else (None,) * len(columns)
+        try:
+            connection.execute(
+                f'INSERT OR REPLACE INTO {table} (location, {", ".join(columns)}, created_at) '
+                f'VALUES ({", ".join("?" * (len(columns) + 2))})',
+                (location, *values, created_at),
+            )
+            connection.commit()
+        except sqlite3.Error as e:
+            logger.warning('Failed to write geocode cache: %r', e)
@@ -0,0 +1,233 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any
+
+
+class ParserBackend(ABC):
+    '''
+    `ParserBackend`
+
+    HTML parser abstraction, all backends run the same CSS selectors and return the same text as `BeautifulSoup.get_text()`
+
+    [CONSTANT] `NAME` - name of the backend used in `get_parser_backend`
+    '''
+
+    NAME = ''
+
+    @abstractmethod
+    def parse(self, html: str) -> Any:
+        '''
+        `html: str` - html representation of the page to parse
+
+        Returns backend specific document node
+        '''
+        ...
+
+    @abstractmethod
+    def select(self, node: Any, selector: str) -> list[Any]:
+        '''
+        Returns `list` of all nodes inside `node` matching the css `selector`
+        '''
+        ...
+
+    def select_one(self, node: Any, selector: str) -> Any | None:
+        '''
+        Returns the first node inside `node` matching the css `selector` or `None`
+        '''
+        nodes = self.select(node, selector)
+        return nodes[0] if nodes else None
+
+    @abstractmethod
+    def matches(self, node: Any, selector: str) -> bool:
+        '''
+        Returns `bool` typed flag whether the node itself matches the css `selector`
+        '''
+        ...
+
+    @abstractmethod
+    def text(self, node: Any) -> str:
+        '''
+        Returns `str` typed text of the node and all its descendants
+        '''
+        ...
+
+    @abstractmethod
+    def attr(self, node: Any, name: str) -> str | None:
+        '''
+        Returns `str` typed value of the `name` attribute of the node or `None`
+        '''
+        ...
+
+
+class SoupParserBackend(ParserBackend):
+    '''
+    BeautifulSoup with the builtin `html.parser`, slowest one, but does not need any extra dependency
+    '''
+
+    NAME = 'soup'
+
+    def __init__(self) -> None:
+        from bs4 import BeautifulSoup
+        import soupsieve
+
+        self._soup_cls = BeautifulSoup
+        self._compile = lru_cache(maxsize=None)(soupsieve.compile)
+
+    def parse(self, html: str) -> Any:
+        return self._soup_cls(html, 'html.parser')
+
+    def select(self, node: Any, selector: str) -> list[Any]:
+        return self._compile(selector).select(node)
+
+    def select_one(self, node: Any, selector: str) -> Any | None:
+        return self._compile(selector).select_one(node)
+
+    def matches(self, node: Any, selector: str) -> bool:
+        return self._compile(selector).match(node)
+
+    def text(self, node: Any) -> str:
+        return node.get_text()
+
+    def attr(self, node: Any, name: str) -> str | None:
+        return node.get(name)
+
+
+class LxmlParserBackend(ParserBackend):
+    '''
+    `lxml.html` parser, css selectors are translated to xpath by `cssselect` once and cached
+    '''
+
+    NAME = 'lxml'
+
+    def __init__(self) -> None:
+        import lxml.html
+        from lxml.etree import XPath
+        from cssselect import HTMLTranslator
+
+        self._translator = HTMLTranslator()
+        self._fromstring = lxml.html.document_fromstring
+        self._compile = lru_cache(maxsize=None)(
+            lambda selector: XPath(self._translator.css_to_xpath(selector, prefix='descendant::'))
+        )
+        self._compile_match = lru_cache(maxsize=None)(
+            lambda selector: XPath(f'boolean({self._self_test_xpath(selector)})')
+        )
+
+    def parse(self, html: str) -> Any:
+        # lxml refuses blank documents, other backends return an empty one
+        return self._fromstring(html if html.strip() else '<html></html>')
+
+    def select(self, node: Any, selector: str) -> list[Any]:
+        return self._compile(selector)(node)
+
+    def matches(self, node: Any, selector: str) -> bool:
+        return self._compile_match(selector)(node)
+
+    def _self_test_xpath(self, selector: str) -> str:
+        '''
+        Translates css `selector` to xpath testing the context node itself, combinators are turned into reverse axes
+        '''
+        from cssselect import parse
+        from cssselect.parser import CombinedSelector
+
+        axes = {
+            ' ': 'ancestor::*',
+            '>': 'parent::*',
+            '+': 'preceding-sibling::*[1]',
+            '~': 'preceding-sibling::*',
+        }
+
+        def self_test(tree: Any) -> str:
+            if isinstance(tree, CombinedSelector):
+                return f'{self_test(tree.subselector)}[{axes[tree.combinator]}[{self_test(tree.selector)}]]'
+            expr = self._translator.xpath(tree)
+            test = f'self::{expr.element}'
+            return f'{test}[{expr.condition}]' if expr.condition else test
+
+        return ' | '.join(self_test(parsed.parsed_tree) for parsed in parse(selector))
+
+    def text(self, node: Any) -> str:
+        return node.text_content()
+
+    def attr(self, node: Any, name: str) -> str | None:
+        return node.get(name)
+
+
+class SelectolaxParserBackend(ParserBackend):
+    '''
+    `selectolax` parser powered by the lexbor engine, the fastest one
+    '''
+
+    NAME = 'selectolax'
+
+    def __init__(self) -> None:
+        from selectolax.lexbor import LexborHTMLParser
+
+        self._parser_cls = LexborHTMLParser
+
+    def parse(self, html: str) -> Any:
+        return self._parser_cls(html)
+
+    def select(self, node: Any, selector: str) -> list[Any]:
+        # lexbor matches the node itself as well, unlike other backends
+        return [match for match in node.css(selector) if match != node]
+
+    def matches(self, node: Any, selector: str) -> bool:
+        return node.css_matches(selector)
+
+    def text(self, node: Any) -> str:
+        return node.text(deep=True)
+
+    def attr(self, node: Any, name: str) -> str | None:
+        return node.attributes.get(name)
+
+
+PARSER_BACKENDS = {
+    backend.NAME: backend
+    for backend in (SelectolaxParserBackend, LxmlParserBackend, SoupParserBackend)
+}
+
+_default_backend_name: str = None
+_instances: dict[str, ParserBackend] = {}
+
+
+def set_default_parser_backend(name: str | None) -> None:
+    '''
+    `name: str | None` - one of `PARSER_BACKENDS` keys, `None` picks the fastest installed one
+
+    Sets parser backend used by engines, which do not specify their own `PARSER_BACKEND`
+
+    Applies to the current process only, engines resolve the backend before handing a page to a parse executor and pass its name along, so process pool workers use it whatever the multiprocessing start method is
+    '''
+    global _default_backend_name
+    if name is not None and name not in PARSER_BACKENDS:
+        raise ValueError(f'Unknown parser backend {name!r}, use one of {list(PARSER_BACKENDS)}')
+    _default_backend_name = name
+
+
+def get_parser_backend(name: str = None) -> ParserBackend:
+    '''
+    `name: str = None` - one of `PARSER_BACKENDS` keys, by default uses the one set by `set_default_parser_backend`
+
+    If no backend is set, the fastest installed one is used - selectolax, lxml and BeautifulSoup in that order
+
+    Returns `ParserBackend` instance, created once per process
+    '''
+    name = name or _default_backend_name
+    if name in _instances:
+        return _instances[name]
+
+    if name is not None:
+        if name not in PARSER_BACKENDS:
+            raise ValueError(f'Unknown parser backend {name!r}, use one of {list(PARSER_BACKENDS)}')
+        backend = PARSER_BACKENDS[name]()
+    else:
+        for backend_cls in PARSER_BACKENDS.values():
+            try:
+                backend = backend_cls()
+                break
+            except ImportError:
+                continue
+
+    _instances[name] = backend
+    return backend
@@ -1,16 +1,175 @@
-from geopy.geocoders import Nominatim
+import os
+import math
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
+from py_lead_generation.src.misc.geocache import MISS, GeocodeCache
+from py_lead_generation.src.misc.gazetteer import Gazetteer
 
-geolocator = Nominatim(user_agent='google-leads')
+
+logger = logging.getLogger(__name__)
+
+geocode_cache = GeocodeCache()
+gazetteer: Gazetteer | None = Gazetteer(os.environ['LEAD_GAZETTEER_DIR']) if os.environ.get('LEAD_GAZETTEER_DIR') else None
+_geolocator = None
+
+_geocode_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='geocode')
+_geocode_in_flight: dict[str, Future] = {}
+_geocode_lock = threading.Lock()
+
+
+def set_gazetteer(index_dir: str | None) -> None:
+    '''
+    `index_dir: str | None` - directory built by `Gazetteer.build`, `None` disables offline geocoding
+
+    Same as setting `LEAD_GAZETTEER_DIR` environment variable before import
+    '''
+    global gazetteer
+    if gazetteer is not None:
+        gazetteer.close()
+    gazetteer = Gazetteer(index_dir) if index_dir else None
+
+
+def _get_geolocator():
+    '''
+    Returns Nominatim geolocator, `geopy` is imported only when it is needed, or `None` if it is not installed
+    '''
+    global _geolocator
+    if _geolocator is None:
+        try:
+            from geopy.geocoders import Nominatim
+        except ImportError:
+            return None
+        _geolocator = Nominatim(user_agent='google-leads')
+    return _geolocator
+
+
+def _geocode_online(location: str) -> tuple[float, float] | None:
+    '''
+    Nominatim fallback used only when the offline gazetteer does not know the location
+
+    Returns `MISS` if `geopy` is not installed, so nothing is cached
+    '''
+    geolocator = _get_geolocator()
+    if geolocator is None:
+        return MISS
+    loc = geolocator.geocode(location)
+    return (loc.latitude, loc.longitude) if loc else None
 
 
 def get_coords_by_location(location: str) -> tuple[str]:
     '''
     `location: str` - specific location or city name
 
+    Looks up the offline `gazetteer` first if configured, then `geocode_cache`, Nominatim is called only for locations, which are not cached yet or expired
+
+    The gazetteer answers only unambiguous locations, e.g., `'Springfield'` alone or a region it does not know goes to the cache and Nominatim
+
+    Raises `ValueError` if the location is unknown
+
     Returns a tuple of the coordinates, two strings represented as float numbers - (latitude, longitude)
     '''
-    loc = geolocator.geocode(location)
-    coords = (loc.latitude, loc.longitude)
+    coords = gazetteer.forward(location) if gazetteer is not None else None
+    if coords is None:
+        coords = geocode_cache.get(location)
+    if coords is MISS:
+        coords = _geocode_online(location)
+        if coords is MISS:
+            raise ValueError(f'Location {location!r} is not in the gazetteer and geopy is not installed')
+        geocode_cache.set(location, coords)
+
+    if coords is None:
+        raise ValueError(f'Location {location!r} is not found')
     coords = list(map(str, coords))
     return coords
+
+
+async def resolve_coords_by_location(location: str) -> list[str]:
+    '''
+    `location: str` - specific location or city name
+
+    Awaitable `get_coords_by_location`, geocoding runs in a thread so the event loop is never blocked
+
+    Concurrent calls for the same location, from any thread or event loop, share a single lookup
+
+    Raises `ValueError` if the location is unknown
+    '''
+    key = geocode_cache.normalize(location)
+    with _geocode_lock:
+        future = _geocode_in_flight.get(key)
+        if future is None:
+            future = _geocode_executor.submit(get_coords_by_location, location)
+            _geocode_in_flight[key] = future
+            future.add_done_callback(lambda _: _forget_in_flight(key, future))
+    return list(await asyncio.shield(asyncio.wrap_future(future)))
+
+
+def _forget_in_flight(key: str, future: Future) -> None:
+    with _geocode_lock:
+        if _geocode_in_flight.get(key) is future:
+            del _geocode_in_flight[key]
+
+
+def _bounding_box_online(location: str) -> tuple[float, float, float, float] | None | object:
+    '''
+    Nominatim bounding box of the location, the coordinates of the same response are cached along
+
+    Returns `None` if Nominatim has no bounding box for the location, `MISS` if `geopy` is not installed or Nominatim failed, so nothing is cached
+    '''
+    geolocator = _get_geolocator()
+    if geolocator is None:
+        return MISS
+    from geopy.exc import GeopyError
+
+    try:
+        loc = geolocator.geocode(location)
+    except GeopyError as e:
+        logger.warning('Nominatim failed to geocode %r: %r', location, e)
+        return MISS
+    if loc is None:
+        geocode_cache.set(location, None)
+        return None
+    geocode_cache.set(location, (loc.latitude, loc.longitude))
+    if len(loc.raw.get('boundingbox') or []) != 4:
+        return None
+    south, north, west, east = map(float, loc.raw['boundingbox'])
+    return south, west, north, east
+
+
+def get_bounding_box_by_location(location: str, radius_km: float = 10) -> tuple[float, float, float, float]:
+    '''
+    `location: str` - specific location or city name
+    `radius_km: float = 10` - half size of the box around the location coordinates, used if the bounding box of the location is not known
+
+    Locations known to the offline `gazetteer` get the box around their coordinates right away, otherwise the Nominatim bounding box is looked up in `geocode_cache` first and requested only if it is not cached yet or expired
+
+    Falls back to the box around the location coordinates if `geopy` is not installed, Nominatim fails or has no bounding box
+
+    Raises `ValueError` if the location is unknown
+
+    Returns a tuple of the box bounds - (south, west, north, east)
+    '''
+    coords = gazetteer.forward(location) if gazetteer is not None else None
+    if coords is None:
+        box = geocode_cache.get_bounding_box(location)
+        if box is MISS:
+            box = _bounding_box_online(location)
+            if box is not MISS:
+                geocode_cache.set_bounding_box(location, box)
+        if box is not None and box is not MISS:
+            return box
+        coords = get_coords_by_location(location)
+
+    latitude, longitude = map(float, coords)
+    lat_delta = radius_km / 111.32
+    lon_delta = radius_km / (111.32 * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - lat_delta, longitude - lon_delta, latitude + lat_delta, longitude + lon_delta
+
+
+async def resolve_bounding_box_by_location(location: str, radius_km: float = 10) -> tuple[float, float, float, float]:
+    '''
+    Awaitable `get_bounding_box_by_location`, geocoding runs in a thread so the event loop is never blocked
+    '''
+    return await asyncio.to_thread(get_bounding_box_by_location, location, radius_km)
@@ -31,11 +31,11 @@ class CsvWriter:
 
     def append(self, data: list[dict]) -> None:
         '''
-        `data: list[dict]` - data to write, keys of this dictionary should match fieldnames
+        `data: list[dict]` - data to write, keys of this dictionary should match fieldnames, other keys are skipped
 
         Appends incoming `data` to the csv file
         '''
         with open(self.filename, 'a', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction='ignore')
             for d in data:
                 writer.writerow(d)
@@ -1,15 +1,33 @@
-import time
+import re
+import json
 import asyncio
-from bs4 import BeautifulSoup
+import logging
+from urllib.parse import urlsplit
+from playwright.async_api import Page
 
 from py_lead_generation.src.engines.base import BaseEngine
 from py_lead_generation.src.engines.abstract import AbstractEngine
+from py_lead_generation.src.engines.browser_pool import BrowserPool
+from py_lead_generation.src.engines.routing import ANALYTICS_HOSTS, BlockingProfile
+from py_lead_generation.src.engines.scheduler import HostLimit
+from py_lead_generation.src.misc.extraction import ExtractionSpec, FieldSpec
+
+
+logger = logging.getLogger(__name__)
+
+PAGINATION_REGEX = re.compile(r'\b\d+\s+of\s+(\d+)\b')
 
 
 class YelpEngine(BaseEngine, AbstractEngine):
     '''
     `YelpEngine`
 
+    [CONSTANT] `RESULTS_PER_PAGE` - amount of search results on a single page, step of the `start` offset in `BASE_URL`
+
+    [EDITABLE] `MAX_PAGES` - upper limit of the search results pages to list, yelp does not serve more than 24 of them
+
+    [CONSTANT] `PAGINATION_SELECTOR` - selector of the pagination element with `1 of N` pages text
+
     Usage:
 
     `engine = YelpEngine(*args, **kwargs)`
@@ -21,70 +39,169 @@ class YelpEngine(BaseEngine, AbstractEngine):
     `print(engine.entries)`
     '''
 
-    BASE_URL = 'https://www.yelp.com/search?find_desc={query}&find_loc={location}%2C+Philippines&start=0'
+    BASE_URL = 'https://www.yelp.com/search?find_desc={query}&find_loc={location}%2C+Philippines&start={start}'
     FIELD_NAMES = ['Title', 'Address', 'PhoneNumber', 'Tags']
     FILENAME = 'yelp_leads.csv'
-
-    def __init__(self, query: str, location: str) -> None:
+    SEARCH_READY_SELECTOR = '.css-1hqkluu'
+    DETAIL_READY_SELECTOR = '.css-1se8maq'
+    HOST_LIMITS = {'www.yelp.com': HostLimit(1, burst=3, max_concurrency=4)}
+    BLOCK_PAGE_PATTERNS = [r'yelp\.com/visit_captcha', r'captcha-delivery\.com', r'/px-captcha']
+    SUPPORTS_HTTP_FAST_PATH = True
+    REQUIRED_FIELDS = ['Title', 'Address', 'PhoneNumber']
+    EXTRACTION_SPEC = ExtractionSpec([
+        FieldSpec('Title', '.css-1se8maq', default='-'),
+        FieldSpec('Address', '.css-qyp8bo', default='-'),
+        FieldSpec('PhoneNumber', '.css-djo2w .css-1p9ibgf', default='-'),
+        FieldSpec('Tags', '.css-1xfc281 span.css-1fdy0l5', multi=True, child='a', child_default='-'),
+    ])
+
+    PAYLOAD_URL_PATTERNS = [r'/search/snippet\?']
+    BLOCKING_PROFILE = BlockingProfile(
+        resource_types=['image', 'media', 'font'],
+        hosts=ANALYTICS_HOSTS + ['ads.yelp.com', 'cdn.segment.com', 'sentry.io'],
+    )
+
+    RESULTS_PER_PAGE = 10
+    MAX_PAGES = 24
+    PAGINATION_SELECTOR = '[aria-label="Pagination navigation"]'
+
+    def __init__(self, query: str, location: str, browser_pool: BrowserPool = None) -> None:
         '''
+        `query: str` - what are you looking for? e.g., `pizza`
+        `location: str` - where are you looking for that query? e.g., `Mexico, Pampanga`
+        `browser_pool: BrowserPool = None` - optional warm browser pool shared between runs
+
+        Creates `YelpEngine` instance
         '''
         self._entries = []
+        self.browser_pool = browser_pool
         self.query = query
         self.location = location
-        self.url = self.BASE_URL.format(
-            query=self.query, location=self.location
+        self.url = self._page_url(0)
+
+    def _page_url(self, start: int) -> str:
+        '''
+        `start: int` - offset of the first search result on the page
+
+        Returns `str` typed url of the search results page
+        '''
+        return self.BASE_URL.format(
+            query=self.query, location=self.location, start=start
         )
 
     async def _get_search_results_urls(self) -> list[str]:
         '''
+        Reads the amount of search results pages from the already opened first page
+
+        Opens the rest of the pages by their `start` offset at the same time, each one on its own page taken from the pool
+
+        Every page is retried according to `RETRY_POLICY` and reported to the `circuit_breaker`, block pages and pages without results count as failures
+
+        A failing page does not abort the others, it is skipped and stored in `.failed_urls`
+
+        Returns `list[str]` typed urls in the search results order, deduplicated by `_place_key`
+        '''
+        pagination = await self.page.evaluate(
+            '(selector) => document.querySelector(selector)?.innerText || ""', self.PAGINATION_SELECTOR
+        )
+        match = PAGINATION_REGEX.search(pagination)
+        total_pages = min(int(match.group(1)), self.MAX_PAGES) if match else 1
+        first_page_urls = await self._get_page_urls(self.page)
+
+        pool = await self._setup_page_pool()
+
+        async def list_page(start: int) -> list[str]:
+            url = self._page_url(start)
+
+            async def open_list_page() -> tuple[bool, list[str]]:
+                page = await pool.get()
+                try:
+                    page = await self._recycle_page_if_needed(page)
+                    if self._payload_interceptor is not None:
+                        self._payload_interceptor.attach(page)
+                    await self._open_url_and_wait(
+                        url, self.SEARCH_READY_TIMEOUT_S, page=page, ready_selector=self.SEARCH_READY_SELECTOR
+                    )
+                    self._raise_if_blocked(url, page)
+                    page_urls = await self._get_page_urls(page)
+                    # A page without results was not rendered, pagination promised them
+                    return bool(page_urls), page_urls
+                finally:
+                    pool.put_nowait(page)
+
+            try:
+                return await self._with_retries(url, open_list_page)
+            except Exception as e:
+                if self._is_session_lost():
+                    raise
+                logger.warning('Failed to list %s: %r', url, e)
+                self._failed_urls[url] = e
+                return []
+
+        other_pages_urls = await asyncio.gather(*(
+            list_page(page_index * self.RESULTS_PER_PAGE) for page_index in range(1, total_pages)
+        ))
+
+        urls: dict[str, str] = {}
+        for page_urls in (first_page_urls, *other_pages_urls):
+            for url in page_urls:
+                urls.setdefault(self._place_key(url), url)
+        return list(urls.values())
+
+    async def _get_page_urls(self, page: Page) -> list[str]:
+        '''
+        `page: Page` - opened search results page
+
+        Returns `list[str]` typed absolute urls of the search results on the page
         '''
-        urls = []
+        return await page.eval_on_selector_all(
+            self.SEARCH_READY_SELECTOR, 'links => links.map(link => link.href).filter(Boolean)'
+        )
+
+    @classmethod
+    def _decode_payload(cls, url: str, body: str) -> dict[str, dict]:
+        '''
+        `url: str` - url of the captured `/search/snippet` response
+        `body: str` - body of the response
+
+        Returns `dict[str, dict]` typed entries by their `_place_key`, with coordinates and rating on top of `FIELD_NAMES`
+        '''
+        props = json.loads(body).get('searchPageProps') or {}
         host = 'https://www.yelp.com'
-        while True:
-            await asyncio.sleep(3)
-            link_elements = await self.page.query_selector_all('.css-1hqkluu')
-            for link_element in link_elements:
-                url = await link_element.get_attribute('href')
-                url = host + url
-                urls.append(url)
-
-            next_page_btn = await self.page.query_selector(
-                '.next-link.navigation-button__09f24__m9qRz.css-ahgoya'
-            )
-            if not next_page_btn:
-                break
-
-            await next_page_btn.scroll_into_view_if_needed()
-            await next_page_btn.click()
-
-        return urls
-
-    def _parse_data_with_soup(self, html: str) -> list[str]:
+
+        markers = (((props.get('rightRailProps') or {}).get('searchMapProps') or {}).get('mapState') or {}).get('markers') or []
+        locations = {
+            cls._place_key(host + marker['url']): marker.get('location') or {}
+            for marker in markers if isinstance(marker, dict) and marker.get('url')
+        }
+
+        entries = {}
+        for component in props.get('mainContentComponentsListProps') or []:
+            business = component.get('searchResultBusiness') if isinstance(component, dict) else None
+            if not business or not business.get('businessUrl'):
+                continue
+
+            key = cls._place_key(host + business['businessUrl'])
+            location = locations.get(key, {})
+            entries[key] = {
+                'Title': business.get('name') or '-',
+                'Address': business.get('formattedAddress') or '-',
+                'PhoneNumber': business.get('phone') or '-',
+                'Tags': ','.join(category['title'] for category in business.get('categories') or [] if category.get('title')),
+                'Latitude': location.get('latitude'),
+                'Longitude': location.get('longitude'),
+                'Rating': business.get('rating'),
+            }
+        return entries
+
+    @classmethod
+    def _place_key(cls, url: str) -> str:
         '''
-        `html: str` - html representation of the page to parse
+        `url: str` - yelp business url
 
-        Returns `list[str]` typed parsed data - `[title, addr, phone, tags]`
+        Returns `str` typed business url without query parameters, e.g., `https://www.yelp.com/biz/some-pizza-place`
         '''
-        soup = BeautifulSoup(html, 'html.parser')
-        data = []
-
-        title_selector = '.css-1se8maq'
-        addr_selector = '.css-qyp8bo'
-        phone_selector = '.css-djo2w .css-1p9ibgf'
-        tags_selector = '.css-1xfc281 span.css-1fdy0l5'
-
-        for selector in (title_selector, addr_selector, phone_selector):
-            element = soup.select_one(selector)
-            info = element.get_text() if element else '-'
-            data.append(info)
-
-        tags = ''
-        tag_elements = soup.select(tags_selector)
-        for tag_element in tag_elements:
-            el = tag_element.find('a')
-            tag = el.get_text() if el else '-'
-            tags += tag + ','
-        tags = tags[:-1]
-        data.append(tags)
-
-        return data
+        parts = urlsplit(url)
+        if not parts.path.startswith('/biz/'):
+            return url
+        return f'https://www.yelp.com{parts.path}'
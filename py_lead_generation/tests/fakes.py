@@ -0,0 +1,97 @@
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from py_lead_generation.src.engines.abstract import AbstractEngine
+from py_lead_generation.src.engines.base import BaseEngine
+from py_lead_generation.src.engines.playwright_config import BlockedPageError
+from py_lead_generation.src.engines.resilience import RetryPolicy
+from py_lead_generation.src.misc.extraction import ExtractionSpec, FieldSpec
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.url = 'about:blank'
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeEngine(AbstractEngine, BaseEngine):
+    '''
+    Engine without a browser, every url attempt follows the script given for it
+
+    Script actions - `'ok'`, `'empty'`, `'timeout'`, `'blocked'`, `'error'` and `'crash'`, which disconnects the browser
+    '''
+
+    FIELD_NAMES = ['Title', 'Phone']
+    EXTRACTION_SPEC = ExtractionSpec([FieldSpec('Title', 'h1'), FieldSpec('Phone', '.phone')])
+    PARSE_EXECUTOR = None
+    PAGE_POOL_SIZE = 3
+    INITIAL_CONCURRENCY = 3
+    RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay_s=0, max_delay_s=0)
+    CIRCUIT_BREAKER = False
+    scheduler = None
+
+    def __init__(self, urls: list[str], scripts: dict[str, list[str]] = None, delays: dict[str, float] = None) -> None:
+        self._entries = []
+        self.url = 'https://example.com/search'
+        self.listed = urls
+        self.scripts = {url: list(actions) for url, actions in (scripts or {}).items()}
+        self.delays = delays or {}
+        self.attempts = Counter()
+        self.sessions = 0
+        self.connected = True
+
+    @asynccontextmanager
+    async def _browser_session(self) -> AsyncIterator[None]:
+        self._page_navigations = {}
+        self._recycled_pages = 0
+        self._page_pool = None
+        self._memory_watchdog = None
+        self.sessions += 1
+        self.connected = True
+        self.page = FakePage()
+        yield
+
+    async def _new_page(self) -> FakePage:
+        return FakePage()
+
+    def _is_session_lost(self) -> bool:
+        return not self.connected
+
+    async def _open_url_and_wait(self, url: str, timeout_s: float = 3, page=None, ready_selector: str = None) -> bool:
+        (page or self.page).url = url
+        return True
+
+    async def _get_search_results_urls(self) -> list[str]:
+        return list(self.listed)
+
+    async def _get_search_result_entry(self, url: str, page: FakePage) -> dict:
+        self.attempts[url] += 1
+        await asyncio.sleep(self.delays.get(url, 0))
+        script = self.scripts.get(url)
+        action = script.pop(0) if script else 'ok'
+        if action == 'crash':
+            self.connected = False
+            raise RuntimeError('Target page, context or browser has been closed')
+        if action == 'timeout':
+            raise PlaywrightTimeoutError('Timeout 3000ms exceeded')
+        if action == 'blocked':
+            raise BlockedPageError(url, 'https://example.com/sorry/')
+        if action == 'error':
+            raise RuntimeError('net::ERR_CONNECTION_RESET')
+        if action == 'empty':
+            return {'Title': '', 'Phone': ''}
+        return {'Title': url, 'Phone': '123'}
+
+    @classmethod
+    def _place_key(cls, url: str) -> str:
+        return url
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from fakes import FakeEngine
+from py_lead_generation.src.engines.batch import BatchRunner, SearchJob
+
+
+LISTINGS = {
+    ('gym', 'Astana'): ['gym-1', 'gym-2', 'shared'],
+    ('gym', 'Almaty'): ['shared', 'gym-3'],
+    ('pizza', 'Astana'): ['pizza-1'],
+}
+
+
+class FakeSearchEngine(FakeEngine):
+    running = 0
+    peak = 0
+    opened: list[str] = []
+
+    def __init__(self, query: str, location: str, browser_pool=None) -> None:
+        if (query, location) not in LISTINGS:
+            raise ValueError(f'Location {location!r} is not found')
+        super().__init__(LISTINGS[(query, location)], delays={url: 0.01 for url in LISTINGS[(query, location)]})
+        self.browser_pool = browser_pool
+
+    async def stream(self, include_completed: bool = False):
+        cls = type(self)
+        cls.running += 1
+        cls.peak = max(cls.peak, cls.running)
+        try:
+            async for entry in super().stream(include_completed):
+                yield entry
+        finally:
+            cls.running -= 1
+
+    async def _get_search_result_entry(self, url: str, page) -> dict:
+        type(self).opened.append(url)
+        return await super()._get_search_result_entry(url, page)
+
+
+class FakeBrowserPool:
+    def __init__(self) -> None:
+        self.prewarmed = []
+
+    async def prewarm(self, searches: int, **page_params) -> None:
+        self.prewarmed.append(searches)
+
+
+@pytest.fixture(autouse=True)
+def reset_counters(monkeypatch):
+    monkeypatch.setattr(FakeSearchEngine, 'running', 0)
+    monkeypatch.setattr(FakeSearchEngine, 'peak', 0)
+    monkeypatch.setattr(FakeSearchEngine, 'opened', [])
+
+
+def test_jobs_keep_their_order_and_share_seen_places():
+    jobs = [SearchJob(FakeSearchEngine, 'gym', 'Astana'), SearchJob(FakeSearchEngine, 'gym', 'Almaty')]
+    pool = FakeBrowserPool()
+    runner = BatchRunner(jobs, browser_pool=pool, concurrency=1)
+    asyncio.run(runner.run())
+
+    assert [entry['SourceURL'] for entry in runner.results[jobs[0]]] == ['gym-1', 'gym-2', 'shared']
+    assert [entry['SourceURL'] for entry in runner.results[jobs[1]]] == ['shared', 'gym-3']
+    assert FakeSearchEngine.opened == ['gym-1', 'gym-2', 'shared', 'gym-3']
+    assert pool.prewarmed == [1]
+    outcomes = {outcome['job']: outcome for outcome in runner.job_outcomes}
+    assert outcomes[jobs[1]]['entries'] == 2
+    assert outcomes[jobs[1]]['error'] is None
+
+
+def test_failing_job_does_not_abort_the_batch():
+    jobs = [
+        SearchJob(FakeSearchEngine, 'gym', 'Narnia'),
+        SearchJob(FakeSearchEngine, 'gym', 'Astana'),
+        SearchJob(FakeSearchEngine, 'pizza', 'Astana'),
+    ]
+    runner = BatchRunner(jobs, browser_pool=FakeBrowserPool(), concurrency=2)
+    asyncio.run(runner.run())
+
+    assert len(runner.results[jobs[1]]) == 3
+    assert len(runner.results[jobs[2]]) == 1
+    errors = {outcome['job']: outcome['error'] for outcome in runner.job_outcomes}
+    assert isinstance(errors[jobs[0]], ValueError)
+    assert errors[jobs[1]] is None
+
+
+def test_at_most_concurrency_jobs_run_at_once():
+    jobs = [SearchJob(FakeSearchEngine, query, location) for query, location in LISTINGS] * 2
+    runner = BatchRunner(jobs, browser_pool=FakeBrowserPool(), concurrency=2)
+
+    async def scenario():
+        return [item async for item in runner.stream()]
+
+    assert len(asyncio.run(scenario())) == 12
+    assert FakeSearchEngine.peak == 2
+    assert len(runner.job_outcomes) == 6
+
+
+def test_jobs_sharing_a_file_are_saved_together(tmp_path):
+    filename = str(tmp_path / 'leads.csv')
+    jobs = [
+        SearchJob(FakeSearchEngine, 'gym', 'Almaty', filename=filename),
+        SearchJob(FakeSearchEngine, 'pizza', 'Astana', filename=filename),
+    ]
+    runner = BatchRunner(jobs, browser_pool=FakeBrowserPool())
+    asyncio.run(runner.run())
+    runner.save_to_csv()
+
+    with open(filename, encoding='utf-8') as f:
+        assert f.read().split() == ['Title,Phone', 'shared,123', 'gym-3,123', 'pizza-1,123']
+
+
+def test_unknown_engine_name_is_rejected():
+    with pytest.raises(ValueError):
+        SearchJob('bing', 'gym', 'Astana')
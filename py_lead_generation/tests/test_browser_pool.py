@@ -0,0 +1,74 @@
+import asyncio
+
+from py_lead_generation.src.engines import browser_pool
+from py_lead_generation.src.engines.browser_pool import BrowserPool
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.pages = []
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.connected = True
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def new_context(self, **context_params) -> FakeContext:
+        await asyncio.sleep(0.01)
+        return FakeContext()
+
+    async def close(self) -> None:
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self, driver: 'FakePlaywright') -> None:
+        self.driver = driver
+
+    async def launch(self, **browser_params) -> FakeBrowser:
+        await asyncio.sleep(0.01)
+        browser = FakeBrowser()
+        self.driver.browsers.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    drivers: list['FakePlaywright'] = []
+
+    def __init__(self) -> None:
+        self.browsers = []
+        self.stopped = False
+        self.chromium = FakeChromium(self)
+
+    async def start(self) -> 'FakePlaywright':
+        await asyncio.sleep(0.01)
+        FakePlaywright.drivers.append(self)
+        return self
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+def test_concurrent_start_launches_a_single_driver_and_size_browsers(monkeypatch):
+    monkeypatch.setattr(FakePlaywright, 'drivers', [])
+    monkeypatch.setattr(browser_pool, 'async_playwright', FakePlaywright)
+
+    async def scenario():
+        pool = BrowserPool(size=1)
+        context, _ = await asyncio.gather(pool.acquire(), pool.prewarm(2))
+        await pool.release(context)
+        stats = pool.stats
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert len(FakePlaywright.drivers) == 1
+    assert len(FakePlaywright.drivers[0].browsers) == 1
+    assert FakePlaywright.drivers[0].stopped
+    assert stats['browsers'] == 1
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from py_lead_generation.src.engines.concurrency import AdaptiveConcurrency
+
+
+def test_window_grows_after_a_window_of_healthy_outcomes():
+    async def scenario():
+        controller = AdaptiveConcurrency(initial=2, maximum=3)
+        for _ in range(2):
+            controller.record('ok', 0.1)
+        assert controller.window == 3
+        for _ in range(10):
+            controller.record('ok', 0.1)
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.window == 3
+    assert [decision['action'] for decision in controller.decisions] == ['increase']
+
+
+def test_burst_of_failures_shrinks_the_window_once():
+    async def scenario():
+        controller = AdaptiveConcurrency(initial=8, maximum=8)
+        reports = []
+        for _ in range(4):
+            slot = controller.slot()
+            reports.append((slot, await slot.__aenter__()))
+        for slot, report in reports:
+            report('timeout')
+            await slot.__aexit__(None, None, None)
+        assert controller.window == 4
+
+        async with controller.slot() as report:
+            report('blocked')
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.window == 2
+    assert controller.outcomes == {'timeout': 4, 'blocked': 1}
+
+
+def test_slow_requests_stop_the_growth_without_shrinking():
+    async def scenario():
+        controller = AdaptiveConcurrency(initial=2, maximum=8, slow_factor=3)
+        controller.record('ok', 0.1)
+        controller.record('ok', 1.0)
+        controller.record('ok', 0.1)
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.window == 2
+    assert controller.outcomes == {'ok': 2, 'slow': 1}
+
+
+def test_window_is_bounded_by_minimum():
+    async def scenario():
+        controller = AdaptiveConcurrency(initial=2, minimum=2, maximum=4)
+        controller.record('error', 0.1)
+        return controller
+
+    assert asyncio.run(scenario()).window == 2
+
+
+def test_slots_keep_requests_in_flight_within_the_window():
+    async def scenario():
+        controller = AdaptiveConcurrency(initial=2, maximum=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with controller.slot() as report:
+                peak = max(peak, controller.in_flight)
+                await asyncio.sleep(0.01)
+                report('ok')
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        return controller, peak
+
+    controller, peak = asyncio.run(scenario())
+    assert peak == 2
+    assert controller.in_flight == 0
+
+
+def test_unreported_slot_counts_as_error():
+    async def scenario():
+        controller = AdaptiveConcurrency(initial=4)
+        with pytest.raises(RuntimeError):
+            async with controller.slot():
+                raise RuntimeError('net::ERR_CONNECTION_RESET')
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.outcomes == {'error': 1}
+    assert controller.window == 2
+
+
+@pytest.mark.parametrize('params', [{'minimum': 0}, {'minimum': 3, 'maximum': 2}, {'decrease_factor': 1}])
+def test_bad_params_are_rejected(params):
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(**params)
+
+
+def test_unknown_outcome_is_rejected():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency().record('great', 0.1)
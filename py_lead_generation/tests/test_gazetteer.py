@@ -0,0 +1,94 @@
+import pytest
+
+from py_lead_generation.src.misc.gazetteer import Gazetteer, normalize_name
+
+
+# id, name, asciiname, alternatenames, latitude, longitude, feature class, feature code, country, admin1, population
+PLACES = [
+    (1, 'Springfield', 'Springfield', '', 39.80172, -89.64371, 'P', 'PPLA', 'US', 'IL', 116250),
+    (2, 'Springfield', 'Springfield', '', 37.21533, -93.29824, 'P', 'PPL', 'US', 'MO', 169176),
+    (3, 'Illinois', 'Illinois', 'State of Illinois', 40.00032, -89.25037, 'A', 'ADM1', 'US', 'IL', 12830632),
+    (4, 'Missouri', 'Missouri', '', 38.25031, -92.50046, 'A', 'ADM1', 'US', 'MO', 6137428),
+    (5, 'United States', 'United States', 'USA,America', 39.76, -98.5, 'A', 'PCLI', 'US', '00', 327167434),
+    (6, 'Mexico City', 'Mexico City', 'Mexico,Ciudad de México', 19.42847, -99.12766, 'P', 'PPLC', 'MX', '09', 12294193),
+    (7, 'Mexico', 'Mexico', '', 15.06468, 120.71995, 'P', 'PPL', 'PH', '03', 173403),
+    (8, 'Philippines', 'Philippines', 'Pilipinas', 13.0, 122.0, 'A', 'PCLI', 'PH', '00', 106651922),
+    (9, 'Paris', 'Paris', 'Lutece', 48.85341, 2.3488, 'P', 'PPLC', 'FR', '11', 2138551),
+    (10, 'Paris', 'Paris', '', 33.66094, -95.55551, 'P', 'PPLA2', 'US', 'TX', 24782),
+    (11, 'France', 'France', 'Republique francaise', 46.0, 2.0, 'A', 'PCLI', 'FR', '00', 66987244),
+    (12, 'Astana', 'Astana', 'Nur-Sultan,Астана', 51.1801, 71.44598, 'P', 'PPLC', 'KZ', '05', 1078362),
+]
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    dump = tmp_path / 'dump.txt'
+    with open(dump, 'w', encoding='utf-8') as f:
+        for place_id, name, ascii_name, alternates, lat, lon, feature_class, code, country, admin1, population in PLACES:
+            columns = [
+                place_id, name, ascii_name, alternates, lat, lon, feature_class, code, country, '', admin1,
+                '', '', '', population, '', '', 'UTC', '2024-01-01',
+            ]
+            f.write('\t'.join(map(str, columns)) + '\n')
+    gazetteer = Gazetteer.build(str(dump), str(tmp_path / 'index'))
+    yield gazetteer
+    gazetteer.close()
+
+
+def test_normalize_name():
+    assert normalize_name('  São   Paulo ') == 'sao paulo'
+
+
+def test_region_and_country_qualifiers_pick_the_matching_place(gazetteer):
+    assert gazetteer.forward('Springfield, Illinois') == (39.80172, -89.64371)
+    assert gazetteer.forward('Springfield, IL') == (39.80172, -89.64371)
+    assert gazetteer.forward('Springfield, MO, United States') == (37.21533, -93.29824)
+    assert gazetteer.forward('Paris, France') == (48.85341, 2.3488)
+    assert gazetteer.forward('Mexico, Philippines') == (15.06468, 120.71995)
+
+
+def test_ambiguous_or_unverifiable_locations_fall_through(gazetteer):
+    assert gazetteer.forward('Springfield') is None
+    assert gazetteer.forward('Paris') is None
+    # Pampanga is a province, not an admin1 region, the gazetteer cannot tell it apart from Mexico City
+    assert gazetteer.forward('Mexico, Pampanga, Philippines') is None
+    assert gazetteer.forward('Springfield, Narnia') is None
+    assert gazetteer.forward('Paris, Illinois') is None
+
+
+def test_unique_names_and_aliases(gazetteer):
+    assert gazetteer.forward('Astana') == (51.1801, 71.44598)
+    assert gazetteer.forward('nur-sultan') == (51.1801, 71.44598)
+    assert gazetteer.forward('Астана, KZ') == (51.1801, 71.44598)
+
+
+def test_prefix_and_trigram_matches_are_opt_in(gazetteer):
+    assert gazetteer.forward('Par') is None
+    assert gazetteer.forward('Par', fuzzy=True) == (48.85341, 2.3488)
+    assert gazetteer.forward('Astanna', fuzzy=True) == (51.1801, 71.44598)
+
+
+def test_reverse(gazetteer):
+    assert gazetteer.reverse(48.86, 2.34) == 'Paris'
+    assert gazetteer.reverse(39.7, -89.6) == 'Springfield'
+    assert gazetteer.reverse(51.0, 71.0) == 'Astana'
+
+
+def test_region_names_from_admin1_codes_and_country_info(tmp_path):
+    dump, admin1_codes, country_info = tmp_path / 'cities.txt', tmp_path / 'admin1.txt', tmp_path / 'countries.txt'
+    dump.write_text(
+        '1\tSpringfield\tSpringfield\t\t39.80172\t-89.64371\tP\tPPLA\tUS\t\tIL\t\t\t\t116250\t\t\tUTC\t2024-01-01\n'
+        '2\tSpringfield\tSpringfield\t\t37.21533\t-93.29824\tP\tPPL\tUS\t\tMO\t\t\t\t169176\t\t\tUTC\t2024-01-01\n',
+        encoding='utf-8',
+    )
+    admin1_codes.write_text('US.IL\tIllinois\tIllinois\t4896861\nUS.MO\tMissouri\tMissouri\t4398678\n', encoding='utf-8')
+    country_info.write_text('#ISO\tISO3\tISO-Numeric\tfips\tCountry\nUS\tUSA\t840\tUS\tUnited States\n', encoding='utf-8')
+
+    gazetteer = Gazetteer.build(
+        str(dump), str(tmp_path / 'index'), admin1_codes_path=str(admin1_codes), country_info_path=str(country_info)
+    )
+    try:
+        assert gazetteer.forward('Springfield, Missouri, USA') == (37.21533, -93.29824)
+        assert gazetteer.forward('Springfield, Illinois, United States') == (39.80172, -89.64371)
+    finally:
+        gazetteer.close()
@@ -0,0 +1,92 @@
+import pytest
+from geopy.exc import GeocoderUnavailable
+
+from py_lead_generation.src.misc import utils
+from py_lead_generation.src.misc.geocache import MISS, GeocodeCache
+
+
+class FakeLocation:
+    def __init__(self, latitude: float, longitude: float, bounding_box: list[str] = None) -> None:
+        self.latitude = latitude
+        self.longitude = longitude
+        self.raw = {'boundingbox': bounding_box} if bounding_box else {}
+
+
+class FakeGeolocator:
+    def __init__(self, locations: dict) -> None:
+        self.locations = locations
+        self.calls = []
+
+    def geocode(self, location: str):
+        self.calls.append(location)
+        result = self.locations.get(location)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def geolocator(monkeypatch):
+    geolocator = FakeGeolocator({
+        'Astana': FakeLocation(51.1801, 71.44598, ['50.9', '51.3', '71.2', '71.7']),
+        'Pampanga': FakeLocation(15.0, 120.6),
+        'Nowhere': None,
+        'Offline': GeocoderUnavailable('Service not available'),
+    })
+    monkeypatch.setattr(utils, '_geolocator', geolocator)
+    monkeypatch.setattr(utils, 'geocode_cache', GeocodeCache(':memory:'))
+    monkeypatch.setattr(utils, 'gazetteer', None)
+    return geolocator
+
+
+def test_cache_keeps_coordinates_and_bounding_boxes_apart(tmp_path):
+    path = str(tmp_path / 'geocode.sqlite3')
+    cache = GeocodeCache(path)
+    cache.set('Astana', (51.18, 71.45))
+    cache.set_bounding_box('Astana', (50.9, 71.2, 51.3, 71.7))
+    cache.set_bounding_box('Pampanga', None)
+
+    reopened = GeocodeCache(path)
+    assert reopened.get('astana') == (51.18, 71.45)
+    assert reopened.get_bounding_box('Astana') == (50.9, 71.2, 51.3, 71.7)
+    assert reopened.get_bounding_box('Pampanga') is None
+    assert reopened.get('Pampanga') is MISS
+
+
+def test_bounding_box_is_requested_once(geolocator):
+    assert utils.get_bounding_box_by_location('Astana') == (50.9, 71.2, 51.3, 71.7)
+    assert utils.get_bounding_box_by_location('Astana') == (50.9, 71.2, 51.3, 71.7)
+    assert utils.get_coords_by_location('Astana') == ['51.1801', '71.44598']
+    assert geolocator.calls == ['Astana']
+
+
+def test_location_without_bounding_box_gets_the_radius_box(geolocator):
+    south, west, north, east = utils.get_bounding_box_by_location('Pampanga', radius_km=10)
+    assert (south + north) / 2 == pytest.approx(15.0)
+    assert (west + east) / 2 == pytest.approx(120.6)
+    utils.get_bounding_box_by_location('Pampanga', radius_km=10)
+    assert geolocator.calls == ['Pampanga']
+
+
+def test_unknown_location_raises(geolocator):
+    with pytest.raises(ValueError):
+        utils.get_bounding_box_by_location('Nowhere')
+    assert geolocator.calls == ['Nowhere']
+
+
+def test_nominatim_failure_is_not_cached(geolocator):
+    utils.geocode_cache.set('Offline', (10.0, 20.0))
+    south, west, north, east = utils.get_bounding_box_by_location('Offline')
+    assert (south + north) / 2 == pytest.approx(10.0)
+    assert utils.geocode_cache.get_bounding_box('Offline') is MISS
+
+
+def test_gazetteer_locations_skip_nominatim(geolocator, monkeypatch):
+    class FakeGazetteer:
+        def forward(self, location: str):
+            return (51.1801, 71.44598) if location == 'Astana' else None
+
+    monkeypatch.setattr(utils, 'gazetteer', FakeGazetteer())
+    south, west, north, east = utils.get_bounding_box_by_location('Astana', radius_km=10)
+    assert (south + north) / 2 == pytest.approx(51.1801)
+    assert geolocator.calls == []
@@ -0,0 +1,33 @@
+import json
+
+from py_lead_generation.src.yelp.engine import YelpEngine
+
+
+PAYLOAD = {
+    'searchPageProps': {
+        'mainContentComponentsListProps': [
+            {'searchResultBusiness': {
+                'name': "Tony's Pizza", 'businessUrl': '/biz/tonys-pizza?osq=pizza',
+                'formattedAddress': 'MacArthur Hwy', 'categories': [{'title': 'Pizza'}],
+            }},
+        ],
+    },
+}
+
+
+def test_payload_entry_without_phone_is_not_complete():
+    entries = YelpEngine._decode_payload('https://www.yelp.com/search/snippet?x', json.dumps(PAYLOAD))
+    entry = entries['https://www.yelp.com/biz/tonys-pizza']
+    assert entry['PhoneNumber'] == '-'
+    assert not YelpEngine('pizza', 'Mexico')._is_complete(entry)
+
+
+def test_scraped_defaults_do_not_overwrite_harvested_values():
+    engine = YelpEngine('pizza', 'Mexico')
+    harvested = {'Title': "Tony's Pizza", 'Address': 'MacArthur Hwy', 'PhoneNumber': '-', 'Tags': 'Pizza', 'Rating': 4.5}
+    scraped = {'Title': '-', 'Address': 'MacArthur Hwy, Mexico', 'PhoneNumber': '(045) 123-4567', 'Tags': ''}
+    assert engine._merge_harvested(harvested, scraped) == {
+        'Title': "Tony's Pizza", 'Address': 'MacArthur Hwy, Mexico', 'PhoneNumber': '(045) 123-4567', 'Tags': 'Pizza',
+        'Rating': 4.5,
+    }
+    assert engine._merge_harvested({'Title': '-'}, {'Title': '-'}) == {'Title': '-'}
@@ -0,0 +1,119 @@
+import os
+import asyncio
+
+import httpx
+import pytest
+
+from fakes import FakeEngine
+from py_lead_generation.src.engines import base
+from py_lead_generation.src.engines.http_fetcher import HttpFetcher
+from py_lead_generation.src.engines.resilience import CircuitBreaker
+from py_lead_generation.src.yelp.engine import YelpEngine
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path == '/biz/full':
+        return httpx.Response(200, text=read_fixture('yelp_detail.html'))
+    if path == '/biz/sparse':
+        return httpx.Response(200, text=read_fixture('yelp_detail_sparse.html'))
+    if path == '/biz/captcha':
+        return httpx.Response(302, headers={'Location': 'https://www.yelp.com/visit_captcha?return=/biz/captcha'})
+    if path == '/visit_captcha':
+        return httpx.Response(200, text='<html>Are you human?</html>')
+    return httpx.Response(403, text='Forbidden')
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    breaker = CircuitBreaker(min_requests=20, window_size=20)
+    monkeypatch.setattr(YelpEngine, 'circuit_breaker', breaker)
+    monkeypatch.setattr(YelpEngine, 'PARSE_EXECUTOR', None)
+    monkeypatch.setattr(YelpEngine, 'scheduler', None)
+    engine = YelpEngine('pizza', 'Mexico')
+    engine._http_fast_path_stats = {'fetched': 0, 'fallbacks': 0, 'disabled': False}
+    engine._http_fast_path_failures = 0
+    return engine
+
+
+def fetch_all(engine: YelpEngine, paths: list[str]) -> list[dict | None]:
+    async def run():
+        fetcher = HttpFetcher()
+        fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+        try:
+            return [await engine._fetch_search_result_entry(f'https://www.yelp.com{path}', fetcher) for path in paths]
+        finally:
+            await fetcher.close()
+
+    return asyncio.run(run())
+
+
+def test_entries_with_required_fields_skip_the_browser(engine):
+    full, sparse = fetch_all(engine, ['/biz/full', '/biz/sparse'])
+    assert full['Title'] == "Tony's Pizza & Pasta"
+    # Tags are not required, the sparse page misses the phone number
+    assert sparse is None
+    assert engine.http_fast_path_stats == {'fetched': 1, 'fallbacks': 1, 'disabled': False}
+
+
+def test_fast_path_is_turned_off_after_consecutive_blocks(engine, monkeypatch):
+    monkeypatch.setattr(YelpEngine, 'HTTP_FAST_PATH_MAX_FAILURES', 3)
+    paths = ['/biz/forbidden', '/biz/captcha', '/biz/full', '/biz/forbidden', '/biz/captcha', '/biz/forbidden', '/biz/full']
+    assert [entry is not None for entry in fetch_all(engine, paths)] == [False, False, True, False, False, False, False]
+    assert engine.http_fast_path_stats == {'fetched': 1, 'fallbacks': 6, 'disabled': True}
+    assert list(engine.circuit_breaker._outcomes) == []
+
+
+class ForbiddingFetcher:
+    '''
+    Answers every request with 403, the browser fallback of `FakeEngine` works
+    '''
+
+    requests = 0
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.stats = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        return True
+
+    async def start(self, context=None, page=None) -> None:
+        pass
+
+    async def fetch(self, url: str, block_patterns: list[str] = ()) -> str:
+        ForbiddingFetcher.requests += 1
+        request = httpx.Request('GET', f'https://example.com/{url}')
+        response = httpx.Response(403, request=request)
+        raise httpx.HTTPStatusError('403 Forbidden', request=request, response=response)
+
+    async def close(self) -> None:
+        pass
+
+
+def test_blocked_fast_path_with_working_browser_keeps_the_circuit_closed(monkeypatch):
+    breaker = CircuitBreaker()
+    monkeypatch.setattr(base, 'HttpFetcher', ForbiddingFetcher)
+    monkeypatch.setattr(ForbiddingFetcher, 'requests', 0)
+    monkeypatch.setattr(FakeEngine, 'SUPPORTS_HTTP_FAST_PATH', True)
+    monkeypatch.setattr(FakeEngine, 'CIRCUIT_BREAKER', True)
+    monkeypatch.setattr(FakeEngine, 'circuit_breaker', breaker)
+    monkeypatch.setattr(FakeEngine, 'context', None, raising=False)
+    urls = [f'u{i}' for i in range(30)]
+    engine = FakeEngine(urls)
+    asyncio.run(engine.run())
+
+    assert [entry['SourceURL'] for entry in engine.entries] == urls
+    assert breaker.state == 'closed'
+    assert breaker.openings == 0
+    assert ForbiddingFetcher.requests == FakeEngine.HTTP_FAST_PATH_MAX_FAILURES
+    assert engine.http_fast_path_stats['disabled']
+
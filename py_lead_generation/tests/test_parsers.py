@@ -0,0 +1,119 @@
+import re
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from bs4 import BeautifulSoup
+
+from py_lead_generation.src.engines import base
+from py_lead_generation.src.misc import parsers
+from py_lead_generation.src.google_maps.engine import GoogleMapsEngine
+from py_lead_generation.src.yelp.engine import YelpEngine
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+BACKENDS = ['soup', 'lxml', 'selectolax']
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def baseline_google_maps(html: str) -> list[str]:
+    '''
+    `GoogleMapsEngine._parse_data_with_soup` before parser backends were introduced
+    '''
+    soup = BeautifulSoup(html, 'html.parser')
+
+    selectors = {
+        'title': '.DUwDvf.lfPIob',
+        'address': '[data-item-id="address"]',
+        'phone_number': '[data-item-id^="phone:"]',
+        'website_url': '[data-item-id="authority"]'
+    }
+
+    def extract_text(selector: str, default: str = '', cleaner: callable = None) -> str:
+        element = soup.select_one(selector)
+        text = element.get_text() if element else default
+        return cleaner(text) if cleaner else text
+
+    cleaners = {
+        'phone_number': lambda text: re.sub(r'\D', '', text),
+        'address': lambda text: text.replace('', '').strip(),
+        'website_url': lambda text: text.replace('', '').strip(),
+    }
+    return [extract_text(selectors[key], cleaner=cleaners.get(key)) for key in selectors]
+
+
+def baseline_yelp(html: str) -> list[str]:
+    '''
+    `YelpEngine._parse_data_with_soup` before parser backends were introduced
+    '''
+    soup = BeautifulSoup(html, 'html.parser')
+    data = []
+
+    for selector in ('.css-1se8maq', '.css-qyp8bo', '.css-djo2w .css-1p9ibgf'):
+        element = soup.select_one(selector)
+        data.append(element.get_text() if element else '-')
+
+    tags = ''
+    for tag_element in soup.select('.css-1xfc281 span.css-1fdy0l5'):
+        el = tag_element.find('a')
+        tags += (el.get_text() if el else '-') + ','
+    data.append(tags[:-1])
+    return data
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('fixture', ['google_maps_detail.html', 'google_maps_detail_sparse.html'])
+def test_google_maps_backends_match_baseline(monkeypatch, backend, fixture):
+    html = read_fixture(fixture)
+    monkeypatch.setattr(GoogleMapsEngine, 'PARSER_BACKEND', backend)
+    assert GoogleMapsEngine._parse_data_with_soup(html) == baseline_google_maps(html)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('fixture', ['yelp_detail.html', 'yelp_detail_sparse.html'])
+def test_yelp_backends_match_baseline(monkeypatch, backend, fixture):
+    html = read_fixture(fixture)
+    monkeypatch.setattr(YelpEngine, 'PARSER_BACKEND', backend)
+    assert YelpEngine._parse_data_with_soup(html) == baseline_yelp(html)
+
+
+def test_fixtures_are_not_trivial():
+    assert baseline_google_maps(read_fixture('google_maps_detail.html')) == [
+        'Barber & Co', '12 Rue de Rivoli, 75004 Paris, France', '0142720000', 'barberandco.fr',
+    ]
+    assert baseline_yelp(read_fixture('yelp_detail.html')) == [
+        "Tony's Pizza & Pasta", 'MacArthur Hwy, San Jose Malino, Mexico, Pampanga 2021, Philippines',
+        '(045) 123-4567', 'Pizza,Italian,-',
+    ]
+
+
+class SpawnPool(ProcessPoolExecutor):
+    def __init__(self) -> None:
+        super().__init__(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append(args)
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_spawned_parse_workers_get_the_parent_backend(monkeypatch):
+    html = read_fixture('yelp_detail.html')
+    pool = SpawnPool()
+    monkeypatch.setattr(base, 'get_parse_executor', lambda kind, max_workers: pool)
+    monkeypatch.setattr(YelpEngine, 'PARSE_EXECUTOR', 'process')
+    monkeypatch.setattr(parsers, '_default_backend_name', None)
+    parsers.set_default_parser_backend('lxml')
+    engine = YelpEngine.__new__(YelpEngine)
+    try:
+        assert asyncio.run(engine._parse_html('https://www.yelp.com/biz/x', html)) == baseline_yelp(html)
+    finally:
+        pool.shutdown()
+    assert pool.submitted == [(html, 'lxml')]
@@ -0,0 +1,155 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from fakes import FakeEngine, FakePage
+from py_lead_generation.src.engines.resilience import CircuitBreaker, EmptyPageError, RetryPolicy, get_circuit_breaker
+from py_lead_generation.src.yelp.engine import YelpEngine
+
+
+def test_retry_delays_are_jittered_within_the_exponential_bound():
+    policy = RetryPolicy(max_attempts=5, base_delay_s=1, max_delay_s=4)
+    for attempt, bound in enumerate([1, 2, 4, 4]):
+        delays = [policy.delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+        assert max(delays) > bound / 2
+
+
+@pytest.mark.parametrize('params', [{'max_attempts': 0}, {'base_delay_s': -1}, {'max_delay_s': -1}])
+def test_retry_policy_rejects_bad_params(params):
+    with pytest.raises(ValueError):
+        RetryPolicy(**params)
+
+
+def test_breaker_opens_on_failure_spike_only_with_enough_requests():
+    breaker = CircuitBreaker(failure_rate=0.5, window_size=4, min_requests=4, cooldown_s=60)
+    for success in (False, False, False):
+        breaker.record(success)
+    assert breaker.state == 'closed'
+    breaker.record(True)
+    assert breaker.state == 'open'
+    assert breaker.openings == 1
+    assert breaker.stats['open_for_s'] > 0
+
+
+def test_breaker_probe_closes_or_reopens_with_doubled_cooldown():
+    breaker = CircuitBreaker(failure_rate=1, window_size=2, min_requests=2, cooldown_s=0.01, max_cooldown_s=1)
+
+    async def scenario():
+        breaker.record(False)
+        breaker.record(False)
+        assert breaker.state == 'open'
+
+        assert await breaker.acquire() is True
+        assert breaker.state == 'half_open'
+        # Only one probe at a time, the others wait for its outcome
+        waiting = asyncio.create_task(breaker.acquire(poll_s=0.01))
+        await asyncio.sleep(0.03)
+        assert not waiting.done()
+
+        breaker.record(False, probe=True)
+        assert breaker.state == 'open'
+        assert breaker._current_cooldown_s == pytest.approx(0.02)
+        assert await waiting is True
+
+        breaker.record(True, probe=True)
+        assert breaker.state == 'closed'
+        assert await breaker.acquire() is False
+
+    asyncio.run(scenario())
+
+
+def test_released_probe_lets_the_next_request_probe():
+    breaker = CircuitBreaker(failure_rate=1, window_size=1, min_requests=1, cooldown_s=0)
+    breaker.record(False)
+
+    async def scenario():
+        assert await breaker.acquire() is True
+        breaker.release(probe=True)
+        assert await breaker.acquire() is True
+
+    asyncio.run(scenario())
+
+
+def test_breakers_are_shared_by_source():
+    assert get_circuit_breaker('TestSource') is get_circuit_breaker('TestSource')
+    assert get_circuit_breaker('TestSource') is not get_circuit_breaker('OtherTestSource')
+
+
+def test_stream_retries_failed_and_empty_pages_in_order():
+    engine = FakeEngine(
+        ['a', 'b', 'c', 'd'],
+        scripts={'a': ['timeout', 'ok'], 'b': ['empty', 'blocked', 'ok'], 'c': ['error', 'error', 'error']},
+        delays={'a': 0.02},
+    )
+    asyncio.run(engine.run())
+    assert [entry['SourceURL'] for entry in engine.entries] == ['a', 'b', 'd']
+    assert engine.attempts == Counter({'a': 2, 'b': 3, 'c': 3, 'd': 1})
+    assert list(engine.failed_urls) == ['c']
+
+
+def test_pages_empty_after_every_attempt_are_failed():
+    engine = FakeEngine(['a', 'b'], scripts={'a': ['empty', 'empty', 'empty']})
+    asyncio.run(engine.run())
+    assert [entry['SourceURL'] for entry in engine.entries] == ['b']
+    assert engine.attempts == Counter({'a': 3, 'b': 1})
+    assert isinstance(engine.failed_urls['a'], EmptyPageError)
+
+
+def test_breaker_sees_every_entry_attempt(monkeypatch):
+    breaker = CircuitBreaker(min_requests=20, window_size=20)
+    monkeypatch.setattr(FakeEngine, 'CIRCUIT_BREAKER', True)
+    monkeypatch.setattr(FakeEngine, 'circuit_breaker', breaker)
+    engine = FakeEngine(['a', 'b'], scripts={'a': ['blocked', 'ok']})
+    asyncio.run(engine.run())
+    # Search page, two attempts of `a` and one of `b`
+    assert sorted(breaker._outcomes) == [False, True, True, True]
+
+
+class FakeYelpPage(FakePage):
+    async def evaluate(self, expression, selector):
+        return '1 of 3'
+
+
+def test_yelp_list_pages_are_retried_and_reported_to_the_breaker(monkeypatch):
+    breaker = CircuitBreaker(min_requests=20, window_size=20)
+    monkeypatch.setattr(YelpEngine, 'circuit_breaker', breaker)
+    monkeypatch.setattr(YelpEngine, 'RETRY_POLICY', RetryPolicy(max_attempts=2, base_delay_s=0, max_delay_s=0))
+    engine = YelpEngine('pizza', 'Mexico')
+    engine.page = FakeYelpPage()
+    engine._failed_urls = {}
+    engine._retry_stats = Counter()
+    engine._payload_interceptor = None
+    # The second page hits the captcha once, the third one never renders results
+    redirects = {engine._page_url(10): ['https://www.yelp.com/visit_captcha?x=1']}
+    listed = {engine._page_url(0): ['https://www.yelp.com/biz/a'], engine._page_url(10): ['https://www.yelp.com/biz/b']}
+
+    async def setup_page_pool():
+        pool = asyncio.Queue()
+        for _ in range(2):
+            pool.put_nowait(FakePage())
+        return pool
+
+    async def open_url_and_wait(url, timeout_s=3, page=None, ready_selector=None):
+        pending = redirects.get(url)
+        page.url = pending.pop(0) if pending else url
+        return True
+
+    async def get_page_urls(page):
+        return listed.get(page.url, [])
+
+    async def recycle(page):
+        return page
+
+    engine.page.url = engine._page_url(0)
+    monkeypatch.setattr(engine, '_setup_page_pool', setup_page_pool)
+    monkeypatch.setattr(engine, '_open_url_and_wait', open_url_and_wait)
+    monkeypatch.setattr(engine, '_get_page_urls', get_page_urls)
+    monkeypatch.setattr(engine, '_recycle_page_if_needed', recycle)
+
+    urls = asyncio.run(engine._get_search_results_urls())
+    assert urls == ['https://www.yelp.com/biz/a', 'https://www.yelp.com/biz/b']
+    assert list(engine.failed_urls) == []
+    assert engine._retry_stats['retries'] == 2
+    assert sorted(breaker._outcomes) == [False, False, False, True]
@@ -0,0 +1,112 @@
+import asyncio
+
+from playwright.async_api import Error as PlaywrightError
+
+from py_lead_generation.src.engines.routing import BlockingProfile, RequestBlocker, glob_to_regex
+from py_lead_generation.src.google_maps.engine import GoogleMapsEngine
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.handlers = {}
+        self.sent = []
+
+    def on(self, event: str, handler) -> None:
+        self.handlers[event] = handler
+
+    async def send(self, method: str, params: dict = None) -> dict:
+        self.sent.append((method, params))
+        return {}
+
+    async def emit(self, event: str, params: dict) -> None:
+        result = self.handlers[event](params)
+        if asyncio.iscoroutine(result):
+            await result
+
+
+class FakeContext:
+    def __init__(self, session: FakeSession = None) -> None:
+        self.session = session
+
+    async def new_cdp_session(self, page) -> FakeSession:
+        if self.session is None:
+            raise PlaywrightError('CDP session is only available in Chromium')
+        return self.session
+
+
+class FakePage:
+    def __init__(self, context: FakeContext) -> None:
+        self.context = context
+        self.routes = []
+
+    async def route(self, pattern: str, handler) -> None:
+        self.routes.append(pattern)
+
+
+def test_glob_to_regex():
+    assert glob_to_regex('*/log?format=*') == r'.*/log.format=.*'
+
+
+def test_google_maps_profile_reasons():
+    profile = GoogleMapsEngine.BLOCKING_PROFILE
+    assert profile.reason('image', 'https://lh5.googleusercontent.com/p/a.jpg') == 'image'
+    assert profile.reason('xhr', 'https://www.google.com/maps/vt?pb=!1m5') == 'url'
+    assert profile.reason('image', 'https://khms1.google.com/kh/v=979') == 'image'
+    assert profile.reason('other', 'https://khms1.google.com/kh/v=979') == 'url'
+    assert profile.reason('script', 'https://www.googletagmanager.com/gtag/js') == 'host'
+    assert profile.reason('script', 'https://maps.gstatic.com/maps-api-v3/main.js') is None
+    assert profile.reason('document', 'https://www.google.com/maps/place/x') is None
+
+
+def test_request_patterns_cover_every_rule():
+    profile = BlockingProfile(resource_types=['image', 'font'], url_patterns=['*/maps/vt*'], hosts=['doubleclick.net'])
+    assert profile.request_patterns() == [
+        {'resourceType': 'Font', 'requestStage': 'Request'},
+        {'resourceType': 'Image', 'requestStage': 'Request'},
+        {'urlPattern': '*/maps/vt*', 'requestStage': 'Request'},
+        {'urlPattern': '*://doubleclick.net/*', 'requestStage': 'Request'},
+        {'urlPattern': '*://*.doubleclick.net/*', 'requestStage': 'Request'},
+    ]
+
+
+def test_blocker_uses_cdp_and_keeps_the_cache():
+    async def main():
+        session = FakeSession()
+        blocker = RequestBlocker(BlockingProfile(resource_types=['image'], hosts=['doubleclick.net']))
+        page = FakePage(FakeContext(session))
+        await blocker.attach(page)
+
+        assert page.routes == []
+        assert ('Network.setCacheDisabled', {'cacheDisabled': False}) in session.sent
+        assert any(method == 'Fetch.enable' for method, _ in session.sent)
+
+        await session.emit('Fetch.requestPaused', {
+            'requestId': '1', 'resourceType': 'Image', 'request': {'url': 'https://example.com/a.png'},
+        })
+        await session.emit('Fetch.requestPaused', {
+            'requestId': '2', 'resourceType': 'Script', 'request': {'url': 'https://ad.doubleclick.net/x.js'},
+        })
+        await session.emit('Network.loadingFinished', {'requestId': '3', 'encodedDataLength': 1200})
+        await session.emit('Network.requestServedFromCache', {'requestId': '4'})
+        await session.emit('Network.loadingFinished', {'requestId': '4', 'encodedDataLength': 0})
+
+        assert ('Fetch.failRequest', {'requestId': '1', 'errorReason': 'BlockedByClient'}) in session.sent
+        assert ('Fetch.failRequest', {'requestId': '2', 'errorReason': 'BlockedByClient'}) in session.sent
+        assert blocker.stats == {
+            'blocked_requests': 2,
+            'allowed_requests': 2,
+            'cached_responses': 1,
+            'transferred_bytes': 1200,
+            'blocked_by_reason': {'image': 1, 'host': 1},
+        }
+
+    asyncio.run(main())
+
+
+def test_blocker_falls_back_to_routing_without_cdp():
+    async def main():
+        page = FakePage(FakeContext())
+        await RequestBlocker(BlockingProfile(resource_types=['image'])).attach(page)
+        assert page.routes == ['**/*']
+
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from py_lead_generation.src.engines.scheduler import HostLimit, HostScheduler
+
+
+def test_token_bucket_paces_requests_after_the_burst():
+    scheduler = HostScheduler()
+    scheduler.set_limit('example.com', HostLimit(20, burst=2, max_concurrency=8))
+
+    async def request() -> float:
+        async with scheduler.slot('https://example.com/page') as waited:
+            return waited
+
+    async def scenario():
+        return await asyncio.gather(*(request() for _ in range(5)))
+
+    waits = sorted(asyncio.run(scenario()))
+    assert waits[:2] == pytest.approx([0, 0], abs=0.01)
+    assert waits[2:] == pytest.approx([0.05, 0.1, 0.15], abs=0.03)
+    stats = scheduler.stats['example.com']
+    assert stats['requests'] == 5
+    assert stats['in_flight'] == 0
+    assert stats['max_wait_s'] == pytest.approx(0.15, abs=0.03)
+
+
+def test_hosts_are_limited_independently():
+    scheduler = HostScheduler(HostLimit(1, burst=1, max_concurrency=1))
+
+    async def scenario():
+        async with scheduler.slot('https://a.example.com/'):
+            async with scheduler.slot('https://b.example.com/') as waited:
+                return waited
+
+    assert asyncio.run(scenario()) == pytest.approx(0, abs=0.01)
+
+
+def test_concurrency_cap_and_cancelled_waiters():
+    scheduler = HostScheduler(HostLimit(1000, burst=1000, max_concurrency=1))
+    order = []
+
+    async def request(name: str, hold_s: float) -> None:
+        async with scheduler.slot('https://example.com/'):
+            order.append(name)
+            await asyncio.sleep(hold_s)
+
+    async def scenario():
+        first = asyncio.create_task(request('first', 0.05))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(request('cancelled', 0))
+        last = asyncio.create_task(request('last', 0))
+        await asyncio.sleep(0.01)
+        assert scheduler.stats['example.com']['waiting'] == 2
+        cancelled.cancel()
+        await asyncio.gather(first, last, cancelled, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert order == ['first', 'last']
+    assert scheduler.stats['example.com']['in_flight'] == 0
+
+
+def test_slot_is_handed_over_to_a_waiter_of_another_event_loop():
+    scheduler = HostScheduler(HostLimit(1000, burst=1000, max_concurrency=1))
+    holding = threading.Event()
+    released_at = []
+    acquired_at = []
+
+    async def hold():
+        async with scheduler.slot('https://example.com/'):
+            holding.set()
+            await asyncio.sleep(0.1)
+            released_at.append(time.monotonic())
+
+    async def wait():
+        async with scheduler.slot('https://example.com/'):
+            acquired_at.append(time.monotonic())
+
+    holder = threading.Thread(target=lambda: asyncio.run(hold()))
+    holder.start()
+    assert holding.wait(1)
+    waiter = threading.Thread(target=lambda: asyncio.run(wait()))
+    waiter.start()
+    holder.join(2)
+    waiter.join(2)
+
+    assert len(acquired_at) == 1
+    assert acquired_at[0] >= released_at[0]
+    assert scheduler.stats['example.com']['in_flight'] == 0
+
+
+def test_default_limits_do_not_override_user_limits():
+    scheduler = HostScheduler()
+    user_limit = HostLimit(5, burst=5, max_concurrency=2)
+    scheduler.set_limit('www.yelp.com', user_limit)
+    scheduler.set_default_limits({'www.yelp.com': HostLimit(1), 'www.google.com': HostLimit(2)})
+
+    async def scenario():
+        async with scheduler.slot('https://www.yelp.com/biz/a'):
+            pass
+        async with scheduler.slot('https://www.google.com/maps'):
+            pass
+
+    asyncio.run(scenario())
+    assert scheduler.stats['www.yelp.com']['limit'] == repr(user_limit)
+    assert scheduler.stats['www.google.com']['limit'] == repr(HostLimit(2))
+
+
+@pytest.mark.parametrize('params', [(0,), (1, 0), (1, 1, 0)])
+def test_host_limit_rejects_bad_params(params):
+    with pytest.raises(ValueError):
+        HostLimit(*params)
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from fakes import FakeEngine
+from py_lead_generation.src.engines.checkpoint import CheckpointStore
+from py_lead_generation.src.engines.seen_index import BloomFilter, SeenIndex
+from py_lead_generation.src.google_maps.engine import GoogleMapsEngine
+from py_lead_generation.src.yelp.engine import YelpEngine
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    added = [f'place-{i}' for i in range(2000)]
+    for key in added:
+        bloom.add(key)
+    assert all(key in bloom for key in added)
+    false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+    assert false_positives / 10000 < 0.03
+
+
+@pytest.mark.parametrize('params', [{'capacity': 0}, {'capacity': 10, 'error_rate': 1}])
+def test_bloom_filter_rejects_bad_params(params):
+    with pytest.raises(ValueError):
+        BloomFilter(**params)
+
+
+def test_seen_index_persists_and_expires(tmp_path, monkeypatch):
+    path = str(tmp_path / 'seen.sqlite3')
+    index = SeenIndex(path, ttl_s=60, bloom_capacity=100)
+    index.add('a', {'Title': 'A'})
+    assert index.get('a') == {'Title': 'A'}
+    assert index.get('b') is None
+
+    reopened = SeenIndex(path, ttl_s=60, bloom_capacity=100)
+    assert 'a' in reopened
+    monkeypatch.setattr('time.time', lambda: 4102444800)
+    assert reopened.get('a') is None
+    assert reopened.stats == {'hits': 1, 'stale': 1, 'misses': 0, 'bloom_false_positives': 0}
+
+
+def test_seen_places_are_not_opened_again():
+    index = SeenIndex(':memory:', bloom_capacity=100)
+    first = FakeEngine(['a', 'b'])
+    first.seen_index = index
+    asyncio.run(first.run())
+
+    second = FakeEngine(['a', 'b', 'c'])
+    second.seen_index = index
+    asyncio.run(second.run())
+    assert [entry['SourceURL'] for entry in second.entries] == ['a', 'b', 'c']
+    assert dict(second.attempts) == {'c': 1}
+
+
+def test_google_maps_source_url_is_canonical():
+    url = (
+        'https://www.google.com/maps/place/Barber+%26+Co/data=!4m7!3m6!1s0x47e66e2964e34e2d:0x8ddca9ee380ef7e0'
+        '!8m2!3d48.85!4d2.35!16s%2Fg%2F11c1!19sChIJ?authuser=0&hl=en&rclk=1'
+    )
+    canonical = GoogleMapsEngine._canonical_url(url)
+    assert canonical == 'https://www.google.com/maps/place/data=!4m2!3m1!1s0x47e66e2964e34e2d:0x8ddca9ee380ef7e0'
+    assert GoogleMapsEngine._place_key(canonical) == GoogleMapsEngine._place_key(url)
+    assert GoogleMapsEngine._canonical_url('https://www.google.com/maps/search/gym') == 'https://www.google.com/maps/search/gym'
+
+
+def test_yelp_source_url_is_canonical():
+    url = 'https://www.yelp.com/biz/tonys-pizza-mexico?osq=pizza&hrid=abc#reviews'
+    assert YelpEngine._canonical_url(url) == 'https://www.yelp.com/biz/tonys-pizza-mexico'
+
+
+def test_empty_pages_are_not_remembered(tmp_path):
+    index = SeenIndex(':memory:', bloom_capacity=100)
+    checkpoint = CheckpointStore(str(tmp_path / 'checkpoint.sqlite3'))
+    checkpointed = []
+    add_entry = checkpoint.add_entry
+    checkpoint.add_entry = lambda key, url, entry: checkpointed.append(url) or add_entry(key, url, entry)
+
+    engine = FakeEngine(['u1', 'u2'], scripts={'u1': ['empty', 'empty', 'empty']})
+    engine.seen_index = index
+    engine.checkpoint = checkpoint
+    asyncio.run(engine.run())
+
+    assert index.get('u1') is None
+    assert index.get('u2') is not None
+    assert checkpointed == ['u2']
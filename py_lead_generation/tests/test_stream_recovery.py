@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from fakes import FakeEngine
+
+from py_lead_generation.src.engines.checkpoint import CheckpointStore
+from py_lead_generation.src.engines.playwright_config import BrowserSessionLost
+
+
+URLS = [f'https://example.com/place/{i}' for i in range(10)]
+
+
+def collect(engine: FakeEngine, **kwargs) -> list[dict]:
+    async def main():
+        return [entry async for entry in engine.stream(**kwargs)]
+
+    return asyncio.run(main())
+
+
+def test_crashed_session_is_restarted_without_reopening_completed_urls():
+    engine = FakeEngine(URLS, scripts={URLS[6]: ['crash']})
+    entries = collect(engine)
+
+    assert [entry['Title'] for entry in entries] == URLS
+    assert engine.session_restarts == 1
+    assert engine.sessions == 2
+    assert all(engine.attempts[url] == 1 for url in URLS[:5])
+    assert engine.attempts[URLS[6]] == 2
+
+
+def test_session_restarts_are_bounded():
+    engine = FakeEngine(URLS, scripts={URLS[2]: ['crash'], URLS[3]: ['crash']})
+    engine.MAX_SESSION_RESTARTS = 1
+    with pytest.raises(BrowserSessionLost):
+        collect(engine)
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path):
+    checkpoint = CheckpointStore(str(tmp_path / 'checkpoint.sqlite3'))
+
+    crashed = FakeEngine(URLS, scripts={URLS[6]: ['crash']})
+    crashed.MAX_SESSION_RESTARTS = 0
+    crashed.checkpoint = checkpoint
+    with pytest.raises(BrowserSessionLost):
+        collect(crashed)
+    completed = checkpoint.completed_urls(crashed._checkpoint_key())
+    assert completed and URLS[6] not in completed
+
+    resumed = FakeEngine(URLS)
+    resumed.checkpoint = checkpoint
+    asyncio.run(resumed.run())
+
+    assert [entry['Title'] for entry in resumed.entries] == URLS
+    assert all(resumed.attempts[url] == 0 for url in completed)
+    assert all(resumed.attempts[url] == 1 for url in URLS if url not in completed)
+    # A finished run lists the search results again next time
+    assert checkpoint.load_urls(resumed._checkpoint_key()) is None
+
+
+def test_resumed_stream_yields_only_remaining_entries(tmp_path):
+    checkpoint = CheckpointStore(str(tmp_path / 'checkpoint.sqlite3'))
+    crashed = FakeEngine(URLS, scripts={URLS[6]: ['crash']})
+    crashed.MAX_SESSION_RESTARTS = 0
+    crashed.checkpoint = checkpoint
+    with pytest.raises(BrowserSessionLost):
+        collect(crashed)
+    completed = checkpoint.completed_urls(crashed._checkpoint_key())
+
+    resumed = FakeEngine(URLS)
+    resumed.checkpoint = checkpoint
+    assert [entry['Title'] for entry in collect(resumed)] == [url for url in URLS if url not in completed]
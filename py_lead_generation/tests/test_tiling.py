@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from py_lead_generation.src.google_maps import tiling
+from py_lead_generation.src.google_maps.tiling import GoogleMapsTiledSearch, Tile, plan_tiles
+
+
+def test_split_covers_the_tile_one_zoom_closer():
+    tile = Tile(0, 0, 2, 4, zoom=12)
+    quarters = tile.split()
+    assert [(q.south, q.west, q.north, q.east) for q in quarters] == [
+        (0, 0, 1, 2), (0, 2, 1, 4), (1, 0, 2, 2), (1, 2, 2, 4),
+    ]
+    assert {q.zoom for q in quarters} == {13}
+    assert tile.center == (1, 2)
+
+
+def test_plan_tiles_covers_the_box_from_the_center_outwards():
+    box = (51.0, 71.2, 51.3, 71.7)
+    tiles = plan_tiles(box, zoom=14)
+    assert len(tiles) > 1
+    assert min(t.south for t in tiles) == pytest.approx(box[0])
+    assert min(t.west for t in tiles) == pytest.approx(box[1])
+    assert max(t.north for t in tiles) == pytest.approx(box[2])
+    assert max(t.east for t in tiles) == pytest.approx(box[3])
+    area = sum((t.north - t.south) * (t.east - t.west) for t in tiles)
+    assert area == pytest.approx((box[2] - box[0]) * (box[3] - box[1]))
+
+    center = (51.15, 71.45)
+    distances = [(t.center[0] - center[0]) ** 2 + (t.center[1] - center[1]) ** 2 for t in tiles]
+    assert distances == sorted(distances)
+
+
+def test_plan_tiles_zooms_out_to_fit_max_tiles():
+    tiles = plan_tiles((40.0, -75.0, 41.0, -73.0), zoom=16, max_tiles=16)
+    assert len(tiles) <= 16
+    assert tiles[0].zoom < 16
+
+
+def test_plan_tiles_rejects_empty_box():
+    with pytest.raises(ValueError):
+        plan_tiles((1, 1, 1, 2), zoom=14)
+
+
+class FakeTileEngine:
+    '''
+    Lists the same places from every tile, the tile at `FAILING_LATITUDE` fails to scrape `FAILING_PLACE`
+    '''
+
+    PLACES = ['https://www.google.com/maps/place/a', 'https://www.google.com/maps/place/b']
+    FAILING_LATITUDE = None
+    FAILING_PLACE = 'https://www.google.com/maps/place/b'
+    FIELD_NAMES = ['Title']
+
+    def __init__(self, query, location, zoom, browser_pool=None, coords=None) -> None:
+        self.coords = coords
+        self.url_filter = None
+        self.listed_urls_count = 0
+
+    @classmethod
+    def _place_key(cls, url: str) -> str:
+        return url.rstrip('/')
+
+    async def stream(self):
+        # Tiles farther from the center start later, the failing one claims everything first
+        await asyncio.sleep(0 if self.coords[0] == self.FAILING_LATITUDE else 0.01)
+        urls = [url for url in self.PLACES if self.url_filter(url)]
+        self.listed_urls_count = len(self.PLACES)
+        for url in urls:
+            if self.coords[0] == self.FAILING_LATITUDE and url == self.FAILING_PLACE:
+                continue
+            yield {'Title': url, 'SourceURL': url}
+
+
+def test_places_a_tile_failed_to_scrape_are_left_to_other_tiles(monkeypatch):
+    box = (0.0, 0.0, 0.04, 0.02)
+    tiles = plan_tiles(box, zoom=15)
+    assert len(tiles) == 2
+    monkeypatch.setattr(tiling, 'GoogleMapsEngine', FakeTileEngine)
+    monkeypatch.setattr(FakeTileEngine, 'FAILING_LATITUDE', tiles[0].center[0])
+
+    search = GoogleMapsTiledSearch('gym', 'Nowhere', zoom=15, browser_pool=object(), bounding_box=box)
+    asyncio.run(search.run())
+
+    assert sorted(entry['SourceURL'] for entry in search.entries) == FakeTileEngine.PLACES
+    assert sorted(outcome['entries'] for outcome in search.tile_outcomes) == [1, 1]
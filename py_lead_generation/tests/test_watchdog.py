@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import shutil
+import subprocess
+
+import pytest
+
+from py_lead_generation.src.engines import watchdog
+from py_lead_generation.src.engines.watchdog import MemoryWatchdog, browser_rss_mb
+
+
+pytestmark = pytest.mark.skipif(not os.path.isdir('/proc'), reason='child processes are spawned the linux way')
+
+HOG = 'import time; memory = bytearray(64 * 2 ** 20); memory[::4096] = b"x" * len(memory[::4096]); time.sleep(30)'
+
+
+@pytest.fixture(params=['psutil', 'proc'])
+def measure(request, monkeypatch):
+    if request.param == 'proc':
+        monkeypatch.setitem(sys.modules, 'psutil', None)
+    else:
+        pytest.importorskip('psutil')
+    return browser_rss_mb
+
+
+def spawn(args: list[str]) -> subprocess.Popen:
+    process = subprocess.Popen(args)
+    time.sleep(0.5)
+    return process
+
+
+def test_non_browser_children_are_not_counted(measure):
+    # Stands for a parse executor worker holding a lot of memory
+    process = spawn([sys.executable, '-c', HOG])
+    try:
+        assert measure() < 1
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_chromium_children_are_counted(measure, tmp_path):
+    sleep = shutil.which('sleep')
+    if sleep is None:
+        pytest.skip('sleep is not available')
+    chrome = tmp_path / 'chrome'
+    shutil.copy(sleep, chrome)
+    process = spawn([str(chrome), '30'])
+    try:
+        assert measure() > 0
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_watchdog_measures_at_most_once_per_interval(monkeypatch):
+    measurements = iter([100.0, 300.0])
+    monkeypatch.setattr(watchdog, 'browser_rss_mb', lambda: next(measurements))
+    memory_watchdog = MemoryWatchdog(max_rss_mb=200, check_interval_s=3600)
+    assert memory_watchdog.over_limit() is False
+    assert memory_watchdog.over_limit() is False
+    assert memory_watchdog.last_rss_mb == 100.0
@@ -1,5 +1,5 @@
 import asyncio
-from py_lead_generation import GoogleMapsEngine, YelpEngine
+from py_lead_generation import BatchRunner, GoogleMapsEngine, SearchJob, YelpEngine
 
 
 async def main() -> None:
@@ -8,13 +8,12 @@ async def main() -> None:
         or 'Paris'
     zoom = float(input('[Optional] Enter google maps zoom: ').strip() or 12)
 
-    engine = GoogleMapsEngine(q, addr, zoom)
-    await engine.run()
-    engine.save_to_csv()
-
-    engine = YelpEngine('Pizza', 'Mexico, Pampanga, Philippines')
-    await engine.run()
-    engine.save_to_csv('pizza_leads.csv')
+    runner = BatchRunner([
+        SearchJob(GoogleMapsEngine, q, addr, engine_kwargs={'zoom': zoom}),
+        SearchJob(YelpEngine, 'Pizza', 'Mexico, Pampanga, Philippines', filename='pizza_leads.csv'),
+    ])
+    await runner.run()
+    runner.save_to_csv()
 
 if __name__ == '__main__':
     asyncio.run(main())
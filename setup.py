@@ -21,6 +21,7 @@ setup(
     url='https://github.com/ideasdevops/lead-ia',
     packages=find_packages(),
     install_requires=['playwright', 'beautifulsoup4', 'geopy'],
+    extras_require={'fast': ['selectolax', 'lxml', 'cssselect'], 'http': ['httpx[http2]']},
     python_requires='>=3.10',
     keywords=['python', 'lead generation', 'web automation',
               'playwright', 'google maps', 'yelp'],